@@ -0,0 +1,89 @@
+import argparse
+import re
+import xml.etree.ElementTree as ET
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.utils import stripped_tag
+from rpa_reviewer.workflow import read_catch
+from synthetic import make_workflow
+
+# Catch-block analysis of ErrorHandlingRule on a catch-heavy workflow: the
+# old regex passes over the raw text versus CatchBlock records read from the
+# element tree. Parsing is shared by both and not timed.
+
+VIEWSTATE = r'<sap:WorkflowViewStateService\.ViewState>.*?</sap:WorkflowViewStateService\.ViewState>'
+IDREF = r'<sap2010:WorkflowViewState\.IdRef>.*?</sap2010:WorkflowViewState\.IdRef>'
+
+
+def legacy_catch_checks(txt):
+    findings = {"empty": False, "no_throw": False, "wrong_type": 0, "no_log": 0}
+
+    catch_blocks = re.findall(r'<Catch[^>]*>(.*?)</Catch>', txt, re.DOTALL)
+    for catch_content in catch_blocks:
+        cleaned = re.sub(VIEWSTATE, '', catch_content, flags=re.DOTALL)
+        cleaned = re.sub(IDREF, '', cleaned).strip()
+        if not cleaned or cleaned.count('<') == 0:
+            findings["empty"] = True
+            break
+
+    if "TryCatch" in txt:
+        for catch_content in catch_blocks:
+            if "Throw" not in catch_content and catch_content.strip():
+                cleaned = re.sub(VIEWSTATE, '', catch_content, flags=re.DOTALL)
+                cleaned = re.sub(IDREF, '', cleaned).strip()
+                if cleaned and cleaned.count('<') > 0:
+                    findings["no_throw"] = True
+                    break
+
+    for exception_type, catch_content in re.findall(
+            r'<Catch\s+x:TypeArguments="([^"]+)"[^>]*>(.*?)</Catch>', txt, re.DOTALL):
+        throws = re.findall(r'<Throw[^>]+Exception="\[New\s+([A-Za-z0-9_.]+)\(', catch_content)
+        throws += re.findall(r'<CSharpValue[^>]*>\s*new\s+([A-Za-z0-9_.]+)\(', catch_content)
+        business = "BusinessRuleException" in exception_type
+        if throws and business != any("BusinessRuleException" in t for t in throws):
+            findings["wrong_type"] += 1
+
+    for catch_content in re.findall(r'<Catch[^>]*>(.*?)</Catch>', txt, re.DOTALL):
+        has_logging = "LogMessage" in catch_content or "WriteLine" in catch_content or "AddLogFields" in catch_content
+        cleaned = re.sub(VIEWSTATE, '', catch_content, flags=re.DOTALL)
+        cleaned = re.sub(IDREF, '', cleaned).strip()
+        if cleaned and cleaned.count('<') > 0 and not has_logging:
+            findings["no_log"] += 1
+
+    return findings
+
+
+def tree_catch_checks(root):
+    catches = [read_catch(elem) for elem in root.iter() if stripped_tag(elem.tag) == "Catch"]
+    findings = {
+        "empty": any(not c.has_content for c in catches),
+        "no_throw": any(c.has_content and not c.has_throw for c in catches),
+        "wrong_type": 0,
+        "no_log": sum(1 for c in catches if c.has_content and not c.has_logging),
+    }
+    for c in catches:
+        business = "BusinessRuleException" in (c.exception_type or "")
+        if c.thrown_types and business != any("BusinessRuleException" in t for t in c.thrown_types):
+            findings["wrong_type"] += 1
+    return findings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark catch-block analysis")
+    parser.add_argument("--activities", type=int, nargs="+", default=[250, 1000, 4000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for activities in args.activities:
+        txt = make_workflow("Catchy.xaml", activities=activities, trycatch_density=0.6, depth=8)
+        root = ET.fromstring(txt.encode("utf-8"))
+        catch_count = txt.count("<Catch ")
+
+        before = best_of(lambda: legacy_catch_checks(txt), args.repeat)
+        after = best_of(lambda: tree_catch_checks(root), args.repeat)
+        print(f"{catch_count:5d} catches, {len(txt) / 1024:7.1f} KiB: "
+              f"regex {before * 1000:8.2f} ms, tree {after * 1000:7.2f} ms ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+
+from common import best_with_result  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.rules import DependencyRule
+from rpa_reviewer.workflow import parse_workflow_bytes, read_xmlns_references
+from synthetic import make_workflow
+
+# DependencyRule usage detection: two substring searches of the full text
+# per declared dependency versus lookups in the workflow's namespace /
+# assembly index. The index column includes reading the root xmlns
+# declarations; AssemblyReference and namespace imports are picked up by the
+# model walk at no measurable cost.
+
+PACKAGES = [
+    "UiPath.System.Activities", "UiPath.UIAutomation.Activities", "UiPath.Excel.Activities",
+    "UiPath.Mail.Activities", "UiPath.Testing.Activities", "UiPath.WebAPI.Activities",
+    "UiPath.PDF.Activities", "UiPath.Word.Activities", "UiPath.Database.Activities",
+    "UiPath.Persistence.Activities", "UiPath.IntelligentOCR.Activities", "UiPath.Form.Activities",
+    "Newtonsoft.Json", "UiPath.Credentials.Activities", "UiPath.Cryptography.Activities",
+    "UiPath.FTP.Activities",
+]
+
+
+def legacy_used(deps, txt):
+    return {dep for dep in deps if dep in txt or dep.replace(".Activities", "") in txt}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DependencyRule usage detection")
+    parser.add_argument("--activities", type=int, default=5000)
+    parser.add_argument("--deps", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    txt = make_workflow("Deps.xaml", activities=args.activities, depth=5)
+    workflow = parse_workflow_bytes("Deps.xaml", txt.encode("utf-8"))
+
+    for count in args.deps:
+        rule = DependencyRule()
+        rule.project_dependencies = {dep: "[1.0.0]" for dep in PACKAGES[:count]}
+
+        before, old = best_with_result(lambda: legacy_used(rule.project_dependencies, txt), args.repeat)
+        after, new = best_with_result(
+            lambda: (read_xmlns_references(txt, set()), rule.check_workflow(workflow)), args.repeat
+        )
+        print(f"{count:3d} deps, {len(txt) / 1024:8.1f} KiB: "
+              f"substring scan {before * 1000:8.3f} ms, index {after * 1000:8.3f} ms, "
+              f"same result: {old == new[1]['used_dependencies']}")
+
+
+if __name__ == "__main__":
+    main()
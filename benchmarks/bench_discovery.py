@@ -0,0 +1,81 @@
+import argparse
+import os
+import tempfile
+import time
+
+from common import best_with_result  # before rpa_reviewer: puts the repo on sys.path
+import rpa_reviewer.discovery as discovery
+from rpa_reviewer.discovery import discover_workflows
+
+# Workflow discovery on a project that carries the usual clutter: a .git
+# folder, Studio's .local / .objects / .screenshots and an extracted
+# package in Output/. The old os.walk + endswith(".xaml") loop (with an
+# os.stat per workflow, as incremental runs did) versus discover_workflows
+# with 1 and more threads. --latency-ms adds a delay to every directory
+# listing to mimic a network drive, where threads pay off.
+
+
+def legacy_discovery(root):
+    manifest = []
+    for dirpath, _, files in os.walk(root):
+        for file in files:
+            if file.endswith(".xaml"):
+                path = os.path.join(dirpath, file)
+                st = os.stat(path)
+                manifest.append((path, st.st_size, st.st_mtime_ns))
+    return manifest
+
+
+def write(root, rel_path, text="<Activity/>"):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def make_cluttered_project(root, workflows, clutter):
+    for i in range(workflows):
+        write(root, f"Flows/Area{i % 10}/Flow{i}.xaml")
+    for i in range(clutter):
+        write(root, f".git/objects/{i % 256:02x}/{i:038x}", "x")
+        write(root, f".local/.cache/pkg{i % 50}/content/Lib{i}.xaml")
+        write(root, f".objects/{i % 20}/{i}.json", "{}")
+        write(root, f".screenshots/{i % 20}/{i}.png", "x")
+    write(root, "Output/MyLibrary/MyLibrary.nuspec", "<package/>")
+    for i in range(clutter // 4):
+        write(root, f"Output/MyLibrary/content/Copy{i}.xaml")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark workflow discovery")
+    parser.add_argument("--workflows", type=int, default=300)
+    parser.add_argument("--clutter", type=int, default=2000, help="files in each of .git, .local, .objects, .screenshots")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every directory listing")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.latency_ms:
+        scandir = os.scandir
+
+        def slow_scandir(path="."):
+            time.sleep(args.latency_ms / 1000)
+            return scandir(path)
+
+        # os.walk lists directories with os.scandir as well
+        os.scandir = slow_scandir
+        discovery.os.scandir = slow_scandir
+
+    with tempfile.TemporaryDirectory() as root:
+        make_cluttered_project(root, args.workflows, args.clutter)
+
+        before, legacy = best_with_result(lambda: legacy_discovery(root), args.repeat)
+        print(f"os.walk:             {before * 1000:8.1f} ms, {len(legacy)} workflows")
+        for threads in args.threads:
+            after, manifest = best_with_result(lambda: discover_workflows(root, threads=threads), args.repeat)
+            print(f"scandir, {threads:2d} thread{'s' if threads > 1 else ' '}: {after * 1000:8.1f} ms, "
+                  f"{len(manifest)} workflows ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
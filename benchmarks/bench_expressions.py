@@ -0,0 +1,82 @@
+import argparse
+import re
+import xml.etree.ElementTree as ET
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.expressions import bracketed_expression, expression_identifiers
+from rpa_reviewer.utils import stripped_tag
+from rpa_reviewer.workflow import EXPRESSION_TAGS, parse_workflow_bytes
+from synthetic import make_workflow
+
+# Used-name detection on expression-heavy workflows: the old identifier
+# regex over CSharpValue / VisualBasicValue bodies versus the VB / C#
+# tokenizer, which also reads [bracketed] attribute and element
+# expressions. Reports throughput and how many declared variables and
+# arguments each approach flags as unused.
+
+IDENTIFIER_PATTERN = re.compile(r'\b[A-Za-z_][A-Za-z0-9_]*\b')
+
+
+def collect_expressions(root):
+    """[(expression, csharp, from an expression element)] of one workflow."""
+    expressions = []
+    for elem in root.iter():
+        tag = stripped_tag(elem.tag)
+        if tag in EXPRESSION_TAGS and elem.text:
+            expressions.append((elem.text, tag.startswith("CSharp"), True))
+        elif elem.text and bracketed_expression(elem.text):
+            expressions.append((bracketed_expression(elem.text), False, False))
+        for key, value in elem.attrib.items():
+            if key != "DisplayName" and bracketed_expression(value):
+                expressions.append((bracketed_expression(value), False, False))
+    return expressions
+
+
+def legacy_names(expressions):
+    names = set()
+    for expression, _, element in expressions:
+        if element:
+            names.update(IDENTIFIER_PATTERN.findall(expression))
+    return names
+
+
+def tokenizer_names(expressions):
+    names = set()
+    for expression, csharp, _ in expressions:
+        names.update(expression_identifiers(expression, csharp))
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark expression identifier extraction")
+    parser.add_argument("--workflows", type=int, default=200)
+    parser.add_argument("--activities", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = []  # [(declared names, expressions)]
+    for i in range(args.workflows):
+        data = make_workflow(f"Expressions{i}.xaml", activities=args.activities, variables=20, seed=i).encode("utf-8")
+        workflow = parse_workflow_bytes(f"Expressions{i}.xaml", data)
+        declared = [v.name for v in workflow.variables] + [a.name for a in workflow.arguments]
+        corpus.append((declared, collect_expressions(ET.fromstring(data))))
+
+    element_chars = sum(len(e) for _, exprs in corpus for e, _, element in exprs if element)
+    all_chars = sum(len(e) for _, exprs in corpus for e, _, _ in exprs)
+    count = sum(len(exprs) for _, exprs in corpus)
+
+    before = best_of(lambda: [legacy_names(exprs) for _, exprs in corpus], args.repeat)
+    after = best_of(lambda: [tokenizer_names(exprs) for _, exprs in corpus], args.repeat)
+    unused_before = sum(name not in legacy_names(exprs) for declared, exprs in corpus for name in declared)
+    unused_after = sum(name not in tokenizer_names(exprs) for declared, exprs in corpus for name in declared)
+    declared = sum(len(d) for d, _ in corpus)
+
+    print(f"{count} expressions, {all_chars / 1024:.1f} KiB ({element_chars / 1024:.1f} KiB in expression elements)")
+    print(f"identifier regex (elements only): {before * 1000:8.2f} ms, {element_chars / before / 1e6:6.1f} MB/s, "
+          f"{unused_before}/{declared} declared names unused")
+    print(f"tokenizer (elements + brackets):  {after * 1000:8.2f} ms, {all_chars / after / 1e6:6.1f} MB/s, "
+          f"{unused_after}/{declared} declared names unused")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+
+from common import REPO_ROOT
+from synthetic import make_project
+
+# Peak RSS of a full analysis with and without low-memory mode, each in a
+# fresh interpreter so ru_maxrss only covers that run. Also reports the
+# size of the rule state kept until the report is built. Exits with 1 when
+# the low-memory run goes over --budget-mb or its report differs.
+
+CHILD = """
+import json, pickle, sys, contextlib
+sys.path.insert(0, {repo!r})
+from rpa_reviewer.analyzer import ProjectAnalyzer
+from rpa_reviewer.utils import peak_rss_bytes
+analyzer = ProjectAnalyzer({root!r}, low_memory={low_memory!r})
+with contextlib.redirect_stdout(sys.stderr):
+    areas = analyzer.analyze()
+print(json.dumps({{
+    "peak_rss_bytes": peak_rss_bytes(),
+    "rule_state_bytes": len(pickle.dumps(analyzer.rules)),
+    "areas": areas
+}}))
+"""
+
+
+def run_child(root, low_memory):
+    code = CHILD.format(repo=REPO_ROOT, root=root, low_memory=low_memory)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak memory of ProjectAnalyzer with and without low-memory mode")
+    parser.add_argument("--workflows", type=int, default=1000)
+    parser.add_argument("--activities", type=int, default=80)
+    parser.add_argument("--budget-mb", type=float, default=150.0, help="maximum peak RSS of the low-memory run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_project(root, workflows=args.workflows, activities=args.activities, trycatch_density=0.2)
+        normal = run_child(root, False)
+        low = run_child(root, True)
+
+    if normal["peak_rss_bytes"] is None:
+        print("Peak RSS is not available on this platform")
+        return 0
+
+    mb = 1024 * 1024
+    for label, result in (("normal", normal), ("low memory", low)):
+        print(f"{label:10s}: peak RSS {result['peak_rss_bytes'] / mb:7.1f} MB, "
+              f"rule state {result['rule_state_bytes'] / 1024:8.1f} KiB")
+
+    ok = True
+    if low["areas"] != normal["areas"]:
+        print("FAIL: low-memory report differs")
+        ok = False
+    if low["peak_rss_bytes"] > args.budget_mb * mb:
+        print(f"FAIL: low-memory peak RSS over {args.budget_mb:.0f} MB")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import argparse
+import os
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.workflow import parse_workflow
+from synthetic import make_workflow
+
+# Per-file extraction cost: the old ET.parse + re-read + four root.iter()
+# walks versus the single-pass parse_workflow().
+
+
+def stripped_tag(tag):
+    # Uncached, as it was before parse_workflow()
+    return tag.split('}', 1)[1] if '}' in tag else tag
+
+
+def legacy_extract(file_path):
+    tree = ET.parse(file_path)
+    root = tree.getroot()
+    with open(file_path, "r", encoding="utf-8") as f:
+        text_content = f.read()
+
+    variables = []
+    for elem in root.iter():
+        if "Variables" in stripped_tag(elem.tag):
+            for var_elem in elem:
+                if "Variable" in stripped_tag(var_elem.tag):
+                    name = var_elem.attrib.get("Name")
+                    if name:
+                        variables.append({"name": name, "type": var_elem.attrib.get("TypeArguments")})
+
+    arguments = []
+    for members in root.iter():
+        if "Members" in stripped_tag(members.tag):
+            for prop in members:
+                if "Property" in stripped_tag(prop.tag):
+                    name = prop.attrib.get("Name")
+                    if name:
+                        arguments.append({"name": name, "direction": prop.attrib.get("Type")})
+
+    activities = []
+    for elem in root.iter():
+        display_name = elem.attrib.get("DisplayName")
+        if display_name:
+            activities.append({"type": stripped_tag(elem.tag), "display_name": display_name})
+
+    used_names = set()
+    for elem in root.iter():
+        tag = stripped_tag(elem.tag)
+        if tag in {"CSharpReference", "CSharpValue", "VisualBasicReference", "VisualBasicValue"} and elem.text:
+            used_names.update(re.findall(r'\b[A-Za-z_][A-Za-z0-9_]*\b', elem.text))
+
+    return variables, arguments, activities, used_names, text_content, tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-file XAML extraction")
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--activities", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(tmp, f"Workflow{i}.xaml")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(make_workflow(f"Workflow{i}.xaml", activities=args.activities, seed=i))
+            paths.append(path)
+
+        size = sum(os.path.getsize(p) for p in paths) / len(paths)
+        before = best_of(lambda: [legacy_extract(p) for p in paths], args.repeat) / len(paths)
+        after = best_of(lambda: [parse_workflow(p) for p in paths], args.repeat) / len(paths)
+
+    print(f"{args.files} files, {size / 1024:.1f} KiB average")
+    print(f"legacy  (ET.parse + read + 4 walks): {before * 1000:.3f} ms/file")
+    print(f"single pass (parse_workflow):         {after * 1000:.3f} ms/file")
+    print(f"speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
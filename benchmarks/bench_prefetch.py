@@ -0,0 +1,58 @@
+import argparse
+import builtins
+import tempfile
+import time
+
+from common import best_with_result  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.analyzer import ProjectAnalyzer
+from synthetic import make_project
+
+# Single-process analysis with files read inline versus read ahead by the
+# prefetch threads, with --latency-ms added to every workflow open to mimic
+# an SMB / NFS mount (the default is a slow-ish network drive). Also runs
+# a shallow queue to show the backpressure: with --depth smaller than the
+# thread count, readers wait for the parser.
+
+
+def slow_open(latency_ms):
+    real_open = builtins.open
+
+    def open_with_latency(file, *args, **kwargs):
+        if isinstance(file, str) and file.endswith(".xaml"):
+            time.sleep(latency_ms / 1000)
+        return real_open(file, *args, **kwargs)
+
+    return open_with_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the file prefetch pipeline")
+    parser.add_argument("--workflows", type=int, default=200)
+    parser.add_argument("--activities", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="delay added to every workflow open")
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--depth", type=int, default=None, help="read-ahead limit (default: 2 per thread)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_project(root, workflows=args.workflows, activities=args.activities)
+        if args.latency_ms:
+            builtins.open = slow_open(args.latency_ms)
+
+        before, expected = best_with_result(lambda: ProjectAnalyzer(root).analyze(), args.repeat)
+        print(f"{args.workflows} workflows, {args.latency_ms:g} ms per open")
+        print(f"inline reads:         {before * 1000:8.1f} ms")
+
+        settings = [(threads, args.depth) for threads in args.threads] + [(args.threads[-1], 1)]
+        for threads, depth in settings:
+            after, result = best_with_result(
+                lambda: ProjectAnalyzer(root, prefetch_threads=threads, prefetch_depth=depth).analyze(), args.repeat
+            )
+            label = f"{threads} threads, depth {depth or 2 * threads}"
+            print(f"{label:21s} {after * 1000:8.1f} ms ({before / after:.1f}x)"
+                  f"{'' if result == expected else '  REPORT DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import tempfile
+
+from common import best_of, best_of_each  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer import prescan
+from rpa_reviewer.analyzer import ProjectAnalyzer, _check_file
+from rpa_reviewer.discovery import discover_workflows
+from rpa_reviewer.engine import compile_matcher
+from rpa_reviewer.graph import INVOKE_COLLECTOR
+from rpa_reviewer.workflow import present_facts, required_facts, required_features
+from synthetic import make_project
+
+# Per-file work (read, parse, extraction, every rule's check_workflow) of
+# a project made mostly of small workflows, with and without the bytes
+# prescan: for all categories and for single-category runs, which are
+# where files can skip the parse altogether. Also shows how many files
+# lack each feature and what the prescan itself costs.
+
+RUNS = [
+    None,
+    ["Security & Credentials"],
+    ["Error Handling & Exception Management"],
+    ["Dependencies & Settings"],
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bytes-level feature prescan")
+    parser.add_argument("--workflows", type=int, default=200)
+    parser.add_argument("--activities", type=int, default=12)
+    parser.add_argument("--trycatch-density", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_project(root, workflows=args.workflows, activities=args.activities,
+                     trycatch_density=args.trycatch_density, depth=2)
+        paths = [entry.path for entry in discover_workflows(root)]
+
+        features = [prescan.prescan_file(p) for p in paths]
+        print(f"{len(paths)} workflows, {sum(os.path.getsize(p) for p in paths) / len(paths) / 1024:.1f} KiB on average")
+        for name in ("TRYCATCH", "INVOKE_WORKFLOW", "URL", "SECRET", "THROW", "CSHARP_VALUE", "ANNOTATION",
+                     "VARIABLE_DEFAULT", "ARGUMENT_KEY"):
+            bit = getattr(prescan, name)
+            print(f"  without {name:16s} {sum(1 for f in features if not f & bit):5d} files")
+        cost = best_of(lambda: [prescan.prescan_file(p) for p in paths], args.repeat)
+        print(f"prescan (mmap, all features): {cost / len(paths) * 1e6:.1f} us/file\n")
+
+        for active_rules in RUNS:
+            checks = ProjectAnalyzer(root, active_rules=active_rules).rules + [INVOKE_COLLECTOR]
+            matcher = compile_matcher(checks)
+            facts = required_facts(checks)
+            wanted = required_features(checks, facts)
+            skipped = sum(
+                1 for p in paths
+                if matcher is None and not present_facts(facts, prescan.prescan_file(p, wanted))
+            )
+
+            def run(w):
+                for p in paths:
+                    _check_file(checks, p, None, False, matcher, facts, w)
+
+            before, after = best_of_each([lambda: run(0), lambda: run(wanted)], args.repeat)
+            label = active_rules[0] if active_rules else "all categories"
+            print(f"{label:40s} {before * 1000:8.1f} ms -> {after * 1000:8.1f} ms "
+                  f"({(1 - after / before) * 100:4.0f}% saved, {skipped} files not parsed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import xml.etree.ElementTree as ET
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.engine import Selector, compile_matcher
+from rpa_reviewer.rules import DeclarativeRule
+from rpa_reviewer.utils import stripped_tag
+from rpa_reviewer.workflow import decode_workflow, extract_workflow
+from synthetic import make_workflow
+
+# Cost of N declarative rules (generated below, two selectors each) on a set
+# of workflows. "compiled" is the real path: every selector of every rule in
+# one Matcher, run by the extraction walk, then each rule's check_workflow.
+# "pass per rule" is what hand-written rules cost when each one walks the
+# tree on its own to count what it needs. Both include the same extraction
+# walk (ET.fromstring is not timed); "extra" is the time over the walk
+# without any rule.
+#
+# Selectors with a type only cost something on elements of that type, so
+# the compiled cost grows with the number of matching selectors, not with
+# the number of rules. Selectors without a type would be checked on every
+# element, like a rule pass of its own.
+
+TYPES = [
+    "Sequence", "If", "Assign", "LogMessage", "TryCatch", "Catch", "Throw", "InvokeWorkflowFile",
+    "WriteLine", "Delay", "RetryScope", "HttpClient", "ForEach", "While", "Flowchart", "FlowDecision",
+    "InvokeCode", "MultipleAssign", "AddQueueItem", "GetAsset", "Click", "TypeInto", "ElementExists"
+]
+
+
+def make_rule(i):
+    first = TYPES[i % len(TYPES)]
+    second = TYPES[(i * 7 + 3) % len(TYPES)]
+    selectors = {"a": {"type": first}}
+    if i % 3 == 0:
+        selectors["b"] = {"type": second, "display_name": "(?i)^(?!" + second.lower() + ")"}
+    elif i % 3 == 1:
+        selectors["b"] = {"type": second, "attribute": "DisplayName", "value": "[0-9]"}
+    else:
+        selectors["b"] = {"type": [first, second], "display_name": True}
+    return DeclarativeRule({
+        "category": f"Generated {i}",
+        "selectors": selectors,
+        "checkpoints": [
+            {"id": 1, "question": "a?", "kind": "count", "over": {"a": 5}, "limit": 3,
+             "pass": "ok", "fail": "{items}"},
+            {"id": 2, "question": "b?", "kind": "count", "over": {"b": 2, "a": 50}, "limit": 3,
+             "item": "{workflow} ({a}, {b})", "pass": "ok", "fail": "{items}"}
+        ]
+    })
+
+
+def per_rule_passes(rules, root):
+    # One walk per rule, as a hand-written rule scanning the workflow itself
+    results = []
+    for rule in rules:
+        selectors = [(name, spec.get("type"), Selector(name, spec)) for name, spec in rule.selectors.items()]
+        counts = {}
+        for elem in root.iter():
+            tag = stripped_tag(elem.tag)
+            display_name = elem.attrib.get("DisplayName")
+            for name, types, selector in selectors:
+                if tag == types or (isinstance(types, list) and tag in types):
+                    if selector.matches(elem.attrib, display_name):
+                        counts[name] = counts.get(name, 0) + 1
+        results.append(counts)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled declarative rule matcher")
+    parser.add_argument("--rules", type=int, nargs="+", default=[1, 5, 10, 25, 50, 100])
+    parser.add_argument("--workflows", type=int, default=20)
+    parser.add_argument("--activities", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    files = []
+    for i in range(args.workflows):
+        data = make_workflow(f"Flow{i}.xaml", activities=args.activities, seed=i).encode("utf-8")
+        files.append((f"Flow{i}.xaml", decode_workflow(data), ET.fromstring(data)))
+
+    def extract_all(matcher):
+        return [extract_workflow(name, text, root, matcher) for name, text, root in files]
+
+    base = best_of(lambda: extract_all(None), args.repeat)
+    print(f"{args.workflows} workflows, {args.activities} activities each, extraction alone {base * 1000:.1f} ms")
+    print(f"{'rules':>6s}  {'compiled':>10s}  {'extra':>10s}  {'pass per rule':>14s}  {'extra':>10s}")
+
+    for count in args.rules:
+        rules = [make_rule(i) for i in range(count)]
+        matcher = compile_matcher(rules)
+
+        # Same counts both ways
+        for (name, text, root), workflow in zip(files, extract_all(matcher)):
+            for rule, counts in zip(rules, per_rule_passes(rules, root)):
+                for sel in rule.selectors:
+                    assert workflow.matches.get((rule.category, sel), 0) == counts.get(sel, 0), (name, rule.category, sel)
+
+        def compiled():
+            for workflow in extract_all(matcher):
+                for rule in rules:
+                    rule.check_workflow(workflow)
+
+        def separate():
+            for workflow, (_, _, root) in zip(extract_all(None), files):
+                per_rule_passes(rules, root)
+
+        after = best_of(compiled, args.repeat)
+        before = best_of(separate, args.repeat)
+        print(f"{count:6d}  {after * 1000:8.1f} ms  {(after - base) * 1000:7.1f} ms  "
+              f"{before * 1000:11.1f} ms  {(before - base) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.analyzer import ProjectAnalyzer
+from rpa_reviewer.engine import compile_matcher
+from rpa_reviewer.graph import INVOKE_COLLECTOR
+from rpa_reviewer.rules import RULE_CLASSES
+from rpa_reviewer.workflow import ALL_FACTS, parse_workflow, required_facts
+from synthetic import make_project
+
+# Single-category runs: reading + parsing + extraction of every workflow
+# with all facts (what every run paid before rules declared their FACTS)
+# versus only the facts of that category and the invoke graph, and the
+# whole ProjectAnalyzer.analyze() for the category next to a full run.
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction cost of single-category runs")
+    parser.add_argument("--workflows", type=int, default=100)
+    parser.add_argument("--activities", type=int, default=80)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        make_project(root, workflows=args.workflows, activities=args.activities, trycatch_density=0.2)
+        paths = []
+        for dirpath, _, files in os.walk(root):
+            paths.extend(os.path.join(dirpath, f) for f in files if f.endswith(".xaml"))
+
+        def analyze(active_rules=None):
+            with contextlib.redirect_stdout(io.StringIO()):
+                ProjectAnalyzer(root, active_rules=active_rules).analyze()
+
+        full = best_of(analyze, args.repeat)
+        print(f"{len(paths)} workflows, full analysis {full * 1000:.1f} ms\n")
+        print(f"{'category':40s} {'all facts':>10s} {'needed':>10s} {'saved':>6s} {'analyze':>10s}  facts")
+
+        for cls in RULE_CLASSES:
+            checks = [cls(), INVOKE_COLLECTOR]
+            matcher = compile_matcher(checks)
+            facts = required_facts(checks)
+
+            before = best_of(lambda: [parse_workflow(p, matcher, ALL_FACTS) for p in paths], args.repeat)
+            after = best_of(lambda: [parse_workflow(p, matcher, facts) for p in paths], args.repeat)
+            single = best_of(lambda: analyze([cls.CATEGORY]), args.repeat)
+            print(f"{cls.CATEGORY:40s} {before * 1000:8.1f} ms {after * 1000:8.1f} ms "
+                  f"{(1 - after / before) * 100:5.0f}% {single * 1000:8.1f} ms  {', '.join(sorted(facts))}")
+
+
+if __name__ == "__main__":
+    main()
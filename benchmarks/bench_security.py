@@ -0,0 +1,68 @@
+import argparse
+import re
+import xml.etree.ElementTree as ET
+
+from common import best_with_result  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.workflow import QUOTED_URL_PATTERN, element_path, find_urls, is_schema_url, is_secret_attribute
+from synthetic import make_workflow
+
+# SecurityRule URL / password detection: the old regex + splitlines() loop
+# over the raw text versus the attribute scan done during the tree walk
+# (re-created here on its own so it can be timed without the rest of the
+# walk, including resolving element paths for the hits). Parsing is shared
+# by both and shown for reference only.
+
+
+def legacy_security(txt):
+    pw_pattern = r'(?:Password|SecurePassword|Credential)\b\s*=\s*"([^"]+)"'
+    has_pw = any(pw.strip().lower() != "{x:null}" for pw in re.findall(pw_pattern, txt, re.IGNORECASE))
+
+    for line in txt.splitlines():
+        if "xmlns" in line or "http://schemas." in line or "mc:Ignorable" in line:
+            continue
+        for url in re.findall(r'"(https?://[^"]+)"', line):
+            if "schemas.uipath.com" not in url and "schemas.microsoft.com" not in url:
+                return has_pw, 1  # stopped at the first URL
+    return has_pw, 0
+
+
+def attribute_scan(root):
+    hits = []
+    for elem in root.iter():
+        for key, value in elem.attrib.items():
+            if "://" in value:
+                for url in find_urls(value):
+                    hits.append((elem, "url", key, url))
+            if is_secret_attribute(key) and value.strip().lower() != "{x:null}":
+                hits.append((elem, "password", key, None))
+        if elem.text and "://" in elem.text:
+            for url in QUOTED_URL_PATTERN.findall(elem.text):
+                if not is_schema_url(url):
+                    hits.append((elem, "url", "(text)", url))
+    if hits:
+        parents = {child: parent for parent in root.iter() for child in parent}
+        hits = [(element_path(elem, parents), kind, key, value) for elem, kind, key, value in hits]
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SecurityRule URL / password detection")
+    parser.add_argument("--activities", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for activities in args.activities:
+        txt = make_workflow("Security.xaml", activities=activities, depth=5)
+        data = txt.encode("utf-8")
+
+        parse, root = best_with_result(lambda: ET.fromstring(data), args.repeat)
+        before, (_, first_only) = best_with_result(lambda: legacy_security(txt), args.repeat)
+        after, hits = best_with_result(lambda: attribute_scan(root), args.repeat)
+        print(f"{activities:6d} activities, {len(txt) / 1024:8.1f} KiB: "
+              f"line loop {before * 1000:8.2f} ms ({first_only} URL reported), "
+              f"attribute scan {after * 1000:8.2f} ms ({len(hits)} hits with paths), "
+              f"ET.fromstring {parse * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
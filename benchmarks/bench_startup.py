@@ -0,0 +1,79 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Startup cost of the `python -m rpa_reviewer` command-line runner, which is
+# meant for git hooks: the time to review an empty project (interpreter start,
+# imports, argument parsing) must stay under a budget, and none of the server
+# stack may be imported. Exits non-zero when either check fails, so it can
+# run in CI.
+
+SERVER_MODULES = ("fastapi", "pydantic", "uvicorn", "starlette")
+
+IMPORT_CHECK = (
+    "import sys, runpy; sys.argv = ['rpa_reviewer', '--help']\n"
+    "try:\n"
+    "    runpy.run_module('rpa_reviewer', run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    "print('loaded:' + ','.join(m for m in %r if m in sys.modules), file=sys.stderr)\n" % (SERVER_MODULES,)
+)
+
+
+def time_run(cmd):
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=REPO_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="maximum median startup time for the CLI")
+    args = parser.parse_args()
+
+    ok = True
+
+    out = subprocess.run([sys.executable, "-c", IMPORT_CHECK], cwd=REPO_ROOT,
+                         capture_output=True, text=True)
+    loaded = [line for line in out.stderr.splitlines() if line.startswith("loaded:")]
+    if not loaded:
+        print(f"FAIL: could not run the CLI\n{out.stderr}")
+        return 1
+    loaded = loaded[-1][len("loaded:"):]
+    if loaded:
+        print(f"FAIL: CLI imports server modules: {loaded}")
+        ok = False
+    else:
+        print("ok: no server modules imported")
+
+    with tempfile.TemporaryDirectory() as project:
+        cli = [sys.executable, "-m", "rpa_reviewer", project]
+        bare = [sys.executable, "-c", "pass"]
+
+        time_run(cli)  # warm the bytecode and file system caches
+        cli_times = [time_run(cli) for _ in range(args.runs)]
+        bare_times = [time_run(bare) for _ in range(args.runs)]
+
+    cli_ms = statistics.median(cli_times) * 1000
+    bare_ms = statistics.median(bare_times) * 1000
+    print(f"interpreter only: {bare_ms:.1f} ms")
+    print(f"rpa_reviewer CLI: {cli_ms:.1f} ms  (budget {args.budget_ms:.0f} ms, "
+          f"{cli_ms - bare_ms:.1f} ms over a bare interpreter)")
+
+    if cli_ms > args.budget_ms:
+        print("FAIL: CLI startup over budget")
+        ok = False
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import argparse
+import io
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from common import best_of  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.workflow import decode_workflow, extract_workflow, stream_workflow
+from synthetic import make_workflow
+
+# Extraction of a single, increasingly large workflow: ET.fromstring +
+# extract_workflow versus stream_workflow (iterparse, elements cleared as
+# they close). Memory is the tracemalloc peak above the raw bytes and the
+# decoded text, which both paths keep for the rules.
+
+
+def tree_extract(data, text):
+    return extract_workflow("Large.xaml", text, ET.fromstring(data))
+
+
+def streaming_extract(data, text):
+    return stream_workflow("Large.xaml", text, io.BytesIO(data))
+
+
+def measure(func, data, text, repeat):
+    best = best_of(lambda: func(data, text), repeat)
+
+    tracemalloc.start()
+    func(data, text)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tree versus streaming extraction of large workflows")
+    parser.add_argument("--activities", type=int, nargs="+", default=[1000, 10000, 50000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for activities in args.activities:
+        text = make_workflow("Large.xaml", activities=activities, depth=5)
+        data = text.encode("utf-8")
+        text = decode_workflow(data)
+
+        tree_time, tree_peak = measure(tree_extract, data, text, args.repeat)
+        stream_time, stream_peak = measure(streaming_extract, data, text, args.repeat)
+        print(f"{activities:6d} activities, {len(data) / 1024 / 1024:7.2f} MiB: "
+              f"tree {tree_time * 1000:8.1f} ms / {tree_peak / 1024 / 1024:7.2f} MiB peak, "
+              f"streaming {stream_time * 1000:8.1f} ms / {stream_peak / 1024 / 1024:7.2f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
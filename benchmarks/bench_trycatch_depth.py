@@ -0,0 +1,42 @@
+import argparse
+import re
+import xml.etree.ElementTree as ET
+
+from common import best_with_result  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.workflow import parse_workflow_bytes
+from synthetic import make_nested_trycatch_workflow
+
+# Nested TryCatch detection on deeply nested workflows: the old DOTALL regex
+# over the raw text versus the depth computed in the parse pass. The parse
+# pass column is the whole parse_workflow_bytes() call; the bare ET.fromstring
+# time is shown next to it for reference.
+
+
+def legacy_nested(txt):
+    for block in re.findall(r'<TryCatch[^>]*>.*?</TryCatch>', txt, re.DOTALL):
+        if block.count("<TryCatch") > 1:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark nested TryCatch detection")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 5, 25, 100, 400])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for depth in args.depths:
+        txt = make_nested_trycatch_workflow(depth)
+        data = txt.encode("utf-8")
+
+        before, nested = best_with_result(lambda: legacy_nested(txt), args.repeat)
+        parse_only, _ = best_with_result(lambda: ET.fromstring(data), args.repeat)
+        after, workflow = best_with_result(lambda: parse_workflow_bytes("Nested.xaml", data), args.repeat)
+        print(f"depth {depth:4d}, {len(txt) / 1024:7.1f} KiB: "
+              f"regex {before * 1000:7.2f} ms (nested={nested}), "
+              f"ET.fromstring {parse_only * 1000:7.2f} ms, "
+              f"parse pass {after * 1000:7.2f} ms (max depth {workflow.max_trycatch_depth})")
+
+
+if __name__ == "__main__":
+    main()
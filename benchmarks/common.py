@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+# Shared by the benchmark scripts: importing this module puts the checkout
+# it lives in on sys.path, so import it before rpa_reviewer. Timings are
+# the best of `repeat` runs, which is the least disturbed by other load.
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+
+def best_of(func, repeat):
+    """Seconds of the fastest of `repeat` calls of func()."""
+    return best_with_result(func, repeat)[0]
+
+
+def best_with_result(func, repeat):
+    """(seconds of the fastest of `repeat` calls of func(), what the last call returned)"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def best_of_each(funcs, repeat):
+    """best_of for several variants, interleaved so a noisy machine affects them alike."""
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func()
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
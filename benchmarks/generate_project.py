@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+from synthetic import make_project
+
+# Writes a synthetic REFramework-style UiPath project, e.g. to reproduce a
+# benchmark by hand or to point the server / CLI at something realistic:
+#
+#   python benchmarks/generate_project.py /tmp/bench_project --workflows 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic UiPath project")
+    parser.add_argument("root", help="directory to write the project to")
+    parser.add_argument("--workflows", type=int, default=30, help="workflows besides the REFramework ones")
+    parser.add_argument("--activities", type=int, default=60, help="average activities per workflow")
+    parser.add_argument("--variables", type=int, default=8)
+    parser.add_argument("--arguments", type=int, default=4)
+    parser.add_argument("--trycatch-density", type=float, default=0.1)
+    parser.add_argument("--depth", type=int, default=4, help="maximum container nesting")
+    parser.add_argument("--dependencies", type=int, default=4, help="entries in project.json")
+    parser.add_argument("--breakpoints", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if os.path.exists(os.path.join(args.root, "project.json")):
+        print(f"{args.root} already contains a project", file=sys.stderr)
+        return 1
+
+    names = make_project(
+        args.root,
+        workflows=args.workflows,
+        activities=args.activities,
+        variables=args.variables,
+        arguments=args.arguments,
+        trycatch_density=args.trycatch_density,
+        depth=args.depth,
+        dependencies=args.dependencies,
+        breakpoints=args.breakpoints,
+        seed=args.seed,
+    )
+    print(f"Wrote {len(names)} workflows to {args.root}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import REPO_ROOT  # before rpa_reviewer: puts the repo on sys.path
+from rpa_reviewer.analyzer import ProjectAnalyzer
+from rpa_reviewer.engine import compile_matcher
+from rpa_reviewer.workflow import parse_workflow
+from synthetic import make_project
+
+# End-to-end benchmark of ProjectAnalyzer.analyze on generated REFramework
+# projects, plus a per-rule breakdown (parse, check_workflow over every file,
+# get_result). Results are written as JSON tagged with the commit, so runs
+# from two commits can be compared:
+#
+#   python benchmarks/run.py -o before.json
+#   ... change rules.py ...
+#   python benchmarks/run.py --compare before.json
+#
+# --compare exits with 1 when a scenario got slower than --threshold.
+
+SCENARIOS = {
+    "small": dict(workflows=20, activities=40, trycatch_density=0.1),
+    "medium": dict(workflows=100, activities=60, trycatch_density=0.1),
+    "large": dict(workflows=400, activities=80, trycatch_density=0.1, depth=5),
+    "catch_heavy": dict(workflows=100, activities=60, trycatch_density=0.35),
+}
+
+
+def git_info():
+    def git(*args):
+        try:
+            out = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+            return out.stdout.strip() if out.returncode == 0 else None
+        except OSError:
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--", "rpa_reviewer"))}
+
+
+def timed(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": round(min(times), 5), "median": round(statistics.median(times), 5)}
+
+
+def project_files(root):
+    paths = []
+    for dirpath, _, files in os.walk(root):
+        paths.extend(os.path.join(dirpath, f) for f in files if f.endswith(".xaml"))
+    return paths
+
+
+def run_scenario(root, repeat):
+    paths = project_files(root)
+    # Selectors of the declarative rules are matched while parsing
+    matcher = compile_matcher(ProjectAnalyzer(root).rules)
+    result = {
+        "files": len(paths),
+        "bytes": sum(os.path.getsize(p) for p in paths),
+        "analyze": timed(lambda: ProjectAnalyzer(root).analyze(), repeat),
+        "parse": timed(lambda: [parse_workflow(p, matcher) for p in paths], repeat),
+        "rules": {},
+    }
+
+    # One full run leaves the rules configured from project.json /
+    # ProjectSettings.json and holding the project's findings, which is the
+    # state check_workflow and get_result see in a real review.
+    analyzer = ProjectAnalyzer(root)
+    analyzer.analyze()
+    workflows = [parse_workflow(p, matcher) for p in paths]
+    for rule in analyzer.rules:
+        result["rules"][rule.category] = {
+            "check_workflow": timed(lambda: [rule.check_workflow(w) for w in workflows], repeat),
+            "get_result": timed(rule.get_result, repeat),
+        }
+    return result
+
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for name, result in current["scenarios"].items():
+        old = baseline["scenarios"].get(name)
+        if old is None:
+            continue
+        rows = [("analyze", old["analyze"], result["analyze"]), ("parse", old["parse"], result["parse"])]
+        for category, timings in result["rules"].items():
+            if category in old["rules"]:
+                rows.append((category, old["rules"][category]["check_workflow"], timings["check_workflow"]))
+
+        print(f"\n{name} (baseline {baseline['meta']['commit'] or '?'}):")
+        for label, before, after in rows:
+            # Best-of-N is the least noisy figure to compare
+            ratio = after["min"] / before["min"] if before["min"] else float("inf")
+            print(f"  {label:40s} {before['min'] * 1000:9.2f} ms -> {after['min'] * 1000:9.2f} ms  x{ratio:.2f}")
+            if label == "analyze" and ratio > 1 + threshold:
+                regressions.append(name)
+
+    for name in regressions:
+        print(f"REGRESSION: {name} analyze is more than {threshold:.0%} slower")
+    return not regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ProjectAnalyzer on synthetic projects")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=["small", "medium", "catch_heavy"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="JSON file to write (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown for --compare")
+    args = parser.parse_args()
+
+    meta = git_info()
+    meta.update({
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "seed": args.seed,
+    })
+    report = {"meta": meta, "scenarios": {}}
+
+    for name in args.scenarios:
+        params = SCENARIOS[name]
+        with tempfile.TemporaryDirectory() as root:
+            make_project(root, seed=args.seed, **params)
+            result = run_scenario(root, args.repeat)
+        result["params"] = params
+        report["scenarios"][name] = result
+        print(f"{name:12s} {result['files']:4d} files, {result['bytes'] / 1024:8.0f} KiB: "
+              f"analyze {result['analyze']['median'] * 1000:8.1f} ms, parse {result['parse']['median'] * 1000:8.1f} ms")
+        for category, timings in result["rules"].items():
+            print(f"    {category:40s} {timings['check_workflow']['median'] * 1000:8.2f} ms")
+
+    output = args.output
+    if output is None:
+        commit = (meta["commit"] or "nocommit")[:10]
+        output = os.path.join(REPO_ROOT, "benchmarks", "results", f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        return 0 if compare(report, baseline, args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
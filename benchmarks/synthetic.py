@@ -0,0 +1,391 @@
+import os
+import json
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+# Synthetic UiPath workflow generator used by the benchmark scripts.
+# Output mimics what Studio writes for REFramework projects closely enough
+# to exercise every rule in rules.py.
+
+HEADER = (
+    '<Activity mc:Ignorable="sap sap2010" x:Class="{cls}" '
+    'xmlns="http://schemas.microsoft.com/netfx/2009/xaml/activities" '
+    'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+    'xmlns:s="clr-namespace:System;assembly=System.Private.CoreLib" '
+    'xmlns:sap="http://schemas.microsoft.com/netfx/2009/xaml/activities/presentation" '
+    'xmlns:sap2010="http://schemas.microsoft.com/netfx/2010/xaml/activities/presentation" '
+    'xmlns:scg="clr-namespace:System.Collections.Generic;assembly=System.Private.CoreLib" '
+    'xmlns:sco="clr-namespace:System.Collections.ObjectModel;assembly=System.Private.CoreLib" '
+    'xmlns:ue="clr-namespace:UiPath.Excel;assembly=UiPath.Excel.Activities" '
+    'xmlns:ui="http://schemas.uipath.com/workflow/activities" '
+    'xmlns:x="http://schemas.microsoft.com/winfx/2006/xaml">\n'
+)
+
+VIEWSTATE = (
+    '<sap:WorkflowViewStateService.ViewState>'
+    '<scg:Dictionary x:TypeArguments="x:String, x:Object">'
+    '<x:Boolean x:Key="IsExpanded">True</x:Boolean>'
+    '</scg:Dictionary>'
+    '</sap:WorkflowViewStateService.ViewState>\n'
+)
+
+REFERENCES = (
+    '<TextExpression.NamespacesForImplementation>\n'
+    '<sco:Collection x:TypeArguments="x:String">\n'
+    '<x:String>System</x:String>\n'
+    '<x:String>UiPath.Core</x:String>\n'
+    '<x:String>UiPath.Excel</x:String>\n'
+    '</sco:Collection>\n'
+    '</TextExpression.NamespacesForImplementation>\n'
+    '<TextExpression.ReferencesForImplementation>\n'
+    '<sco:Collection x:TypeArguments="AssemblyReference">\n'
+    '<AssemblyReference>System.Private.CoreLib</AssemblyReference>\n'
+    '<AssemblyReference>UiPath.System.Activities</AssemblyReference>\n'
+    '<AssemblyReference>UiPath.Excel.Activities</AssemblyReference>\n'
+    '</sco:Collection>\n'
+    '</TextExpression.ReferencesForImplementation>\n'
+)
+
+
+class WorkflowWriter:
+    def __init__(self, rng, variables, arguments):
+        self.rng = rng
+        self.variables = variables
+        self.arguments = arguments
+        self.ids = 0
+        self.parts = []
+
+    def _id(self, kind):
+        self.ids += 1
+        return f'sap2010:WorkflowViewState.IdRef="{kind}_{self.ids}"'
+
+    def _name(self):
+        pool = self.variables + self.arguments
+        return self.rng.choice(pool) if pool else "in_Config"
+
+    def _annotation(self):
+        if self.rng.random() < 0.3:
+            return f' sap2010:Annotation.AnnotationText="Note {self.ids}"'
+        return ""
+
+    def expression(self, tag="CSharpValue", type_arg="x:String"):
+        name = self._name()
+        return (
+            f'<{tag} x:TypeArguments="{type_arg}">'
+            f'{escape(name)}.ToString() + in_Config[&quot;Key{self.ids}&quot;].ToString()'
+            f'</{tag}>'
+        )
+
+    def simple(self):
+        rng = self.rng
+        kind = rng.random()
+        if kind < 0.35:
+            return (
+                f'<Assign DisplayName="Assign {self.ids}" {self._id("Assign")}>\n'
+                f'<Assign.To><OutArgument x:TypeArguments="x:String">'
+                f'<CSharpReference x:TypeArguments="x:String">{escape(self._name())}</CSharpReference>'
+                f'</OutArgument></Assign.To>\n'
+                f'<Assign.Value><InArgument x:TypeArguments="x:String">{self.expression()}</InArgument></Assign.Value>\n'
+                f'</Assign>\n'
+            )
+        if kind < 0.6:
+            return (
+                f'<ui:LogMessage DisplayName="Log Message {self.ids}" Level="Info" '
+                f'Message="[{self._name()}]" {self._id("LogMessage")} />\n'
+            )
+        if kind < 0.7:
+            target = rng.choice(["Framework\\InitAllSettings.xaml", "Process.xaml", f"Sub\\Step{rng.randint(1, 9)}.xaml"])
+            return (
+                f'<ui:InvokeWorkflowFile DisplayName="Invoke {self.ids}" WorkflowFileName="{target}" {self._id("InvokeWorkflowFile")}>\n'
+                f'<ui:InvokeWorkflowFile.Arguments>\n'
+                f'<InArgument x:TypeArguments="x:String" x:Key="in_Value">[{self._name()}]</InArgument>\n'
+                f'<InArgument x:TypeArguments="x:String" x:Key="in_Literal">hello</InArgument>\n'
+                f'</ui:InvokeWorkflowFile.Arguments>\n'
+                f'</ui:InvokeWorkflowFile>\n'
+            )
+        if kind < 0.75:
+            return f'<WriteLine DisplayName="Write Line {self.ids}" Text="[{self._name()}]" {self._id("WriteLine")} />\n'
+        if kind < 0.8:
+            url = rng.choice(["https://example.com/api", "http://intranet.local/login"])
+            return f'<ui:HttpClient DisplayName="HTTP {self.ids}" EndPoint="{url}" {self._id("HttpClient")} />\n'
+        if kind < 0.84:
+            pw = rng.choice(["{x:Null}", "Secret123"])
+            return f'<ui:TypeSecureText DisplayName="Type Password {self.ids}" Password="{pw}" {self._id("TypeSecureText")} />\n'
+        if kind < 0.88:
+            return (
+                f'<ui:InvokeCode DisplayName="Invoke Code {self.ids}"{self._annotation()} '
+                f'Code="Console.WriteLine(1)" {self._id("InvokeCode")} />\n'
+            )
+        if kind < 0.91:
+            return (
+                f'<ui:CommentOut DisplayName="Comment Out {self.ids}" {self._id("CommentOut")}>\n'
+                f'<ui:CommentOut.Body><Sequence DisplayName="Ignored">{VIEWSTATE}</Sequence></ui:CommentOut.Body>\n'
+                f'</ui:CommentOut>\n'
+            )
+        if kind < 0.94:
+            return (
+                f'<ui:RetryScope DisplayName="Retry Scope {self.ids}" NumberOfRetries="3" {self._id("RetryScope")}>\n'
+                f'<ui:RetryScope.ActivityBody><ActivityAction><Sequence DisplayName="Action">\n'
+                f'{VIEWSTATE}</Sequence></ActivityAction></ui:RetryScope.ActivityBody>\n'
+                f'</ui:RetryScope>\n'
+            )
+        return (
+            f'<Delay DisplayName="Delay {self.ids}" Duration="00:00:01" {self._id("Delay")} />\n'
+        )
+
+    def catch(self, exception_type):
+        rng = self.rng
+        if rng.random() < 0.1:
+            return f'<Catch x:TypeArguments="{exception_type}" {self._id("Catch")}>\n</Catch>\n'
+        body = []
+        if rng.random() < 0.8:
+            body.append(
+                f'<ui:LogMessage DisplayName="Log Error {self.ids}" Level="Error" '
+                f'Message="[exception.Message]" {self._id("LogMessage")} />\n'
+            )
+        if rng.random() < 0.7:
+            thrown = rng.choice(["BusinessRuleException", "System.Exception", "ApplicationException"])
+            if rng.random() < 0.5:
+                body.append(
+                    f'<Throw DisplayName="Throw {self.ids}" '
+                    f'Exception="[New {thrown}(&quot;Failed step {self.ids}&quot;)]" {self._id("Throw")} />\n'
+                )
+            else:
+                body.append(
+                    f'<Throw DisplayName="Throw {self.ids}" {self._id("Throw")}>\n'
+                    f'<InArgument x:TypeArguments="s:Exception">'
+                    f'<CSharpValue x:TypeArguments="s:Exception">new {thrown}("Failed " + {self._name()} + " step")</CSharpValue>'
+                    f'</InArgument>\n</Throw>\n'
+                )
+        return (
+            f'<Catch x:TypeArguments="{exception_type}" {self._id("Catch")}>\n'
+            f'<ActivityAction x:TypeArguments="{exception_type}">\n'
+            f'<ActivityAction.Argument><DelegateInArgument x:TypeArguments="{exception_type}" Name="exception" /></ActivityAction.Argument>\n'
+            f'<Sequence DisplayName="Handle {self.ids}" {self._id("Sequence")}>\n'
+            f'{VIEWSTATE}{"".join(body)}</Sequence>\n'
+            f'</ActivityAction>\n'
+            f'</Catch>\n'
+        )
+
+    def block(self, budget, depth, trycatch_density):
+        """Emit roughly ``budget`` activities, nesting containers up to ``depth``."""
+        rng = self.rng
+        out = []
+        while budget > 0:
+            roll = rng.random()
+            if depth > 0 and roll < trycatch_density:
+                inner = max(1, budget // 3)
+                catches = "".join(
+                    self.catch(t) for t in rng.sample(
+                        ["ui:BusinessRuleException", "s:Exception", "s:ArgumentException"], rng.randint(1, 2)
+                    )
+                )
+                out.append(
+                    f'<TryCatch DisplayName="Try Catch {self.ids}" {self._id("TryCatch")}>\n'
+                    f'<TryCatch.Try><Sequence DisplayName="Try Body {self.ids}" {self._id("Sequence")}>\n'
+                    f'{VIEWSTATE}{self.block(inner, depth - 1, trycatch_density)}'
+                    f'</Sequence></TryCatch.Try>\n'
+                    f'<TryCatch.Catches>\n{catches}</TryCatch.Catches>\n'
+                    f'</TryCatch>\n'
+                )
+                budget -= inner + 1
+            elif depth > 0 and roll < trycatch_density + 0.1:
+                inner = max(1, budget // 3)
+                out.append(
+                    f'<If DisplayName="If {self.ids}"{self._annotation()} {self._id("If")}>\n'
+                    f'<If.Condition><InArgument x:TypeArguments="x:Boolean">'
+                    f'{self.expression("CSharpValue", "x:Boolean")}</InArgument></If.Condition>\n'
+                    f'<If.Then><Sequence DisplayName="Then" {self._id("Sequence")}>\n'
+                    f'{self.block(inner, depth - 1, trycatch_density)}</Sequence></If.Then>\n'
+                    f'</If>\n'
+                )
+                budget -= inner + 1
+            elif depth > 0 and roll < trycatch_density + 0.15:
+                inner = max(1, budget // 4)
+                out.append(
+                    f'<Sequence DisplayName="Step {self.ids}" {self._id("Sequence")}>\n'
+                    f'{VIEWSTATE}{self.block(inner, depth - 1, trycatch_density)}</Sequence>\n'
+                )
+                budget -= inner + 1
+            else:
+                out.append(self.simple())
+                budget -= 1
+        return "".join(out)
+
+
+def make_workflow(name, activities=60, variables=8, arguments=4, trycatch_density=0.1, depth=4, seed=0):
+    """Return the XAML text of one synthetic workflow."""
+    rng = random.Random(f"{name}:{seed}")
+    prefixes = ["str", "int", "dt", "bool", "dbl"]
+    var_names = []
+    for i in range(variables):
+        if rng.random() < 0.1:
+            var_names.append(f"badName{i}")
+        else:
+            var_names.append(f"{rng.choice(prefixes)}_Value{i}")
+    arg_defs = []
+    for i in range(arguments):
+        direction = rng.choice(["InArgument", "OutArgument", "InOutArgument"])
+        prefix = {"InArgument": "in_", "OutArgument": "out_", "InOutArgument": "io_"}[direction]
+        arg_defs.append((f"{prefix}Arg{i}", direction))
+
+    writer = WorkflowWriter(rng, var_names, [a for a, _ in arg_defs] + ["in_Config"])
+    body = writer.block(activities, depth, trycatch_density)
+
+    members = "".join(
+        f'<x:Property Name="{arg}" Type="{direction}(x:String)" />\n' for arg, direction in arg_defs
+    )
+    members += '<x:Property Name="in_Config" Type="InArgument(scg:Dictionary(x:String, x:Object))" />\n'
+
+    var_xml = []
+    for var in var_names:
+        if rng.random() < 0.15:
+            var_xml.append(
+                f'<Variable x:TypeArguments="x:String" Name="{var}">\n'
+                f'<Variable.Default><Literal x:TypeArguments="x:String">test{rng.randint(1, 99)}</Literal></Variable.Default>\n'
+                f'</Variable>\n'
+            )
+        else:
+            var_xml.append(f'<Variable x:TypeArguments="x:String" Name="{var}" />\n')
+
+    cls = name.replace(".xaml", "").replace(" ", "_")
+    return (
+        HEADER.format(cls=escape(cls))
+        + f'<x:Members>\n{members}</x:Members>\n'
+        + REFERENCES
+        + f'<Sequence DisplayName={quoteattr(cls)} {writer._id("Sequence")}>\n'
+        + f'<Sequence.Variables>\n{"".join(var_xml)}</Sequence.Variables>\n'
+        + VIEWSTATE
+        + body
+        + '</Sequence>\n</Activity>\n'
+    )
+
+
+def make_plain_workflow(name):
+    """
+    Return the XAML text of a workflow with none of the features the
+    prescan looks for (no TryCatch, invokes, URLs, secrets, annotations,
+    defaults...), but with a badly named variable, a CommentOut and a
+    WriteLine for the rules to report.
+    """
+    cls = name.replace(".xaml", "").replace(" ", "_")
+    return (
+        HEADER.format(cls=escape(cls))
+        + REFERENCES
+        + f'<Sequence DisplayName={quoteattr(cls)} sap2010:WorkflowViewState.IdRef="Sequence_1">\n'
+        + '<Sequence.Variables>\n<Variable x:TypeArguments="x:String" Name="badName" />\n</Sequence.Variables>\n'
+        + VIEWSTATE
+        + '<ui:CommentOut DisplayName="Comment Out" sap2010:WorkflowViewState.IdRef="CommentOut_1">\n'
+        + '<ui:CommentOut.Body>\n<Sequence DisplayName="Ignored Activities" sap2010:WorkflowViewState.IdRef="Sequence_2">\n'
+        + '<Assign DisplayName="Assign" sap2010:WorkflowViewState.IdRef="Assign_1" />\n'
+        + '</Sequence>\n</ui:CommentOut.Body>\n</ui:CommentOut>\n'
+        + '<WriteLine DisplayName="Write Line" Text="[badName]" sap2010:WorkflowViewState.IdRef="WriteLine_1" />\n'
+        + '</Sequence>\n</Activity>\n'
+    )
+
+
+def make_nested_trycatch_workflow(depth, activities_per_level=5, seed=0):
+    """Return a workflow whose TryCatch blocks are nested ``depth`` levels deep."""
+    rng = random.Random(f"nested:{depth}:{seed}")
+    writer = WorkflowWriter(rng, ["str_Value"], ["in_Config"])
+    body = ""
+    for level in range(depth):
+        filler = "".join(writer.simple() for _ in range(activities_per_level))
+        body = (
+            f'<TryCatch DisplayName="Try Level {level}" {writer._id("TryCatch")}>\n'
+            f'<TryCatch.Try><Sequence DisplayName="Level {level}" {writer._id("Sequence")}>\n'
+            f'{VIEWSTATE}{filler}{body}</Sequence></TryCatch.Try>\n'
+            f'<TryCatch.Catches>\n{writer.catch("s:Exception")}</TryCatch.Catches>\n'
+            f'</TryCatch>\n'
+        )
+    return (
+        HEADER.format(cls="Nested")
+        + REFERENCES
+        + f'<Sequence DisplayName="Nested" {writer._id("Sequence")}>\n'
+        + '<Sequence.Variables>\n<Variable x:TypeArguments="x:String" Name="str_Value" />\n</Sequence.Variables>\n'
+        + body
+        + '</Sequence>\n</Activity>\n'
+    )
+
+
+REFRAMEWORK_FILES = [
+    "Main.xaml",
+    "Process.xaml",
+    "Framework/InitAllSettings.xaml",
+    "Framework/InitAllApplications.xaml",
+    "Framework/CloseAllApplications.xaml",
+    "Framework/KillAllProcesses.xaml",
+    "Framework/GetTransactionData.xaml",
+    "Framework/SetTransactionStatus.xaml",
+    "Framework/RetryCurrentTransaction.xaml",
+    "Framework/TakeScreenshot.xaml",
+]
+
+DEPENDENCIES = {
+    "UiPath.System.Activities": "[23.10.0]",
+    "UiPath.UIAutomation.Activities": "[23.10.0]",
+    "UiPath.Excel.Activities": "[2.20.0]",
+    "UiPath.Mail.Activities": "[1.20.0]",
+    "UiPath.Testing.Activities": "[23.10.0]",
+    "UiPath.WebAPI.Activities": "[1.18.0]",
+}
+
+
+def make_project(root, workflows=30, activities=60, variables=8, arguments=4, trycatch_density=0.1,
+                 depth=4, dependencies=4, breakpoints=3, seed=0):
+    """
+    Write a REFramework-style project to ``root``: the framework workflows,
+    ``workflows`` extra workflows under Workflows/, a project.json with the
+    first ``dependencies`` entries of DEPENDENCIES and ``breakpoints``
+    enabled breakpoints in .local/ProjectSettings.json. Activity counts vary
+    by +/-50% around ``activities`` per file. Returns the file names written.
+    """
+    rng = random.Random(f"project:{seed}")
+    names = list(REFRAMEWORK_FILES)
+    names += [f"Workflows/{rng.choice(['Get', 'Process', 'Update', 'Validate'])}Step{i}.xaml" for i in range(workflows)]
+    if workflows:
+        names[-1] = "Workflows/step with spaces.xaml"  # trips the naming checkpoint
+
+    for name in names:
+        path = os.path.join(root, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        text = make_workflow(
+            os.path.basename(name),
+            activities=max(1, int(activities * rng.uniform(0.5, 1.5))),
+            variables=variables,
+            arguments=arguments,
+            trycatch_density=trycatch_density,
+            depth=depth,
+            seed=seed,
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    project = {
+        "name": os.path.basename(os.path.normpath(root)),
+        "main": "Main.xaml",
+        "dependencies": dict(list(DEPENDENCIES.items())[:dependencies]),
+        "projectVersion": "1.0.0",
+    }
+    with open(os.path.join(root, "project.json"), "w", encoding="utf-8") as f:
+        json.dump(project, f, indent=2)
+
+    if breakpoints:
+        values = {}
+        for _ in range(breakpoints):
+            name = rng.choice(names).replace("/", "\\")
+            values.setdefault(name, []).append(
+                {"ActivityName": f"Assign {rng.randint(1, 50)}", "IsEnabled": True}
+            )
+        settings = {"ProjectBreakpoints": json.dumps({"Value": values})}
+        os.makedirs(os.path.join(root, ".local"), exist_ok=True)
+        with open(os.path.join(root, ".local", "ProjectSettings.json"), "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2)
+
+    if workflows:
+        # A "simple" file the prescan finds nothing in
+        names.append("Workflows/PlainStep.xaml")
+        with open(os.path.join(root, "Workflows", "PlainStep.xaml"), "w", encoding="utf-8") as f:
+            f.write(make_plain_workflow("PlainStep.xaml"))
+
+    return names
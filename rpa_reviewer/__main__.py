@@ -0,0 +1,123 @@
+"""
+One-shot review from the command line, e.g. in a git hook or CI step:
+
+    python -m rpa_reviewer PATH [--rule CATEGORY ...] [--rules FILE] [--json]
+
+Exits with 1 when any checkpoint FAILs, 2 when the project can't be read.
+Only the analysis modules are imported; the server stack (FastAPI,
+pydantic, uvicorn) never is.
+"""
+import os
+import sys
+import json
+import argparse
+import contextlib
+from .analyzer import ProjectAnalyzer, summarize
+from .rules import RULE_CLASSES
+from .engine import load_rule_specs
+
+STATUS_MARKS = {"PASS": "ok  ", "FAIL": "FAIL", "N/A": "n/a "}
+
+
+def print_report(area_results, stats, verbose):
+    for area in area_results:
+        print(f"\n{area['name']}")
+        for cp in area["checkpoints"]:
+            print(f"  [{STATUS_MARKS.get(cp['status'], cp['status'])}] {cp['question']}")
+            if cp["status"] == "FAIL" or verbose:
+                for line in cp["comment"].splitlines():
+                    print(f"         {line}")
+
+    print(
+        f"\n{stats['pass_count']} passed, {stats['fail_count']} failed "
+        f"({stats['overall_percentage']}% compliance)"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rpa_reviewer",
+        description="Review a UiPath project and exit non-zero if any checkpoint fails."
+    )
+    parser.add_argument("path", help="UiPath project directory")
+    parser.add_argument(
+        "--rule", action="append", dest="active_rules", metavar="CATEGORY",
+        help="only run this rule category (repeatable, default: all)"
+    )
+    parser.add_argument("--rules", metavar="FILE", help="JSON file with declarative rules to run as well")
+    parser.add_argument("--skip-framework", action="store_true", help="skip REFramework default workflows")
+    parser.add_argument("--ignore", action="append", default=[], metavar="GLOB",
+                        help="skip paths matching this .gitignore style pattern (repeatable)")
+    parser.add_argument("--no-gitignore", action="store_true", help="also analyze workflows the project's .gitignore excludes")
+    parser.add_argument("--discovery-threads", type=int, default=1, metavar="N", help="threads for finding workflows (network drives)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes for parsing")
+    parser.add_argument("--prefetch-threads", type=int, default=0, metavar="N",
+                        help="threads reading workflows ahead of the parser when running in one process (network drives)")
+    parser.add_argument("--prefetch-depth", type=int, metavar="N", help="workflows read ahead at most (default: 2 per prefetch thread)")
+    parser.add_argument("--cache-dir", help="reuse per-workflow results from this cache directory")
+    parser.add_argument("--low-memory", action="store_true", help="keep only what the report shows (large repositories)")
+    parser.add_argument("--json", action="store_true", help="print the full result as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show comments for passing checkpoints too")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.path):
+        print(f"Project path not found: {args.path}", file=sys.stderr)
+        return 2
+
+    custom_rules = []
+    if args.rules:
+        try:
+            custom_rules = load_rule_specs(args.rules)
+        except (OSError, ValueError) as e:
+            print(f"Cannot read rules from {args.rules}: {e}", file=sys.stderr)
+            return 2
+
+    categories = [cls.CATEGORY for cls in RULE_CLASSES] + [spec.get("category") for spec in custom_rules]
+    for category in args.active_rules or []:
+        if category not in categories:
+            parser.error(f"argument --rule: invalid choice: {category!r} (choose from {', '.join(map(repr, categories))})")
+
+    cache = None
+    if args.cache_dir:
+        from .cache import ResultCache
+        cache = ResultCache(args.cache_dir)
+
+    try:
+        analyzer = ProjectAnalyzer(
+            args.path,
+            active_rules=args.active_rules,
+            include_framework=not args.skip_framework,
+            workers=args.workers,
+            cache=cache,
+            low_memory=args.low_memory,
+            custom_rules=custom_rules,
+            ignore=args.ignore,
+            use_gitignore=not args.no_gitignore,
+            discovery_threads=args.discovery_threads,
+            prefetch_threads=args.prefetch_threads,
+            prefetch_depth=args.prefetch_depth
+        )
+    except (KeyError, ValueError) as e:
+        print(f"Invalid rule in {args.rules}: {e}", file=sys.stderr)
+        return 2
+
+    try:
+        # The analyzer logs skipped files with print(); keep stdout for the report
+        with contextlib.redirect_stdout(sys.stderr):
+            area_results = analyzer.analyze()
+    except Exception as e:
+        print(f"Analysis failed: {e}", file=sys.stderr)
+        return 2
+
+    stats = summarize(area_results)
+    if args.json:
+        json.dump({"success": True, "stats": stats, "areas": area_results}, sys.stdout, indent=2)
+        print()
+    else:
+        print_report(area_results, stats, args.verbose)
+
+    return 1 if stats["fail_count"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
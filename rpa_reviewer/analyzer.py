@@ -1,18 +1,63 @@
 import os
 import json
+import tracemalloc
 import xml.etree.ElementTree as ET
-import re
-from .rules import (
-    WorkflowStructureRule, VariableArgumentRule, ErrorHandlingRule,
-    ReadabilityRule, SecurityRule, TestingDebuggingRule, DependencyRule
-)
-from .utils import stripped_tag
+from .rules import RULE_CLASSES, TestingDebuggingRule, DependencyRule, DeclarativeRule
+from .engine import compile_matcher
+from .discovery import discover_workflows
+from .workflow import ALL_FACTS, parse_workflow, parse_workflow_bytes, required_facts, required_features
+from .prescan import ALL_FEATURES, scan_features
+from .graph import INVOKE_COLLECTOR, InvokeGraph
+from .timings import NULL_TIMER, PhaseTimer, TimingReport
+from .utils import peak_rss_bytes, current_rss_bytes
 
 
 class ProjectAnalyzer:
-    def __init__(self, project_path, active_rules=None, include_framework=True):
+    def __init__(self, project_path, active_rules=None, include_framework=True, workers=1, cache=None,
+                 incremental=False, timings=False, trace_allocations=False, low_memory=False, custom_rules=None,
+                 ignore=None, use_gitignore=True, discovery_threads=1, prefetch_threads=0, prefetch_depth=None):
         self.project_path = project_path
+        self.active_rules = active_rules
+        self.custom_rules = custom_rules or []  # DeclarativeRule specs, run after the built-in rules
         self.include_framework = include_framework
+        self.workers = workers
+        self.cache = cache  # optional ResultCache
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Incremental mode: analyze() may be called repeatedly and reuses the
+        # partials of files whose (mtime, size) did not change since the last call.
+        self.incremental = incremental
+        self.file_states = {}  # {path: ((mtime_ns, size), {rule signature: partial})}
+        self.rescanned_files = 0
+        self.reused_files = 0
+
+        # Per-analysis counters, see file_stats()
+        self.file_counts = {}  # {file status: count}
+        self.bytes_processed = 0
+
+        # Optional per-phase / per-file timings, see timing_stats()
+        self.timings = timings
+        self.trace_allocations = trace_allocations
+        self.timing_report = None
+
+        # Low-memory mode: rules keep only what their report shows
+        self.low_memory = low_memory
+
+        # Discovery: extra ignore globs (.gitignore syntax), whether to honour
+        # the project's .gitignore files, and threads for scanning folders
+        self.ignore = ignore or []
+        self.use_gitignore = use_gitignore
+        self.discovery_threads = discovery_threads
+        self.manifest = []  # [ManifestEntry] of the last analysis
+
+        # Single-process runs: threads reading files ahead of the parser (0:
+        # read inline) and how many files they may read ahead, see prefetch.py
+        self.prefetch_threads = prefetch_threads
+        self.prefetch_depth = prefetch_depth
+
+        # InvokeGraph of the last analysis (analyzed files only), see also build_graph()
+        self.graph = None
         
         # REFramework default workflows list
         self.framework_files = {
@@ -28,22 +73,66 @@ class ProjectAnalyzer:
             "TakeScreenshot.xaml"
         }
 
-        all_rules = [
-            WorkflowStructureRule(),
-            VariableArgumentRule(),
-            ErrorHandlingRule(),
-            ReadabilityRule(),
-            SecurityRule(),
-            TestingDebuggingRule(),
-            DependencyRule()
-        ]
-
-        if active_rules:
-            self.rules = [r for r in all_rules if r.category in active_rules]
+        self.rules = self._build_rules()
+
+    def _build_rules(self):
+        if self.active_rules:
+            rules = [cls() for cls in RULE_CLASSES if cls.CATEGORY in self.active_rules]
         else:
-            self.rules = all_rules
+            rules = [cls() for cls in RULE_CLASSES]
+        for spec in self.custom_rules:
+            if not self.active_rules or spec["category"] in self.active_rules:
+                rules.append(DeclarativeRule(spec))
+        for rule in rules:
+            rule.compact = self.low_memory
+        return rules
 
     def analyze(self):
+        area_results = []
+        for event in self.iter_analyze():
+            if event["event"] == "area":
+                area_results.append(event["area"])
+        return area_results
+
+    def iter_analyze(self):
+        """
+        Runs the analysis as a generator of progress events, so callers can
+        report progress while it runs:
+
+            {"event": "start", "project": path}
+            {"event": "discovered", "total": n}
+            {"event": "file", "index": i, "total": n, "path": relative path,
+             "status": "analyzed" | "cached" | "reused" | "skipped"}
+            {"event": "area", "area": AreaResult dict}   # once all files are merged
+
+        Closing the generator early stops the analysis.
+        """
+        yield {"event": "start", "project": self.project_path}
+
+        started_tracing = False
+        if self.timings:
+            if self.trace_allocations and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            self.timing_report = TimingReport(self.trace_allocations)
+
+        try:
+            yield from self._analyze_events()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+    def _analyze_events(self):
+        # Start from fresh rule state so repeated calls don't accumulate
+        self.rules = self._build_rules()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.rescanned_files = 0
+        self.reused_files = 0
+        self.file_counts = {}
+        self.bytes_processed = 0
+        self.graph = InvokeGraph(self.project_path)
+
         # -------------------------------------------------
         # Check for Breakpoints in .local/ProjectSettings.json
         # -------------------------------------------------
@@ -72,133 +161,379 @@ class ProjectAnalyzer:
         # -------------------------------------------------
         # Get Project Dependencies from project.json
         # -------------------------------------------------
-        project_json_path = os.path.join(self.project_path, "project.json")
-        if os.path.exists(project_json_path):
-            try:
-                with open(project_json_path, "r", encoding="utf-8") as f:
-                    project_data = json.load(f)
-                
-                dependencies = project_data.get("dependencies", {})
-                if dependencies:
-                    for rule in self.rules:
-                        if isinstance(rule, DependencyRule):
-                            rule.project_dependencies = dependencies
-            except Exception as e:
-                print(f"Error reading project.json: {e}")
+        project_data = self._read_project_json()
+        if project_data is not None:
+            self.graph.set_entry_points(project_data)
+            dependencies = project_data.get("dependencies", {})
+            if dependencies:
+                for rule in self.rules:
+                    if isinstance(rule, DependencyRule):
+                        rule.project_dependencies = dependencies
 
         # Remove old .local/AllDependencies.json logic as requested by user
         # (It's gone in this version)
 
-        for root, _, files in os.walk(self.project_path):
-            for file in files:
-                if file.endswith(".xaml"):
-                    # Check if we should skip framework files
-                    if not self.include_framework and file in self.framework_files:
-                        print(f"Skipping framework file: {file}")
-                        continue
-                        
-                    self._analyze_file(os.path.join(root, file))
+        self.manifest = self._discover_files(self.include_framework)
+        file_paths = [entry.path for entry in self.manifest]
 
-        return [rule.get_result().to_dict() for rule in self.rules]
+        # The invoke graph is collected alongside the rules (and cached with them)
+        checks = self.rules + [INVOKE_COLLECTOR]
+        signatures = [check.signature() for check in checks]
+        results = [None] * len(file_paths)  # (partials, cached, phase timings) per file
+        file_stats = {}
+        pending = []
 
-    def _analyze_file(self, file_path):
-        try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-
-            with open(file_path, "r", encoding="utf-8") as f:
-                text_content = f.read()
-
-            filename = os.path.basename(file_path)
-
-            # -------------------------------------------------
-            # Extract Variables
-            # -------------------------------------------------
-            variables = []
-            for elem in root.iter():
-                if "Variables" in stripped_tag(elem.tag):
-                    for var_elem in elem:
-                        if "Variable" in stripped_tag(var_elem.tag):
-                            name = (
-                                var_elem.attrib.get("Name")
-                                or var_elem.attrib.get("{http://schemas.microsoft.com/winfx/2006/xaml}Name")
-                            )
-                            if name:
-                                variables.append({
-                                    "name": name,
-                                    "type": var_elem.attrib.get("TypeArguments")
-                                })
-
-            # -------------------------------------------------
-            # Extract Arguments
-            # -------------------------------------------------
-            arguments = []
-            for members in root.iter():
-                if "Members" in stripped_tag(members.tag):
-                    for prop in members:
-                        if "Property" in stripped_tag(prop.tag):
-                            name = prop.attrib.get("Name")
-                            type_attr = prop.attrib.get("Type")
-
-                            direction = "InArgument"
-                            if "OutArgument" in str(type_attr):
-                                direction = "OutArgument"
-                            elif "InOutArgument" in str(type_attr):
-                                direction = "InOutArgument"
-
-                            if name:
-                                arguments.append({
-                                    "name": name,
-                                    "direction": direction
-                                })
-
-            # -------------------------------------------------
-            # Extract Activities (DisplayName-based – correct)
-            # -------------------------------------------------
-            activities = []
-            for elem in root.iter():
-                display_name = elem.attrib.get("DisplayName")
-                if display_name:
-                    activities.append({
-                        "type": stripped_tag(elem.tag),
-                        "display_name": display_name
-                    })
-
-            # -------------------------------------------------
-            # Extract USED variable / argument names
-            # -------------------------------------------------
-            used_names = set()
-
-            for elem in root.iter():
-                tag = stripped_tag(elem.tag)
-
-                # C# expressions
-                if tag in {"CSharpReference", "CSharpValue"} and elem.text:
-                    used_names.update(
-                        re.findall(r'\b[A-Za-z_][A-Za-z0-9_]*\b', elem.text)
-                    )
-
-                # VB expressions (future-proof)
-                if tag in {"VisualBasicReference", "VisualBasicValue"} and elem.text:
-                    used_names.update(
-                        re.findall(r'\b[A-Za-z_][A-Za-z0-9_]*\b', elem.text)
-                    )
-
-            workflow_data = {
-                "name": filename,
-                "path": file_path,
-                "variables": variables,
-                "arguments": arguments,
-                "activities": activities,
-                "used_names": used_names,
-                "text_content": text_content,
-                "tree": tree
+        for index, (file_path, size, mtime_ns) in enumerate(self.manifest):
+            if self.incremental:
+                if size is not None:
+                    file_stats[file_path] = (mtime_ns, size)
+
+                previous = self.file_states.get(file_path)
+                if (previous is not None and previous[0] == file_stats.get(file_path)
+                        and all(sig in previous[1] for sig in signatures)):
+                    results[index] = ([previous[1][sig] for sig in signatures], None, None)
+                    self.reused_files += 1
+                    continue
+
+            pending.append(index)
+
+        self.rescanned_files = len(pending)
+        total = len(file_paths)
+        yield {"event": "discovered", "total": total}
+
+        report = self.timing_report if self.timings else None
+        for index, (partials, cached, phases) in self._iter_results(checks, file_paths, results, pending):
+            self._merge(partials, cached, file_paths[index])
+            if report is not None and phases:
+                report.add(phases, os.path.relpath(file_paths[index], self.project_path))
+
+            status = _file_status(partials, cached)
+            self.file_counts[status] = self.file_counts.get(status, 0) + 1
+            if status == "analyzed" or status == "cached":
+                self.bytes_processed += self.manifest[index].size or 0
+
+            yield {
+                "event": "file",
+                "index": index + 1,
+                "total": total,
+                "path": os.path.relpath(file_paths[index], self.project_path),
+                "status": status
             }
 
+        if self.incremental:
+            self._remember(file_paths, file_stats, signatures, results)
+
+        if self.cache is not None and self.cache_misses:
+            self.cache.prune()
+
+        if report is None:
             for rule in self.rules:
-                rule.process_workflow(workflow_data)
+                yield {"event": "area", "area": rule.get_result().to_dict()}
+            return
 
-        except ET.ParseError:
-            print(f"Skipping {file_path}: Invalid XAML")
+        for rule in self.rules:
+            timer = PhaseTimer(self.trace_allocations)
+            area = rule.get_result().to_dict()
+            timer.lap(f"get_result:{rule.category}")
+            report.add(timer.phases)
+            yield {"event": "area", "area": area}
+        report.finish()
+
+    def _read_project_json(self):
+        project_json_path = os.path.join(self.project_path, "project.json")
+        if not os.path.exists(project_json_path):
+            return None
+        try:
+            with open(project_json_path, "r", encoding="utf-8") as f:
+                return json.load(f)
         except Exception as e:
-            print(f"Error checking {file_path}: {e}")
\ No newline at end of file
+            print(f"Error reading project.json: {e}")
+            return None
+
+    def _discover_files(self, include_framework):
+        """[ManifestEntry] of the workflows to analyze, see discovery.py"""
+        manifest = []
+        for entry in discover_workflows(self.project_path, self.ignore, self.use_gitignore, self.discovery_threads):
+            # Check if we should skip framework files
+            file = os.path.basename(entry.path)
+            if not include_framework and file in self.framework_files:
+                print(f"Skipping framework file: {file}")
+                continue
+            manifest.append(entry)
+        return manifest
+
+    def build_graph(self):
+        """
+        Builds the InvokeGraph of the whole project (framework files
+        included) without running any rule. Per-file invocations come from
+        the cache when one is set, so unchanged files are not parsed again.
+        """
+        graph = InvokeGraph(self.project_path)
+        project_data = self._read_project_json()
+        if project_data is not None:
+            graph.set_entry_points(project_data)
+
+        file_paths = [entry.path for entry in self._discover_files(include_framework=True)]
+        files = self._read_files(file_paths)
+        try:
+            for file_path, data in files:
+                partials, _, _ = _check_file(
+                    [INVOKE_COLLECTOR], file_path, self.cache,
+                    facts=INVOKE_COLLECTOR.FACTS, wanted=required_features([], INVOKE_COLLECTOR.FACTS), data=data
+                )
+                if partials is not None and partials[0] is not None:
+                    graph.add(file_path, partials[0])
+        finally:
+            files.close()
+        return graph
+
+    def _read_files(self, file_paths):
+        """
+        (path, contents) of every file, read ahead by the prefetch threads
+        when there are any, else (path, None): the file is read when checked.
+        """
+        if self.prefetch_threads > 0 and len(file_paths) > 1:
+            from .prefetch import prefetch_files
+            return prefetch_files(file_paths, self.prefetch_threads, self.prefetch_depth)
+        return ((file_path, None) for file_path in file_paths)
+
+    def _iter_results(self, checks, file_paths, results, pending):
+        """
+        Yields (index, (partials, cached, phases)) for every file in file order,
+        taking reused results from `results` and computing the pending ones
+        (one partial per rule / collector in `checks`) serially or in the
+        process pool. Computed results are stored back
+        into `results` when running incrementally.
+        """
+        pending_paths = [file_paths[i] for i in pending]
+        executor = None
+        files = None
+        matcher = compile_matcher(checks)
+        facts = required_facts(checks)
+        wanted = required_features(checks, facts)
+
+        if self.workers > 1 and len(pending_paths) > 1:
+            # Imported here: multiprocessing is slow to import and most runs are serial
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Rules are pickled into each worker once; only the per-file
+            # partial results travel back and are merged in file order.
+            chunksize = max(1, len(pending_paths) // (self.workers * 4))
+            executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(checks, self.cache, self.timings, self.trace_allocations)
+            )
+            computed = executor.map(_check_file_in_worker, pending_paths, chunksize=chunksize)
+        else:
+            files = self._read_files(pending_paths)
+            computed = (
+                _check_file(checks, file_path, self.cache, self.trace_allocations, matcher, facts, wanted, data,
+                            self.timings)
+                for file_path, data in files
+            )
+
+        try:
+            for index in range(len(file_paths)):
+                result = results[index]
+                if result is None:
+                    result = next(computed)
+                    if self.incremental:
+                        results[index] = result
+                yield index, result
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if files is not None:
+                files.close()
+
+    def _merge(self, partials, cached, file_path):
+        if partials is None:
+            return
+        if self.cache is not None and cached is not None:
+            if cached:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+        for rule, partial in zip(self.rules, partials):
+            if partial is not None:
+                rule.merge(partial)
+        if partials[-1] is not None:
+            self.graph.add(file_path, partials[-1])
+
+    def _remember(self, file_paths, file_stats, signatures, results):
+        # Files that disappeared since the last run are dropped here
+        states = {}
+        for file_path, (partials, _, _) in zip(file_paths, results):
+            stat_key = file_stats.get(file_path)
+            if partials is None or stat_key is None:
+                continue
+
+            # Keep partials for other rule configurations while the file is unchanged
+            previous = self.file_states.get(file_path)
+            by_signature = dict(previous[1]) if previous is not None and previous[0] == stat_key else {}
+            by_signature.update((sig, partial) for sig, partial in zip(signatures, partials) if partial is not None)
+            states[file_path] = (stat_key, by_signature)
+        self.file_states = states
+
+    def incremental_stats(self):
+        return {
+            "rescanned": self.rescanned_files,
+            "reused": self.reused_files
+        }
+
+    def memory_stats(self):
+        return {
+            "rss_bytes": current_rss_bytes(),
+            "peak_rss_bytes": peak_rss_bytes()  # for the whole process lifetime
+        }
+
+    def file_stats(self):
+        return {
+            "counts": dict(self.file_counts),
+            "bytes": self.bytes_processed
+        }
+
+    def timing_stats(self):
+        return self.timing_report.to_dict() if self.timing_report is not None else None
+
+    def cache_stats(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 3) if lookups else None
+        }
+
+
+def summarize(area_results):
+    """Overall pass/fail counts; N/A checkpoints are ignored."""
+    pass_count = 0
+    fail_count = 0
+    
+    for area in area_results:
+        for cp in area['checkpoints']:
+            if cp['status'] == 'PASS':
+                pass_count += 1
+            elif cp['status'] == 'FAIL':
+                fail_count += 1
+    
+    total_valid = pass_count + fail_count
+    percentage = "N/A"
+    if total_valid > 0:
+        percentage = round((pass_count / total_valid) * 100, 1)
+        
+    return {
+        "pass_count": pass_count,
+        "fail_count": fail_count,
+        "overall_percentage": percentage
+    }
+
+
+def _file_status(partials, cached):
+    if partials is None:
+        return "skipped"
+    if cached is None:
+        return "reused"
+    return "cached" if cached else "analyzed"
+
+
+def _check_file(rules, file_path, cache=None, trace_allocations=False, matcher=None, facts=ALL_FACTS, wanted=0,
+                data=None, timings=False):
+    """
+    Parses one workflow and runs every rule on it, going through the result
+    cache when one is given. `matcher` is compile_matcher(rules), needed
+    when some of them are declarative, `facts` required_facts(rules) or
+    more, and `wanted` the prescan features to look for first (none: no
+    prescan). `data` is the file's contents when already read (prefetch).
+    Returns (partials, cached, phases) where partials is the list of
+    partial results (one per rule, None where the rule failed), or None if
+    the file was skipped. With
+    `timings`, phases is PhaseTimer.phases: read, cache lookup, prescan,
+    parse and extract (or stream for large files), every rule's
+    check_workflow and cache store; otherwise None.
+    """
+    timer = PhaseTimer(trace_allocations) if timings else NULL_TIMER
+    try:
+        if cache is None and data is None:
+            workflow = parse_workflow(file_path, matcher, facts, wanted, timer)
+        else:
+            if data is None:
+                with open(file_path, "rb") as f:
+                    data = f.read()
+                timer.lap("read")
+
+            if cache is not None:
+                key = cache.key(os.path.basename(file_path), data)
+                signatures = [rule.signature() for rule in rules]
+                entry = cache.get(key)
+                timer.lap("cache_lookup")
+                if entry is not None and all(sig in entry["partials"] for sig in signatures):
+                    return [entry["partials"][sig] for sig in signatures], True, timer.phases
+
+            features = ALL_FEATURES
+            if wanted:
+                features = scan_features(data, wanted)
+                timer.lap("prescan")
+            workflow = parse_workflow_bytes(file_path, data, matcher, facts, features, timer)
+
+        # A rule that fails on the file gets None, the others still count it
+        partials = []
+        for rule in rules:
+            try:
+                partials.append(rule.check_workflow(workflow))
+            except Exception as e:
+                print(f"Error checking {file_path} ({rule.category}): {e}")
+                partials.append(None)
+            timer.lap(f"check:{rule.category}")
+
+        if cache is None:
+            return partials, False, timer.phases
+
+        # Keep partials cached for other rule selections / configurations
+        if entry is None:
+            entry = {"partials": {}}
+        entry["partials"].update((sig, partial) for sig, partial in zip(signatures, partials) if partial is not None)
+        cache.put(key, entry)
+        timer.lap("cache_store")
+
+        return partials, False, timer.phases
+
+    except ET.ParseError:
+        print(f"Skipping {file_path}: Invalid XAML")
+    except Exception as e:
+        print(f"Error checking {file_path}: {e}")
+    return None, False, timer.phases
+
+
+# -------------------------------------------------
+# Process pool workers
+# -------------------------------------------------
+_worker_rules = None
+_worker_matcher = None
+_worker_facts = ALL_FACTS
+_worker_features = 0
+_worker_cache = None
+_worker_timings = False
+_worker_trace_allocations = False
+
+
+def _init_worker(rules, cache, timings=False, trace_allocations=False):
+    global _worker_rules, _worker_matcher, _worker_facts, _worker_features, _worker_cache, _worker_timings, \
+        _worker_trace_allocations
+    _worker_rules = rules
+    _worker_matcher = compile_matcher(rules)
+    _worker_facts = required_facts(rules)
+    _worker_features = required_features(rules, _worker_facts)
+    _worker_cache = cache
+    _worker_timings = timings
+    _worker_trace_allocations = trace_allocations
+    if timings and trace_allocations:
+        tracemalloc.start()
+
+
+def _check_file_in_worker(file_path):
+    return _check_file(
+        _worker_rules, file_path, _worker_cache, _worker_trace_allocations,
+        _worker_matcher, _worker_facts, _worker_features, timings=_worker_timings
+    )
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .analyzer import ProjectAnalyzer, summarize
+from .cache import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+
+
+def discover_projects(root):
+    """
+    Every directory under `root` that has a project.json, without looking
+    inside projects (so nested test projects are not reviewed twice).
+    """
+    projects = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if "project.json" in filenames:
+            projects.append(dirpath)
+            dirnames[:] = []
+            continue
+        dirnames.sort()
+    return projects
+
+
+class BatchReviewer:
+    """
+    Reviews many projects at once, one ProjectAnalyzer per project.
+
+    Projects (not files) are spread over `workers` processes, which keeps
+    every core busy on feeds with many small projects. All workers share
+    the same on-disk ResultCache, so workflows that are identical across
+    projects (REFramework files, shared libraries) are only parsed once.
+    """
+
+    def __init__(self, project_paths, active_rules=None, include_framework=True, workers=1, cache=None):
+        self.project_paths = list(project_paths)
+        self.active_rules = active_rules
+        self.include_framework = include_framework
+        self.workers = workers
+        self.cache = cache
+
+    def run(self, progress=None):
+        """
+        Returns the consolidated summary dict. `progress(done, total, project)`
+        is called as each project finishes.
+        """
+        started = time.perf_counter()
+        results = [None] * len(self.project_paths)
+        options = (self.active_rules, self.include_framework, self.cache)
+
+        if self.workers > 1 and len(self.project_paths) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=options
+            ) as executor:
+                futures = {
+                    executor.submit(_review_project_in_worker, path): index
+                    for index, path in enumerate(self.project_paths)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    index = futures[future]
+                    results[index] = future.result()
+                    if progress:
+                        progress(done, len(results), results[index])
+        else:
+            for index, path in enumerate(self.project_paths):
+                results[index] = _review_project(path, *options)
+                if progress:
+                    progress(index + 1, len(results), results[index])
+
+        if self.cache is not None:
+            self.cache.prune()
+
+        return consolidate(results, time.perf_counter() - started)
+
+
+def consolidate(results, seconds):
+    totals = {
+        "projects": len(results),
+        "passed": 0,
+        "failed": 0,
+        "errors": 0,
+        "files": 0,
+        "pass_count": 0,
+        "fail_count": 0,
+        "cache_hits": 0,
+        "cache_misses": 0
+    }
+    for result in results:
+        totals["files"] += result["files"]
+        totals["cache_hits"] += result["cache"]["hits"]
+        totals["cache_misses"] += result["cache"]["misses"]
+        if not result["success"]:
+            totals["errors"] += 1
+            continue
+        totals["pass_count"] += result["stats"]["pass_count"]
+        totals["fail_count"] += result["stats"]["fail_count"]
+        if result["stats"]["fail_count"]:
+            totals["failed"] += 1
+        else:
+            totals["passed"] += 1
+
+    total_valid = totals["pass_count"] + totals["fail_count"]
+    totals["overall_percentage"] = round(totals["pass_count"] / total_valid * 100, 1) if total_valid else "N/A"
+    totals["seconds"] = round(seconds, 3)
+    totals["projects_per_minute"] = round(len(results) / seconds * 60, 1) if seconds > 0 else None
+
+    return {"summary": totals, "projects": results}
+
+
+def _review_project(project_path, active_rules, include_framework, cache):
+    started = time.perf_counter()
+    analyzer = ProjectAnalyzer(
+        project_path,
+        active_rules=active_rules,
+        include_framework=include_framework,
+        cache=cache
+    )
+    result = {
+        "path": project_path,
+        "name": os.path.basename(os.path.normpath(project_path)),
+        "success": True,
+        "files": 0
+    }
+    try:
+        area_results = []
+        for event in analyzer.iter_analyze():
+            if event["event"] == "discovered":
+                result["files"] = event["total"]
+            elif event["event"] == "area":
+                area_results.append(event["area"])
+        result["stats"] = summarize(area_results)
+        result["areas"] = area_results
+    except Exception as e:
+        print(f"Error reviewing {project_path}: {e}")
+        result["success"] = False
+        result["error"] = str(e)
+
+    result["cache"] = analyzer.cache_stats()
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# -------------------------------------------------
+# Process pool workers
+# -------------------------------------------------
+_worker_options = None
+
+
+def _init_worker(active_rules, include_framework, cache):
+    global _worker_options
+    _worker_options = (active_rules, include_framework, cache)
+
+
+def _review_project_in_worker(project_path):
+    return _review_project(project_path, *_worker_options)
+
+
+# -------------------------------------------------
+# Command line
+# -------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m rpa_reviewer.batch",
+        description="Review every UiPath project under a root directory, or a list of projects."
+    )
+    parser.add_argument("paths", nargs="+", help="project directories, or root directories to search for project.json")
+    parser.add_argument("-o", "--output", help="write the consolidated JSON summary to this file")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1, help="parallel projects (default: all cores)")
+    parser.add_argument("--rule", action="append", dest="active_rules", help="only run this rule category (repeatable)")
+    parser.add_argument("--skip-framework", action="store_true", help="skip REFramework default workflows")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the on-disk result cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--keep-areas", action="store_true", help="keep per-area checkpoints in the output")
+    args = parser.parse_args(argv)
+
+    project_paths = []
+    for path in args.paths:
+        if not os.path.isdir(path):
+            print(f"Not a directory: {path}", file=sys.stderr)
+            return 2
+        # A directory without any project.json is reviewed as a single project
+        project_paths.extend(discover_projects(path) or [path])
+
+    reviewer = BatchReviewer(
+        project_paths,
+        active_rules=args.active_rules,
+        include_framework=not args.skip_framework,
+        workers=args.workers,
+        cache=None if args.no_cache else ResultCache(args.cache_dir, DEFAULT_MAX_BYTES)
+    )
+
+    def progress(done, total, result):
+        status = "ERROR" if not result["success"] else ("FAIL" if result["stats"]["fail_count"] else "PASS")
+        print(f"[{done}/{total}] {status} {result['path']} ({result['seconds']}s)", file=sys.stderr)
+
+    report = reviewer.run(progress)
+    if not args.keep_areas:
+        for result in report["projects"]:
+            result.pop("areas", None)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    summary = report["summary"]
+    print(
+        f"{summary['projects']} projects ({summary['passed']} passed, {summary['failed']} failed, "
+        f"{summary['errors']} errors) in {summary['seconds']}s: "
+        f"{summary['projects_per_minute']} projects/min",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
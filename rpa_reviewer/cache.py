@@ -0,0 +1,149 @@
+import os
+import hashlib
+import pickle
+import tempfile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".rpa_reviewer", "cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the layout of a cache entry changes
+CACHE_FORMAT = 2
+
+# Running total of the entry sizes, one "+/-bytes" line per write
+SIZE_LOG = "size.log"
+
+
+class ResultCache:
+    """
+    On-disk cache of per-workflow results, keyed by file name + content hash.
+
+    Each entry is a pickled dict:
+        {"partials": {rule signature: partial result}}
+
+    Rule signatures include the rule set version and the rule configuration,
+    so entries written by other versions or for other projects never match.
+    Entries are touched on every hit and the least recently used ones are
+    evicted by prune() once the directory grows past max_bytes.
+
+    Every put() appends its size change to SIZE_LOG (a short O_APPEND
+    write, so worker processes and concurrent runs can share it), and
+    prune() only walks the directory when the logged total is over the
+    limit. The log is written by the walk, and puts only append to an
+    existing one: without it (new or old cache directory) the next prune()
+    walks. An append racing with that rewrite is lost, which only delays
+    the next walk.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        # prune() evicts down to this, so a few puts later it doesn't walk again
+        self.low_water = max_bytes * 9 // 10
+
+    def key(self, file_name, data):
+        digest = hashlib.sha256()
+        digest.update(f"{CACHE_FORMAT}:{file_name}\0".encode("utf-8"))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+            os.utime(path)  # LRU bookkeeping for prune()
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    def put(self, key, entry):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so concurrent workers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            try:
+                size -= os.stat(path).st_size
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not write cache entry {path}: {e}")
+            return
+        self._log_size(size)
+
+    def _log_size(self, delta):
+        try:
+            fd = os.open(os.path.join(self.directory, SIZE_LOG), os.O_WRONLY | os.O_APPEND)
+        except OSError:
+            return  # no log yet: the next prune() walks and writes it
+        try:
+            os.write(fd, f"{delta:+d}\n".encode("ascii"))
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def size(self):
+        """Total size of the entries as logged, or None when there is no (readable) log."""
+        try:
+            with open(os.path.join(self.directory, SIZE_LOG), "rb") as f:
+                return sum(int(line) for line in f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_size_log(self, total):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(f"{total:+d}\n".encode("ascii"))
+            os.replace(tmp_path, os.path.join(self.directory, SIZE_LOG))
+        except OSError as e:
+            print(f"Could not write cache size log: {e}")
+
+    def prune(self):
+        """
+        Deletes least recently used entries until the cache fits low_water
+        once the logged size is past max_bytes (or unknown).
+        """
+        size = self.size()
+        if size is not None and size <= self.max_bytes:
+            if os.path.getsize(os.path.join(self.directory, SIZE_LOG)) > 64 * 1024:
+                self._write_size_log(size)  # one line per put adds up
+            return
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for file in files:
+                if not file.endswith(".pkl"):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.low_water:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+        self._write_size_log(total)
@@ -0,0 +1,183 @@
+import os
+import re
+from collections import namedtuple
+
+# Finds the workflows of a project with os.scandir, without descending into
+# folders that never hold project workflows, .gitignore'd paths or paths
+# matching custom ignore globs. Directories can be scanned by a thread pool
+# (most of the time goes to waiting on the file system on network drives);
+# the manifest keeps os.walk order either way, so reports don't change with
+# the thread count.
+
+# Folders Studio, git and packaging tools keep next to the workflows
+PRUNED_DIRS = {".git", ".hg", ".svn", ".local", ".objects", ".screenshots", ".tmh", ".vs", "node_modules"}
+# A folder holding a .nuspec is an extracted package (e.g. a published
+# library in an output folder), not part of the project
+PACKAGE_MARKERS = (".nuspec",)
+
+ManifestEntry = namedtuple("ManifestEntry", ["path", "size", "mtime_ns"])  # size / mtime_ns are None if stat failed
+
+
+class IgnoreRules:
+    """
+    .gitignore style patterns: "*.bak", "Tests/", "/Build", "docs/**/*.xaml",
+    "!keep.xaml". Patterns are relative to the folder of the .gitignore they
+    come from ("" for the project root); the last matching one wins.
+    Immutable, so the rules of a folder can be shared with its subfolders.
+    """
+
+    def __init__(self, patterns=()):
+        self.patterns = tuple(patterns)  # ((regex, negate, dir_only), ...)
+
+    def extend(self, lines, base=""):
+        patterns = list(self.patterns)
+        for line in lines:
+            pattern = gitignore_pattern(line, base)
+            if pattern is not None:
+                patterns.append(pattern)
+        return IgnoreRules(patterns)
+
+    def ignored(self, rel_path, is_dir):
+        result = False
+        for regex, negate, dir_only in self.patterns:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def gitignore_pattern(line, base=""):
+    """(regex over the project-relative path, negate, dir_only) for one .gitignore line, or None."""
+    line = line.rstrip("\r\n")
+    if not line.strip() or line.startswith("#"):
+        return None
+    line = line.rstrip(" ")
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]  # \#file, \!file
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # With a slash anywhere but at the end, the pattern is relative to its
+    # .gitignore; otherwise it matches a name at any depth below it
+    anchored = "/" in line
+    line = line.lstrip("/")
+
+    prefix = re.escape(base + "/") if base else ""
+    if not anchored:
+        prefix += "(?:.*/)?"
+    return re.compile(prefix + glob_regex(line) + r"\Z", re.DOTALL), negate, dir_only
+
+
+def glob_regex(glob):
+    parts = []
+    i = 0
+    while i < len(glob):
+        if glob.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif glob[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif glob[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif glob[i] == "[" and "]" in glob[i + 2:]:
+            end = glob.index("]", i + 2)
+            body = glob[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(glob[i]))
+            i += 1
+    return "".join(parts)
+
+
+def scan_directory(path, rel_path, rules, use_gitignore, extension):
+    """
+    One folder: ([ManifestEntry] of its files with `extension`,
+    [(path, rel_path, IgnoreRules)] of the subfolders to scan), both in
+    scandir order.
+    """
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return [], []
+
+    if rel_path and any(entry.name.endswith(PACKAGE_MARKERS) for entry in entries):
+        return [], []
+
+    if use_gitignore and any(entry.name == ".gitignore" for entry in entries):
+        try:
+            with open(os.path.join(path, ".gitignore"), "r", encoding="utf-8", errors="replace") as f:
+                rules = rules.extend(f, rel_path)
+        except OSError:
+            pass
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        entry_rel = f"{rel_path}/{entry.name}" if rel_path else entry.name
+        try:
+            # Like os.walk: symlinked folders are listed but not followed
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            if entry.name in PRUNED_DIRS or entry.is_symlink() or rules.ignored(entry_rel, True):
+                continue
+            subdirs.append((entry.path, entry_rel, rules))
+        elif entry.name.endswith(extension) and not rules.ignored(entry_rel, False):
+            try:
+                st = entry.stat()
+                files.append(ManifestEntry(entry.path, st.st_size, st.st_mtime_ns))
+            except OSError:
+                files.append(ManifestEntry(entry.path, None, None))
+    return files, subdirs
+
+
+def discover_workflows(project_path, ignore=(), use_gitignore=True, threads=1, extension=".xaml"):
+    """
+    [ManifestEntry] of every workflow of a project, in os.walk order.
+    `ignore` holds extra .gitignore style patterns relative to the project.
+    """
+    rules = IgnoreRules().extend(ignore or ())
+    root = (project_path, "", rules)
+
+    if threads <= 1:
+        manifest = []
+        stack = [root]
+        while stack:
+            files, subdirs = scan_directory(*stack.pop(), use_gitignore, extension)
+            manifest.extend(files)
+            stack.extend(reversed(subdirs))
+        return manifest
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        def submit(folder):
+            return executor.submit(scan_directory, *folder, use_gitignore, extension)
+
+        # Subfolders are submitted as soon as their parent is scanned and
+        # collected depth-first, which gives os.walk order
+        manifest = []
+        stack = [submit(root)]
+        while stack:
+            files, subdirs = stack.pop().result()
+            manifest.extend(files)
+            stack.extend(reversed([submit(folder) for folder in subdirs]))
+        return manifest
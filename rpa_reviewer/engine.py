@@ -0,0 +1,101 @@
+import json
+import re
+from .utils import stripped_tag
+
+# Declarative element selectors for DeclarativeRule (see rules.py). Every
+# selector of every active rule is compiled into one Matcher, which the
+# extraction walk (workflow.extract_workflow / stream_workflow) runs on each
+# element, so a new rule adds no pass over the file. A selector is a dict:
+#
+#   {"type": "If"}                                   every <If>
+#   {"type": ["Sequence", "Flowchart"]}              any of these types
+#   {"display_name": true}                           any element with a DisplayName (false: without)
+#   {"type": "Sequence", "display_name": "(?i)^(?!sequence)"}   DisplayName matching a regex
+#   {"attribute": "Password", "value": "^(?!\{x:Null\})"}       attribute present (and matching)
+#
+# Elements are dispatched on their type first: the cost per element depends
+# on the selectors for that type (plus the few without one), not on the
+# number of rules.
+
+SELECTOR_KEYS = {"type", "display_name", "attribute", "value"}
+
+
+class Selector:
+    __slots__ = ("key", "plain", "display_name", "attribute", "value")
+
+    def __init__(self, key, spec):
+        unknown = set(spec) - SELECTOR_KEYS
+        if unknown:
+            raise ValueError(f"Unknown selector keys for {key}: {', '.join(sorted(unknown))}")
+        if "value" in spec and "attribute" not in spec:
+            raise ValueError(f"Selector {key} has a value but no attribute")
+
+        self.key = key
+        display_name = spec.get("display_name")
+        self.display_name = re.compile(display_name) if isinstance(display_name, str) else display_name
+        self.attribute = spec.get("attribute")
+        self.value = re.compile(spec["value"]) if spec.get("value") is not None else None
+        self.plain = self.display_name is None and self.attribute is None
+
+    def matches(self, attrib, display_name):
+        if self.display_name is not None:
+            if self.display_name is True or self.display_name is False:
+                if bool(display_name) is not self.display_name:
+                    return False
+            elif not display_name or not self.display_name.search(display_name):
+                return False
+        if self.attribute is not None:
+            for key, value in attrib.items():
+                if stripped_tag(key) == self.attribute and (self.value is None or self.value.search(value)):
+                    return True
+            return False
+        return True
+
+
+class Matcher:
+    """Selectors of several rules, dispatched on element type."""
+
+    def __init__(self):
+        self.by_type = {}   # {element type: [Selector]}
+        self.any_type = []  # [Selector] without a type
+
+    def add(self, key, spec):
+        selector = Selector(key, spec)
+        types = spec.get("type")
+        if types is None:
+            self.any_type.append(selector)
+            return
+        for element_type in [types] if isinstance(types, str) else dict.fromkeys(types):
+            self.by_type.setdefault(element_type, []).append(selector)
+
+    def match(self, tag, attrib, display_name, counts):
+        """Adds one to counts[selector key] for every selector the element matches."""
+        selectors = self.by_type.get(tag)
+        if selectors:
+            for selector in selectors:
+                if selector.plain or selector.matches(attrib, display_name):
+                    counts[selector.key] = counts.get(selector.key, 0) + 1
+        for selector in self.any_type:
+            if selector.matches(attrib, display_name):
+                counts[selector.key] = counts.get(selector.key, 0) + 1
+
+
+def compile_matcher(rules):
+    """
+    One Matcher for the selectors of every rule that declares some, keyed
+    (rule category, selector name). None when no rule does.
+    """
+    matcher = Matcher()
+    for rule in rules:
+        for name, spec in getattr(rule, "selectors", {}).items():
+            matcher.add((rule.category, name), spec)
+    if not matcher.by_type and not matcher.any_type:
+        return None
+    return matcher
+
+
+def load_rule_specs(path):
+    """DeclarativeRule specs from a JSON file holding one spec or a list of them."""
+    with open(path, "r", encoding="utf-8") as f:
+        specs = json.load(f)
+    return specs if isinstance(specs, list) else [specs]
@@ -0,0 +1,58 @@
+import re
+
+# Lightweight tokenizers for the VB / C# expressions found in workflows.
+# They only need to answer "which names does this expression reference?",
+# so string and char literals, numbers and member names (anything after a
+# ".") are consumed without being reported: the only group of each token
+# pattern is an identifier, every other token findall()s as "".
+
+VB_TOKEN_PATTERN = re.compile(r'''
+      \$?"(?:[^"]|"")*"c?       # "text", "a"c, $"...{expr}..."
+    | \d[\w.]*                  # 42, 1.5D
+    | \.\s*[^\W\d]\w*           # .Member
+    | ([^\W\d]\w*)              # name, also the inside of [escaped] names
+''', re.VERBOSE)
+
+CSHARP_TOKEN_PATTERN = re.compile(r'''
+      (?:\$@|@\$|@)"(?:[^"]|"")*"  # @"C:\path", $@"...{expr}..."
+    | \$?"(?:[^"\\]|\\.)*"         # "text", $"...{expr}..."
+    | '(?:[^'\\]|\\.)*'            # 'c'
+    | \d[\w.]*                     # 42, 1.5m, 0x1F
+    | \.\s*[^\W\d]\w*              # .Member, ?.Member
+    | @?([^\W\d]\w*)               # name, @keyword
+''', re.VERBOSE)
+
+# Bodies of interpolated strings, whose {holes} are tokenized again
+VB_INTERPOLATED_PATTERN = re.compile(r'\$"((?:[^"]|"")*)"')
+CSHARP_INTERPOLATED_PATTERN = re.compile(r'(?:\$@|@\$)"((?:[^"]|"")*)"|\$"((?:[^"\\]|\\.)*)"')
+
+# {expr}, {expr,alignment} or {expr:format}; {{ and }} are literal braces
+INTERPOLATION_HOLE_PATTERN = re.compile(r'\{\{|\}\}|\{([^{}]*)\}')
+FORMAT_SPEC_PATTERN = re.compile(r'[,:][^,:()"\']*$')
+
+
+def expression_identifiers(expression, csharp=False):
+    """
+    Names referenced by a VB (default) or C# expression, e.g.
+    in_Config("Url").ToString + "https://x" -> {"in_Config"}.
+    """
+    names = set((CSHARP_TOKEN_PATTERN if csharp else VB_TOKEN_PATTERN).findall(expression))
+    names.discard("")
+    if "$" in expression:
+        interpolated = CSHARP_INTERPOLATED_PATTERN if csharp else VB_INTERPOLATED_PATTERN
+        for match in interpolated.findall(expression):
+            for body in (match if csharp else (match,)):
+                for hole in INTERPOLATION_HOLE_PATTERN.findall(body):
+                    if hole:
+                        names |= expression_identifiers(FORMAT_SPEC_PATTERN.sub("", hole), csharp)
+    return names
+
+
+def bracketed_expression(value):
+    """
+    The VB expression of an attribute or element text written as
+    "[expression]", or None for a literal value.
+    """
+    if value.startswith("[") and value.endswith("]"):
+        return value[1:-1]
+    return None
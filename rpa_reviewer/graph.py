@@ -0,0 +1,152 @@
+import os
+import posixpath
+
+# Bump whenever InvokeCollector changes what it collects, so cached results are invalidated
+GRAPH_VERSION = 1
+
+DEFAULT_ENTRY_POINT = "Main.xaml"
+
+
+class InvokeCollector:
+    """
+    Collects the InvokeWorkflowFile targets of each workflow. It goes through
+    the same per-file path as the rules (check_workflow / signature), so its
+    results are cached by file hash, reused by incremental runs and computed
+    in worker processes along with them.
+    """
+    category = "Invoke Graph"
+    FACTS = frozenset({"invokes"})
+
+    def check_workflow(self, workflow):
+        return {"invokes": list(workflow.invokes)}
+
+    def signature(self):
+        return f"{GRAPH_VERSION}:{self.category}"
+
+
+INVOKE_COLLECTOR = InvokeCollector()
+
+
+def normalize_path(path):
+    """Project-relative workflow path as used for graph lookups: forward slashes, lower case."""
+    path = posixpath.normpath(path.strip().replace("\\", "/"))
+    if path.startswith("./"):
+        path = path[2:]
+    return path.lower()
+
+
+class InvokeGraph:
+    """
+    Call graph of a project: one node per analyzed workflow (path relative
+    to the project, as on disk), one edge per InvokeWorkflowFile whose
+    WorkflowFileName resolves to a workflow of the project.
+    """
+
+    def __init__(self, project_path):
+        self.project_path = project_path
+        self.invokes = {}        # {workflow: [WorkflowFileName as written]}
+        self.entry_points = []   # from project.json, Main.xaml by default
+        self._resolved = None    # (nodes by normalized path, edges, dynamic, missing), built on first query
+
+    def add(self, file_path, partial):
+        workflow = os.path.relpath(file_path, self.project_path).replace(os.sep, "/")
+        self.invokes[workflow] = partial["invokes"]
+        self._resolved = None
+
+    def set_entry_points(self, project_data):
+        """Reads "main" and "entryPoints" from a loaded project.json."""
+        entry_points = []
+        main = project_data.get("main")
+        if main:
+            entry_points.append(main)
+        for entry in project_data.get("entryPoints") or []:
+            file_path = entry.get("filePath") if isinstance(entry, dict) else None
+            if file_path and file_path not in entry_points:
+                entry_points.append(file_path)
+        self.entry_points = entry_points
+
+    # ---------- Resolution ----------
+
+    def _resolve(self):
+        if self._resolved is not None:
+            return self._resolved
+
+        by_key = {normalize_path(workflow): workflow for workflow in self.invokes}
+        edges = {}    # {caller: [callee]}, callees in invocation order without repeats
+        dynamic = {}  # {caller: [expression]}, file names computed at run time
+        missing = {}  # {caller: [file name]}, targets that are not part of the project
+
+        for caller, names in self.invokes.items():
+            callees = []
+            for name in dict.fromkeys(names):
+                if name.startswith("[") or '"' in name:
+                    dynamic.setdefault(caller, []).append(name)
+                    continue
+                # Paths are relative to the project folder; fall back to the caller's folder
+                callee = by_key.get(normalize_path(name))
+                if callee is None:
+                    callee = by_key.get(normalize_path(posixpath.join(posixpath.dirname(caller), name.replace("\\", "/"))))
+                if callee is None:
+                    missing.setdefault(caller, []).append(name)
+                elif callee not in callees:
+                    callees.append(callee)
+            edges[caller] = callees
+
+        self._resolved = by_key, edges, dynamic, missing
+        return self._resolved
+
+    def edges(self):
+        return self._resolve()[1]
+
+    def resolve_workflow(self, name):
+        """The graph node for a path as written in project.json or a request, or None."""
+        return self._resolve()[0].get(normalize_path(name))
+
+    # ---------- Queries ----------
+
+    def reachable(self, entry=None):
+        """Workflows reachable from `entry` (default: every entry point), entries included."""
+        edges = self.edges()
+        if entry is None:
+            starts = [self.resolve_workflow(e) for e in self.entry_points or [DEFAULT_ENTRY_POINT]]
+        else:
+            starts = [self.resolve_workflow(entry)]
+
+        seen = set()
+        stack = [start for start in starts if start is not None]
+        while stack:
+            workflow = stack.pop()
+            if workflow in seen:
+                continue
+            seen.add(workflow)
+            stack.extend(edges.get(workflow, ()))
+        return seen
+
+    def dead(self):
+        """Workflows no entry point reaches, directly or indirectly."""
+        reachable = self.reachable()
+        return sorted(workflow for workflow in self.invokes if workflow not in reachable)
+
+    def fan_in(self):
+        """{workflow: number of distinct workflows invoking it}"""
+        counts = dict.fromkeys(self.invokes, 0)
+        for callees in self.edges().values():
+            for callee in callees:
+                counts[callee] += 1
+        return counts
+
+    def to_dict(self, entry=None):
+        _, edges, dynamic, missing = self._resolve()
+        entry_points = self.entry_points or [DEFAULT_ENTRY_POINT]
+        return {
+            "workflows": sorted(self.invokes),
+            "edges": {caller: callees for caller, callees in sorted(edges.items()) if callees},
+            "entry_points": {
+                entry_point: sorted(self.reachable(entry_point))
+                for entry_point in ([entry] if entry is not None else entry_points)
+            },
+            "dead": self.dead(),
+            "fan_in": {workflow: count for workflow, count in sorted(self.fan_in().items()) if count},
+            "dynamic": dynamic,
+            "missing": missing
+        }
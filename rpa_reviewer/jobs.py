@@ -0,0 +1,189 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .analyzer import summarize
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, analyzer, description=None):
+        self.id = uuid.uuid4().hex
+        self.analyzer = analyzer
+        self.description = description or {}
+        self.status = QUEUED
+        self.error = None
+        self.result = None
+        self.progress = {"done": 0, "total": None}
+
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self.cancel_requested = threading.Event()
+        self.future = None
+
+    def to_dict(self, include_result=True):
+        now = time.time()
+        queued_until = self.started_at or self.finished_at or now
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "cancel_requested": self.cancel_requested.is_set(),
+            "request": self.description,
+            "progress": dict(self.progress),
+            "timing": {
+                "submitted_at": self.submitted_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "queued_seconds": round(queued_until - self.submitted_at, 3),
+                "run_seconds": round((self.finished_at or now) - self.started_at, 3)
+                if self.started_at else None
+            }
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Runs analyses in the background on a bounded thread pool.
+
+    At most `concurrency` jobs run at once and at most `max_queued` wait
+    for a slot; submit() raises QueueFullError beyond that. Finished jobs
+    are kept (oldest dropped first) so their results can still be fetched.
+
+    Cancelling a queued job removes it from the queue. A running job is
+    stopped between two files, since the analysis is driven through
+    ProjectAnalyzer.iter_analyze().
+    """
+
+    def __init__(self, concurrency=2, max_queued=32, max_finished=100, on_finish=None):
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.on_finish = on_finish  # called with each job that ran, once it finished
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="rpa-job")
+        self.jobs = OrderedDict()  # {job id: Job}, in submission order
+        self.lock = threading.Lock()
+
+    def submit(self, analyzer, description=None, build_result=None):
+        job = Job(analyzer, description)
+        with self.lock:
+            if self.queue_depth() >= self.max_queued:
+                raise QueueFullError(f"Job queue is full ({self.max_queued} waiting)")
+            self.jobs[job.id] = job
+            self._drop_finished()
+            job.future = self.executor.submit(self._run, job, build_result)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self.lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in FINISHED_STATES:
+                return job
+            job.cancel_requested.set()
+            if job.future.cancel():
+                # Never started
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        return job
+
+    def queue_depth(self):
+        return sum(1 for job in self.jobs.values() if job.status == QUEUED)
+
+    def running(self):
+        return sum(1 for job in self.jobs.values() if job.status == RUNNING)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "concurrency": self.concurrency,
+                "running": self.running(),
+                "queued": self.queue_depth(),
+                "max_queued": self.max_queued,
+                "finished": sum(1 for job in self.jobs.values() if job.status in FINISHED_STATES)
+            }
+
+    def shutdown(self):
+        for job in self.list():
+            job.cancel_requested.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def _drop_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
+
+    def _run(self, job, build_result):
+        with self.lock:
+            if job.cancel_requested.is_set():
+                job.status = CANCELLED
+                job.finished_at = time.time()
+                return
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        area_results = []
+        events = job.analyzer.iter_analyze()
+        try:
+            for event in events:
+                if job.cancel_requested.is_set():
+                    break
+                if event["event"] == "discovered":
+                    job.progress = {"done": 0, "total": event["total"]}
+                elif event["event"] == "file":
+                    job.progress = {"done": event["index"], "total": event["total"]}
+                elif event["event"] == "area":
+                    area_results.append(event["area"])
+
+            if job.cancel_requested.is_set():
+                status = CANCELLED
+            else:
+                if build_result is not None:
+                    job.result = build_result(job.analyzer, area_results)
+                else:
+                    job.result = {"stats": summarize(area_results), "areas": area_results}
+                status = DONE
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            job.error = str(e)
+            status = FAILED
+        finally:
+            events.close()  # stops the process pool if we broke out early
+
+        with self.lock:
+            job.status = status
+            job.finished_at = time.time()
+
+        if self.on_finish is not None:
+            try:
+                self.on_finish(job)
+            except Exception as e:
+                print(f"Error in job finish callback: {e}")
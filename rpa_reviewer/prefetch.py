@@ -0,0 +1,43 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+# Reads workflow files on a thread pool ahead of the parser. On SMB / NFS
+# mounts opening and reading a file is mostly waiting, which threads can
+# overlap with parsing even in a single process (file reads release the
+# GIL). The queue is bounded: at most `depth` files are being read or wait
+# in memory for the parser, and a new read only starts when the parser
+# takes a file, so a slow parser holds the readers back instead of letting
+# the whole project pile up in memory.
+
+
+def read_file(file_path):
+    """Contents of a file, or None if it can't be read (the caller opens it again to report why)."""
+    try:
+        with open(file_path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def prefetch_files(file_paths, threads=4, depth=None):
+    """
+    Yields (path, contents or None) for every path, in order, read by
+    `threads` threads at most `depth` files (default: 2 per thread) ahead
+    of the consumer. Closing the generator cancels the reads not started.
+    """
+    depth = max(1, depth or 2 * threads)
+    paths = iter(file_paths)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        queue = deque((path, executor.submit(read_file, path)) for path in islice(paths, depth))
+        try:
+            while queue:
+                path, future = queue.popleft()
+                data = future.result()
+                # Refill before handing the file over, so reads go on while it's parsed
+                for next_path in islice(paths, 1):
+                    queue.append((next_path, executor.submit(read_file, next_path)))
+                yield path, data
+        finally:
+            for _, future in queue:
+                future.cancel()
@@ -0,0 +1,110 @@
+import mmap
+import re
+
+# Bytes-level prescan of a workflow file: a handful of substring searches
+# (bytes.find / mmap.find and literal-led regexes, no decoding, no parsing) that tell which
+# features a file can possibly have. Extraction skips the facts whose
+# feature is absent (and the parse altogether when nothing is left to
+# extract), rules skip their regexes. A set bit only means "maybe": the
+# prescan must never miss a feature (with one documented exception, see
+# SECRET_TAILS), false positives just cost the work it would have cost
+# anyway.
+
+TRYCATCH = 1 << 0          # TryCatch / Catch elements (found as "Catch")
+INVOKE_WORKFLOW = 1 << 1   # InvokeWorkflowFile
+URL = 1 << 2               # "://" outside the xmlns declarations of the root element
+SECRET = 1 << 3            # Password / Credential, any case
+THROW = 1 << 4             # <Throw ... Exception="[New ...]">
+CSHARP_VALUE = 1 << 5      # <CSharpValue>
+ANNOTATION = 1 << 6        # AnnotationText="..."
+VARIABLE_DEFAULT = 1 << 7  # <Variable.Default>
+ARGUMENT_KEY = 1 << 8      # <InArgument ... x:Key="..."> (arguments passed to invoked workflows)
+
+ALL_FEATURES = (1 << 9) - 1
+
+NEEDLES = (
+    (TRYCATCH, b"Catch"),
+    (INVOKE_WORKFLOW, b"InvokeWorkflowFile"),
+    (THROW, b"<Throw"),
+    (CSHARP_VALUE, b"<CSharpValue"),
+    (ANNOTATION, b"AnnotationText="),
+    (VARIABLE_DEFAULT, b"<Variable.Default>"),
+)
+# Features no single literal captures; each pattern starts with a literal,
+# which the regex engine searches for as fast as find()
+PATTERNS = (
+    # x:Key alone is in the designer view state of every file
+    (ARGUMENT_KEY, re.compile(rb'Argument[^>]*x:Key="')),
+)
+
+
+# workflow.SECRET_ATTRIBUTE_PATTERN is case-insensitive. Without copying
+# the buffer to lower() it, the words are found by their tail in lower and
+# upper case (password, Password, SecurePassword, PASSWORD...) and the byte
+# before it is checked; only casings mixed inside the tail, e.g. PassWord,
+# would be missed.
+SECRET_TAILS = ((b"assword", b"Pp"), (b"ASSWORD", b"Pp"), (b"redential", b"Cc"), (b"REDENTIAL", b"Cc"))
+# Being a str pattern, it also matches these letters: long s (for s) and
+# dotted / dotless I (for i). Their first UTF-8 bytes are looked for
+# first: single bytes are found with memchr, far faster than 2-byte needles.
+SECRET_FOLDED_NEEDLES = ("\u017f".encode("utf-8"), "\u0130".encode("utf-8"), "\u0131".encode("utf-8"))
+SECRET_FOLDED_LEADS = tuple(sorted({needle[:1] for needle in SECRET_FOLDED_NEEDLES}))
+ROOT_START_PATTERN = re.compile(rb"<[A-Za-z_]")
+XMLNS_PATTERN = re.compile(rb"""\sxmlns(?::[\w.-]+)?=["'][^"']*["']""")
+
+
+def scan_features(buffer, wanted=ALL_FEATURES):
+    """
+    Feature bits of a workflow held in `buffer` (bytes or mmap). Only the
+    `wanted` features are searched for; the others are reported present.
+    """
+    features = ALL_FEATURES & ~wanted
+    for bit, needle in NEEDLES:
+        if wanted & bit and buffer.find(needle) != -1:
+            features |= bit
+    for bit, pattern in PATTERNS:
+        if wanted & bit and pattern.search(buffer):
+            features |= bit
+
+    if wanted & URL:
+        # The xmlns declarations of the root element always hold URLs, and
+        # are not attributes of the parsed tree
+        start = ROOT_START_PATTERN.search(buffer)
+        end = buffer.find(b">", start.end()) if start is not None else -1
+        if start is None or end == -1:
+            if buffer.find(b"://") != -1:
+                features |= URL
+        elif buffer.find(b"://", end) != -1 or b"://" in XMLNS_PATTERN.sub(b"", buffer[start.start():end]):
+            features |= URL
+
+    if wanted & SECRET:
+        if has_secret_tail(buffer) or has_folded_letter(buffer):
+            features |= SECRET
+    return features
+
+
+def has_secret_tail(buffer):
+    for tail, initials in SECRET_TAILS:
+        pos = buffer.find(tail, 1)
+        while pos != -1:
+            if buffer[pos - 1] in initials:
+                return True
+            pos = buffer.find(tail, pos + 1)
+    return False
+
+
+def has_folded_letter(buffer):
+    if all(buffer.find(lead) == -1 for lead in SECRET_FOLDED_LEADS):
+        return False
+    return any(buffer.find(needle) != -1 for needle in SECRET_FOLDED_NEEDLES)
+
+
+def prescan_file(file_path, wanted=ALL_FEATURES):
+    """scan_features over a memory-mapped file, without reading it into memory."""
+    with open(file_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return scan_features(mm, wanted)
+        except ValueError:
+            # Empty files can't be mapped
+            return scan_features(b"", wanted)
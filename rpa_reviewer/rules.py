@@ -1,5 +1,13 @@
 from abc import ABC, abstractmethod
+import hashlib
+import json
 import re
+import string
+from .prescan import ANNOTATION, ARGUMENT_KEY, CSHARP_VALUE, THROW, VARIABLE_DEFAULT
+from .workflow import ALL_FACTS
+
+# Bump whenever a rule changes what it reports, so cached results are invalidated
+RULESET_VERSION = 10
 
 # =========================
 # Common Result Models
@@ -37,118 +45,257 @@ class AreaResult:
 
 
 class Rule(ABC):
+    # Low-memory mode (compact = True): lists named here only keep as many
+    # entries as get_result shows, e.g. the first 3 file names of a comment.
+    REPORT_LIMITS = {}
+    # WorkflowModel fields check_workflow reads (see workflow.ALL_FACTS);
+    # the analyzer extracts only those of the active rules
+    FACTS = ALL_FACTS
+    # prescan.py bits check_workflow tests workflow.features for
+    FEATURES = 0
+
     def __init__(self, category):
         self.category = category
+        self.compact = False
 
     @abstractmethod
-    def process_workflow(self, workflow_data):
+    def check_workflow(self, workflow):
+        """
+        Returns the findings for one workflow as a partial result:
+        {state attribute name: findings to add to it}. Must not mutate the
+        rule, so it can run in a worker process.
+        """
         pass
 
-    @abstractmethod
-    def get_result(self):
-        pass
-
-
-# ==========================================================
-# 1. Workflow Design & Structure
-# ==========================================================
-
-class WorkflowStructureRule(Rule):
-    def __init__(self):
-        super().__init__("Workflow Design & Structure")
-        self.modular_fail_files = []
-        self.naming_fail_files = []
-        self.nested_fail_files = []
-
-    def process_workflow(self, workflow_data):
-        name = workflow_data["name"]
-
-        # CP1: Modularity (heuristic)
-        if len(workflow_data["activities"]) > 120:
-            self.modular_fail_files.append(name)
-
-        # CP2: Deep Nesting (UiPath-aware)
-
-        if_count = 0
-        sequence_count = 0
+    def merge(self, partial):
+        """
+        Folds a partial result from check_workflow into the rule state.
+        Lists are extended, sets and dicts updated and flags OR-ed.
+        """
+        for key, value in partial.items():
+            current = getattr(self, key)
+            if isinstance(current, list):
+                limit = self.REPORT_LIMITS.get(key) if self.compact else None
+                if limit is None:
+                    current.extend(value)
+                elif len(current) < limit:
+                    current.extend(value[:limit - len(current)])
+            elif isinstance(current, (set, dict)):
+                current.update(value)
+            else:
+                setattr(self, key, current or value)
 
-        for act in workflow_data["activities"]:
-            act_type = act["type"]
-            display = act["display_name"]
+    def process_workflow(self, workflow):
+        self.merge(self.check_workflow(workflow))
 
-            if act_type == "If":
-                if_count += 1
+    def signature(self):
+        """
+        Identifies the rule and its configuration, e.g. for cached partial
+        results. Override when check_workflow depends on project settings.
+        """
+        return f"{RULESET_VERSION}:{self.category}"
 
-            # Count only meaningful sequences (ignore default containers)
-            elif act_type == "Sequence" and not display.lower().startswith("sequence"):
-                sequence_count += 1
+    @abstractmethod
+    def get_result(self):
+        pass
 
-        if if_count > 3 or sequence_count > 30:
-            self.nested_fail_files.append(
-                f"{name} (If: {if_count}, Sequence: {sequence_count})"
-            )
 
-        # CP3: Workflow Naming (PascalCase, underscores allowed)
-        if not re.match(r"^[A-Z][a-zA-Z0-9]*(?:_[A-Z][a-zA-Z0-9]*)*$", name.replace(".xaml", "")):
-            self.naming_fail_files.append(name)
+class DeclarativeRule(Rule):
+    """
+    A rule written as data instead of code:
+
+        {"category": "...",
+         "selectors": {name: selector},   # see engine.py
+         "checkpoints": [checkpoint, ...]}
+
+    Selectors are matched during the extraction walk; check_workflow only
+    reads their counts from workflow.matches. Checkpoint kinds:
+
+        count      lists a workflow when a selector named in "over" matches
+                   more often than its threshold there
+        file_name  lists a workflow whose name (without .xaml) does not
+                   match "pattern"
+        static     a fixed "status" and "comment"
+        code       built-in rules only (KINDS): the CheckpointResult comes
+                   from the rule's "method"(cp, listed items), for
+                   checkpoints that aggregate more than selector counts.
+                   Workflows are listed as for "count" when it has "over"
+
+    A listed workflow is written with "item" ({workflow} and the selector
+    counts, default "{workflow}"). FAIL comments are "fail" with {items}
+    (the first "limit" entries joined), {count} and {more} ("..." when
+    entries were left out); PASS comments are "pass". Specs are checked
+    when the rule is built (ValueError), not while files are analyzed.
+    """
+    SPEC = None
+    KINDS = {"count", "file_name", "static"}
+    REQUIRED = {"count": ("over", "pass", "fail"), "file_name": ("pattern", "pass", "fail")}  # besides "id" and "question"
+    FACTS = frozenset()  # only workflow.name and workflow.matches
+
+    def __init__(self, spec=None):
+        spec = spec or self.SPEC
+        super().__init__(spec["category"])
+        self.spec = spec
+        self.selectors = spec.get("selectors", {})
+        self.checkpoints = spec["checkpoints"]
+        self.patterns = {}
+        for cp in self.checkpoints:
+            kind = cp.get("kind", "count")
+            if kind not in self.KINDS:
+                raise ValueError(f"{self.category}: unknown checkpoint kind {kind!r}")
+            if kind == "code" and not callable(getattr(self, cp.get("method", ""), None)):
+                raise ValueError(f"{self.category}: checkpoint {cp['id']} has no method")
+            missing = [key for key in ("question", *self.REQUIRED.get(kind, ())) if key not in cp]
+            if missing:
+                raise ValueError(f"{self.category}: checkpoint {cp['id']} has no {', '.join(missing)}")
+            unknown = set(cp.get("over", {})) - set(self.selectors)
+            if unknown:
+                raise ValueError(f"{self.category}: checkpoint {cp['id']} uses unknown selectors {', '.join(sorted(unknown))}")
+            # The templates are only formatted per workflow / in get_result;
+            # a bad placeholder there would fail on every file instead
+            self._check_template(cp, "item", {"workflow", *self.selectors})
+            self._check_template(cp, "fail", {"items", "count", "more"})
+            if kind == "file_name":
+                try:
+                    self.patterns[cp["id"]] = re.compile(cp["pattern"])
+                except re.error as e:
+                    raise ValueError(f"{self.category}: checkpoint {cp['id']} has an invalid pattern: {e}")
+        self.findings = {cp["id"]: [] for cp in self.checkpoints}  # {checkpoint id: [listed items]}
+        self.totals = {cp["id"]: 0 for cp in self.checkpoints}     # {checkpoint id: items listed so far}
+        self.limits = {cp["id"]: cp["limit"] for cp in self.checkpoints if cp.get("limit") is not None}
+
+    def _check_template(self, cp, key, names):
+        if key not in cp:
+            return
+        try:
+            fields = [field for _, field, _, _ in string.Formatter().parse(cp[key]) if field is not None]
+        except ValueError as e:
+            raise ValueError(f"{self.category}: checkpoint {cp['id']} has an invalid {key!r}: {e}")
+        unknown = {re.split(r"[.\[]", field)[0] for field in fields} - names
+        if unknown:
+            placeholders = ", ".join("{" + name + "}" for name in sorted(unknown))
+            raise ValueError(f"{self.category}: checkpoint {cp['id']} uses unknown placeholders {placeholders} in {key!r}")
+
+    def signature(self):
+        digest = hashlib.sha1(json.dumps(self.spec, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return f"{super().signature()}:{digest}"
+
+    def check_workflow(self, workflow):
+        name = workflow.name
+        counts = {sel: workflow.matches.get((self.category, sel), 0) for sel in self.selectors}
+        findings = {}
+
+        for cp in self.checkpoints:
+            kind = cp.get("kind", "count")
+            if kind == "count" or kind == "code" and "over" in cp:
+                if any(counts[sel] > threshold for sel, threshold in cp["over"].items()):
+                    findings[cp["id"]] = [cp.get("item", "{workflow}").format(workflow=name, **counts)]
+            elif kind == "file_name":
+                if not self.patterns[cp["id"]].match(name.replace(".xaml", "")):
+                    findings[cp["id"]] = [name]
+
+        return {"findings": findings}
+
+    def merge(self, partial):
+        for cp_id, items in partial["findings"].items():
+            current = self.findings[cp_id]
+            self.totals[cp_id] += len(items)
+            limit = self.limits.get(cp_id) if self.compact else None
+            if limit is None:
+                current.extend(items)
+            elif len(current) < limit:
+                current.extend(items[:limit - len(current)])
+        # State of the "code" checkpoints of built-in rules
+        super().merge({key: value for key, value in partial.items() if key != "findings"})
 
     def get_result(self):
         area = AreaResult(self.category)
 
-        area.add_checkpoint(
-            CheckpointResult(
-                1,
-                "Are workflows modular and reusable?",
-                "PASS" if not self.modular_fail_files else "FAIL",
-                "Workflows appear modular."
-                if not self.modular_fail_files
-                else f"Large workflows found: {', '.join(self.modular_fail_files[:3])}..."
-            )
-        )
-
-        area.add_checkpoint(
-            CheckpointResult(
-                2,
-                "Are nested workflows or sequences used appropriately?",
-                "PASS" if not self.nested_fail_files else "FAIL",
-                "Conditional logic is kept simple."
-                if not self.nested_fail_files
-                else f"Deep nesting detected in: {', '.join(self.nested_fail_files[:3])}..."
-            )
-        )
+        for cp in self.checkpoints:
+            kind = cp.get("kind", "count")
+            if kind == "static":
+                area.add_checkpoint(CheckpointResult(cp["id"], cp["question"], cp.get("status", "N/A"), cp.get("comment", "")))
+                continue
+            if kind == "code":
+                area.add_checkpoint(getattr(self, cp["method"])(cp, self.findings[cp["id"]]))
+                continue
 
-        area.add_checkpoint(
-            CheckpointResult(
-                3,
-                "Are naming conventions followed?",
-                "PASS" if not self.naming_fail_files else "FAIL",
-                "Naming conventions followed."
-                if not self.naming_fail_files
-                else f"Invalid naming in: {', '.join(self.naming_fail_files[:3])}..."
-            )
-        )
+            items = self.findings[cp["id"]]
+            if not items:
+                area.add_checkpoint(CheckpointResult(cp["id"], cp["question"], "PASS", cp["pass"]))
+                continue
 
-        area.add_checkpoint(
-            CheckpointResult(
-                4,
-                "Is the solution scalable?",
-                "N/A",
-                "Cannot determine scalability automatically."
+            limit = cp.get("limit")
+            shown = items[:limit] if limit is not None else items
+            total = self.totals[cp["id"]]
+            comment = cp["fail"].format(
+                items=", ".join(shown),
+                count=total,
+                more="..." if len(shown) < total else ""
             )
-        )
+            area.add_checkpoint(CheckpointResult(cp["id"], cp["question"], "FAIL", comment))
 
         return area
 
 
+# ==========================================================
+# 1. Workflow Design & Structure
+# ==========================================================
+
+class WorkflowStructureRule(DeclarativeRule):
+    CATEGORY = "Workflow Design & Structure"
+    SPEC = {
+        "category": CATEGORY,
+        "selectors": {
+            "activities": {"display_name": True},
+            "If": {"type": "If"},
+            # Count only meaningful sequences (ignore default containers)
+            "Sequence": {"type": "Sequence", "display_name": "(?i)^(?!sequence)"}
+        },
+        "checkpoints": [
+            # Modularity (heuristic)
+            {
+                "id": 1, "question": "Are workflows modular and reusable?",
+                "kind": "count", "over": {"activities": 120}, "limit": 3,
+                "pass": "Workflows appear modular.",
+                "fail": "Large workflows found: {items}..."
+            },
+            # Deep Nesting (UiPath-aware)
+            {
+                "id": 2, "question": "Are nested workflows or sequences used appropriately?",
+                "kind": "count", "over": {"If": 3, "Sequence": 30}, "limit": 3,
+                "item": "{workflow} (If: {If}, Sequence: {Sequence})",
+                "pass": "Conditional logic is kept simple.",
+                "fail": "Deep nesting detected in: {items}..."
+            },
+            # Workflow Naming (PascalCase, underscores allowed)
+            {
+                "id": 3, "question": "Are naming conventions followed?",
+                "kind": "file_name", "pattern": "^[A-Z][a-zA-Z0-9]*(?:_[A-Z][a-zA-Z0-9]*)*$", "limit": 3,
+                "pass": "Naming conventions followed.",
+                "fail": "Invalid naming in: {items}..."
+            },
+            {
+                "id": 4, "question": "Is the solution scalable?",
+                "kind": "static", "status": "N/A",
+                "comment": "Cannot determine scalability automatically."
+            }
+        ]
+    }
+
+
 # ==========================================================
 # 2. Variables & Arguments
 # ==========================================================
 
 class VariableArgumentRule(Rule):
+    CATEGORY = "Variables & Arguments"
+    FACTS = frozenset({"variables", "arguments", "used_names"})
+    REPORT_LIMITS = {"naming_fails": 3, "unused_fails": 5}
     ALLOWED_TYPES = {"str", "int", "dt", "bool", "dbl"}
 
     def __init__(self):
-        super().__init__("Variables & Arguments")
+        super().__init__(self.CATEGORY)
         self.naming_fails = []
         self.unused_fails = []
 
@@ -173,29 +320,33 @@ class VariableArgumentRule(Rule):
 
     # ---------- Processing ----------
 
-    def process_workflow(self, workflow_data):
-        wf_name = workflow_data["name"]
-        used_names = workflow_data.get("used_names", set())
+    def check_workflow(self, workflow):
+        wf_name = workflow.name
+        used_names = workflow.used_names
+        naming_fails = []
+        unused_fails = []
 
         # Variables
-        for var in workflow_data["variables"]:
-            var_name = var["name"]
+        for var in workflow.variables:
+            var_name = var.name
 
             if not self._is_valid_variable_name(var_name):
-                self.naming_fails.append(f"{wf_name}:{var_name}")
+                naming_fails.append(f"{wf_name}:{var_name}")
 
             if var_name not in used_names:
-                self.unused_fails.append(f"{wf_name}:{var_name}")
+                unused_fails.append(f"{wf_name}:{var_name}")
 
         # Arguments
-        for arg in workflow_data["arguments"]:
-            arg_name = arg["name"]
+        for arg in workflow.arguments:
+            arg_name = arg.name
 
-            if not self._is_valid_argument_name(arg_name, arg["direction"]):
-                self.naming_fails.append(f"{wf_name}:{arg_name}")
+            if not self._is_valid_argument_name(arg_name, arg.direction):
+                naming_fails.append(f"{wf_name}:{arg_name}")
 
             if arg_name not in used_names:
-                self.unused_fails.append(f"{wf_name}:{arg_name}")
+                unused_fails.append(f"{wf_name}:{arg_name}")
+
+        return {"naming_fails": naming_fails, "unused_fails": unused_fails}
 
     def get_result(self):
         area = AreaResult(self.category)
@@ -230,8 +381,13 @@ class VariableArgumentRule(Rule):
 # ==========================================================
 
 class ErrorHandlingRule(Rule):
+    CATEGORY = "Error Handling & Exception Management"
+    FACTS = frozenset({"text", "catches"})
+    FEATURES = THROW | CSHARP_VALUE
+    REPORT_LIMITS = {"missing_trycatch": 3, "nested_trycatch": 3, "empty_catch_blocks": 3, "missing_throw_in_catch": 3}
+
     def __init__(self):
-        super().__init__("Error Handling & Exception Management")
+        super().__init__(self.CATEGORY)
         self.missing_trycatch = []
         self.nested_trycatch = []
         self.empty_catch_blocks = []
@@ -244,59 +400,46 @@ class ErrorHandlingRule(Rule):
         self.business_exceptions = set()
         self.system_exceptions = set()
 
-    def process_workflow(self, workflow_data):
-        name = workflow_data["name"]
-        txt = workflow_data["text_content"]
+    def check_workflow(self, workflow):
+        name = workflow.name
+        txt = workflow.text
+
+        missing_trycatch = []
+        nested_trycatch = []
+        empty_catch_blocks = []
+        missing_throw_in_catch = []
+        retry_mechanisms = []
+        incorrect_business_exception_handling = []
+        incorrect_system_exception_handling = []
+        catch_without_logging = []
+        has_trycatch_blocks = False
+        business_exceptions = set()
+        system_exceptions = set()
 
         # Rule 1: Invoke without Try-Catch
         if "InvokeWorkflowFile" in txt and "TryCatch" not in txt:
-            self.missing_trycatch.append(name)
+            missing_trycatch.append(name)
 
         # Rule 2: Nested TryCatch (TryCatch inside TryCatch)
-        # Look for TryCatch blocks that contain another TryCatch
-        trycatch_pattern = r'<TryCatch[^>]*>.*?</TryCatch>'
-        trycatch_blocks = re.findall(trycatch_pattern, txt, re.DOTALL)
-        
-        # Track if TryCatch exists
+        # Depth is computed from the element tree while parsing
         if "TryCatch" in txt:
-            self.has_trycatch_blocks = True
-        
-        for block in trycatch_blocks:
-            # Check if this TryCatch block contains another TryCatch
-            if block.count("<TryCatch") > 1:
-                self.nested_trycatch.append(name)
-                break
+            has_trycatch_blocks = True
+
+        if workflow.max_trycatch_depth > 1:
+            nested_trycatch.append(f"{name} (depth: {workflow.max_trycatch_depth})")
+
+        # Catch blocks as extracted from the element tree (see workflow.read_catch)
+        catches = workflow.catches
 
         # Rule 3: Empty Catch Blocks
-        # Pattern: <Catch> ... </Catch> where there's no activity inside
-        catch_pattern = r'<Catch[^>]*>(.*?)</Catch>'
-        catch_blocks = re.findall(catch_pattern, txt, re.DOTALL)
-        for catch_content in catch_blocks:
-            # Check if catch block is empty or only contains whitespace/metadata
-            # Remove common metadata tags and whitespace
-            cleaned = re.sub(r'<sap:WorkflowViewStateService\.ViewState>.*?</sap:WorkflowViewStateService\.ViewState>', '', catch_content, flags=re.DOTALL)
-            cleaned = re.sub(r'<sap2010:WorkflowViewState\.IdRef>.*?</sap2010:WorkflowViewState\.IdRef>', '', cleaned)
-            cleaned = cleaned.strip()
-            
-            # If no meaningful content remains, it's empty
-            if not cleaned or cleaned.count('<') == 0:
-                self.empty_catch_blocks.append(name)
-                break
+        # No activity inside the <Catch> once designer metadata is ignored
+        if any(not catch.has_content for catch in catches):
+            empty_catch_blocks.append(name)
 
         # Rule 4: Catch Blocks without Throw Activity
-        # Check if TryCatch exists and has Catch blocks without Throw
-        if "TryCatch" in txt:
-            for catch_content in catch_blocks:
-                # Check if this catch block has a Throw activity
-                if "Throw" not in catch_content and catch_content.strip():
-                    # Make sure it's not an empty block (already caught by Rule 3)
-                    cleaned = re.sub(r'<sap:WorkflowViewStateService\.ViewState>.*?</sap:WorkflowViewStateService\.ViewState>', '', catch_content, flags=re.DOTALL)
-                    cleaned = re.sub(r'<sap2010:WorkflowViewState\.IdRef>.*?</sap2010:WorkflowViewState\.IdRef>', '', cleaned)
-                    cleaned = cleaned.strip()
-                    
-                    if cleaned and cleaned.count('<') > 0:
-                        self.missing_throw_in_catch.append(name)
-                        break
+        # Empty blocks are already reported by Rule 3
+        if any(catch.has_content and not catch.has_throw for catch in catches):
+            missing_throw_in_catch.append(name)
 
         # Rule 5: Retry Mechanisms Detection
         # Check for Retry, DoWhile, and While activities
@@ -310,36 +453,26 @@ class ErrorHandlingRule(Rule):
         
         
         if retry_activities:
-            self.retry_mechanisms.append(f"{name} ({', '.join(retry_activities)})")
+            retry_mechanisms.append(f"{name} ({', '.join(retry_activities)})")
 
         # Rule 6: Business vs System Exception Handling in Catch Blocks
         # Check if catch blocks throw appropriate exceptions based on caught exception type
-        # Pattern: <Catch x:TypeArguments="ExceptionType">...<Throw>...</Throw>...</Catch>
-        catch_with_type_pattern = r'<Catch\s+x:TypeArguments="([^"]+)"[^>]*>(.*?)</Catch>'
-        catch_with_types = re.findall(catch_with_type_pattern, txt, re.DOTALL)
-        
-        for exception_type, catch_content in catch_with_types:
+        for catch in catches:
+            exception_type = catch.exception_type
+            all_throws = catch.thrown_types
+            if not exception_type:
+                continue
+
             # Determine if this is a business or system exception based on the caught type
             is_business_catch = "BusinessRuleException" in exception_type
             is_system_catch = not is_business_catch and "Exception" in exception_type
             
-            # Extract throw statements from the catch block
-            # Pattern 1: Attribute-based Throw
-            attr_throw_pattern = r'<Throw[^>]+Exception="\[New\s+([A-Za-z0-9_.]+)\('
-            attr_throws = re.findall(attr_throw_pattern, catch_content)
-            
-            # Pattern 2: CSharpValue-based Throw
-            csharp_throw_pattern = r'<CSharpValue[^>]*>\s*new\s+([A-Za-z0-9_.]+)\('
-            csharp_throws = re.findall(csharp_throw_pattern, catch_content)
-            
-            all_throws = attr_throws + csharp_throws
-            
             # Validate business exception handling
             if is_business_catch and all_throws:
                 # Business catch should throw BusinessRuleException
                 has_business_throw = any("BusinessRuleException" in throw_type for throw_type in all_throws)
                 if not has_business_throw:
-                    self.incorrect_business_exception_handling.append(
+                    incorrect_business_exception_handling.append(
                         f"{name} (Catches {exception_type}, throws {', '.join(all_throws)})"
                     )
             
@@ -348,62 +481,41 @@ class ErrorHandlingRule(Rule):
                 # System catch should throw system exception (not BusinessRuleException)
                 has_business_throw = any("BusinessRuleException" in throw_type for throw_type in all_throws)
                 if has_business_throw:
-                    self.incorrect_system_exception_handling.append(
+                    incorrect_system_exception_handling.append(
                         f"{name} (Catches {exception_type}, throws {', '.join(all_throws)})"
                     )
 
         # Rule 7: Logging in Catch Blocks
-        # Check if catch blocks have logging activities (LogMessage, WriteLine, AddLogFields, etc.)
-        # Pattern: <Catch ...>...</Catch>
-        catch_pattern = r'<Catch[^>]*>(.*?)</Catch>'
-        catch_blocks_content = re.findall(catch_pattern, txt, re.DOTALL)
-        
-        catch_without_log_count = 0
-        for catch_content in catch_blocks_content:
-            # Check for common logging activities
-            has_logging = any([
-                "LogMessage" in catch_content,
-                "ui:LogMessage" in catch_content,
-                "WriteLine" in catch_content,  # For debugging/logging
-                "AddLogFields" in catch_content,
-                "ui:AddLogFields" in catch_content,
-                # Could also check for custom logging activities
-            ])
-            
-            # Only count non-empty catch blocks
-            # Remove metadata to check if it has actual activities
-            cleaned = re.sub(r'<sap:WorkflowViewStateService\.ViewState>.*?</sap:WorkflowViewStateService\.ViewState>', '', catch_content, flags=re.DOTALL)
-            cleaned = re.sub(r'<sap2010:WorkflowViewState\.IdRef>.*?</sap2010:WorkflowViewState\.IdRef>', '', cleaned)
-            cleaned = cleaned.strip()
-            
-            # If catch block has content but no logging
-            if cleaned and cleaned.count('<') > 0 and not has_logging:
-                catch_without_log_count += 1
-        
+        # Non-empty catch blocks without LogMessage, WriteLine or AddLogFields
+        catch_without_log_count = sum(
+            1 for catch in catches if catch.has_content and not catch.has_logging
+        )
         if catch_without_log_count > 0:
-            self.catch_without_logging.append(f"{name} ({catch_without_log_count} catch block(s) without logging)")
-
-
+            catch_without_logging.append(f"{name} ({catch_without_log_count} catch block(s) without logging)")
 
         # ==================================================
         # Pattern 1: Attribute-based Throw
         # <Throw Exception="[New BusinessRuleException("msg")]"/>
         # ==================================================
-        attr_matches = re.findall(
-            r'<Throw[^>]+Exception="\[New\s+([A-Za-z0-9_.]+)\((.*?)\)\]"',
-            txt,
-            re.DOTALL
-        )
+        attr_matches = []
+        if workflow.features & THROW:
+            attr_matches = re.findall(
+                r'<Throw[^>]+Exception="\[New\s+([A-Za-z0-9_.]+)\((.*?)\)\]"',
+                txt,
+                re.DOTALL
+            )
 
         # ==================================================
         # Pattern 2: CSharpValue-based Throw
         # <CSharpValue>new BusinessRuleException("msg")</CSharpValue>
         # ==================================================
-        csharp_matches = re.findall(
-            r'<CSharpValue[^>]*>\s*new\s+([A-Za-z0-9_.]+)\((.*?)\)\s*</CSharpValue>',
-            txt,
-            re.DOTALL
-        )
+        csharp_matches = []
+        if workflow.features & CSHARP_VALUE:
+            csharp_matches = re.findall(
+                r'<CSharpValue[^>]*>\s*new\s+([A-Za-z0-9_.]+)\((.*?)\)\s*</CSharpValue>',
+                txt,
+                re.DOTALL
+            )
 
         all_matches = attr_matches + csharp_matches
 
@@ -418,9 +530,23 @@ class ErrorHandlingRule(Rule):
             final_msg = f"{exc_type} : {msg}"
 
             if exc_type.endswith("BusinessRuleException"):
-                self.business_exceptions.add(final_msg)
+                business_exceptions.add(final_msg)
             else:
-                self.system_exceptions.add(final_msg)
+                system_exceptions.add(final_msg)
+
+        return {
+            "missing_trycatch": missing_trycatch,
+            "nested_trycatch": nested_trycatch,
+            "empty_catch_blocks": empty_catch_blocks,
+            "missing_throw_in_catch": missing_throw_in_catch,
+            "retry_mechanisms": retry_mechanisms,
+            "incorrect_business_exception_handling": incorrect_business_exception_handling,
+            "incorrect_system_exception_handling": incorrect_system_exception_handling,
+            "catch_without_logging": catch_without_logging,
+            "has_trycatch_blocks": has_trycatch_blocks,
+            "business_exceptions": business_exceptions,
+            "system_exceptions": system_exceptions
+        }
 
     def get_result(self):
         area = AreaResult(self.category)
@@ -563,19 +689,63 @@ class ErrorHandlingRule(Rule):
 # 4. Readability & Maintainability
 # ==========================================================
 
-class ReadabilityRule(Rule):
+class ReadabilityRule(DeclarativeRule):
+    CATEGORY = "Readability & Maintainability"
+    KINDS = DeclarativeRule.KINDS | {"code"}
+    FACTS = frozenset({"text", "type_index"})
+    FEATURES = ANNOTATION
+    # 6 so get_result can still tell there are more than the 5 it lists
+    REPORT_LIMITS = {"workflows_without_annotations": 6}
+    SPEC = {
+        "category": CATEGORY,
+        "selectors": {
+            "CommentOut": {"type": "CommentOut"}
+        },
+        "checkpoints": [
+            # CP 1: Annotations for Readability
+            {
+                "id": 1, "question": "Are workflow-level annotations meaningful and present?",
+                "kind": "code", "method": "_annotations_checkpoint"
+            },
+            # CP 2: Activity-level Annotations
+            {
+                "id": 2, "question": "Do If conditions and Invoke Code activities have annotations?",
+                "kind": "code", "method": "_activity_annotations_checkpoint"
+            },
+            # CP 3: CommentOut activities
+            {
+                "id": 3, "question": "Are obsolete activities removed?",
+                "kind": "count", "over": {"CommentOut": 0}, "limit": 5,
+                "pass": "No commented-out activities detected.",
+                "fail": "Commented-out activities found in: {items}{more}"
+            }
+        ]
+    }
+
     def __init__(self):
-        super().__init__("Readability & Maintainability")
+        super().__init__()
         self.workflows_with_annotations = []
         self.workflows_without_annotations = []
         self.annotations_map = {}
         self.activity_annotations = {}  # {wf_name: {'If': [notes], 'InvokeCode': [notes]}}
         self.missing_activity_annotations = {} # {wf_name: {'If': count, 'InvokeCode': count}}
-        self.workflows_with_comments = []
 
-    def process_workflow(self, workflow_data):
-        name = workflow_data["name"]
-        txt = workflow_data["text_content"]
+    def merge(self, partial):
+        if self.compact:
+            # Workflows without any If / Invoke Code add nothing to the report
+            name = next(iter(partial["missing_activity_annotations"]))
+            missing = partial["missing_activity_annotations"][name]
+            notes = partial["activity_annotations"][name]
+            if not (missing['If'] or missing['InvokeCode'] or notes['If'] or notes['InvokeCode']):
+                partial = dict(partial)
+                del partial["activity_annotations"]
+                del partial["missing_activity_annotations"]
+        super().merge(partial)
+
+    def check_workflow(self, workflow):
+        name = workflow.name
+        txt = workflow.text
+        partial = super().check_workflow(workflow)
         
         # Check for annotations in the workflow
         # UiPath annotations typically use sads:DebugSymbol.Symbol or Annotation tags
@@ -591,47 +761,32 @@ class ReadabilityRule(Rule):
 
         # Extract actual annotation text line by line
         # Regex to find AnnotationText="some message"
-        found_notes = re.findall(r'AnnotationText="([^"]*)"', txt)
+        found_notes = re.findall(r'AnnotationText="([^"]*)"', txt) if workflow.features & ANNOTATION else []
         if found_notes:
-            self.annotations_map[name] = [note.strip() for note in found_notes if note.strip()]
+            partial["annotations_map"] = {name: [note.strip() for note in found_notes if note.strip()]}
         
         if has_annotations:
-            self.workflows_with_annotations.append(name)
+            partial["workflows_with_annotations"] = [name]
         else:
-            self.workflows_without_annotations.append(name)
+            partial["workflows_without_annotations"] = [name]
 
         # Extraction for Checkpoint 2 (If and Invoke Code)
-        self.activity_annotations[name] = {'If': [], 'InvokeCode': []}
-        self.missing_activity_annotations[name] = {'If': 0, 'InvokeCode': 0}
-
-        # Find If activities
-        # Pattern to find <If ...> blocks - a bit tricky with nested ones, but we mostly care about attributes
-        # Find all <If tags
-        if_tags = re.findall(r'<If\b[^>]*>', txt)
-        for tag in if_tags:
-            note_match = re.search(r'AnnotationText="([^"]*)"', tag)
-            if note_match:
-                self.activity_annotations[name]['If'].append(note_match.group(1).strip())
-            else:
-                self.missing_activity_annotations[name]['If'] += 1
-
-        # Find InvokeCode activities
-        ic_tags = re.findall(r'<(?:ui:)?InvokeCode\b[^>]*>', txt)
-        for tag in ic_tags:
-            note_match = re.search(r'AnnotationText="([^"]*)"', tag)
-            if note_match:
-                self.activity_annotations[name]['InvokeCode'].append(note_match.group(1).strip())
-            else:
-                self.missing_activity_annotations[name]['InvokeCode'] += 1
-
-        # Check for CommentOut activities
-        if "<CommentOut" in txt or "<ui:CommentOut" in txt:
-            self.workflows_with_comments.append(name)
-
-    def get_result(self):
-        area = AreaResult(self.category)
-        
-        # CP 1: Annotations for Readability
+        activity_annotations = {'If': [], 'InvokeCode': []}
+        missing_activity_annotations = {'If': 0, 'InvokeCode': 0}
+        partial["activity_annotations"] = {name: activity_annotations}
+        partial["missing_activity_annotations"] = {name: missing_activity_annotations}
+
+        # If and InvokeCode activities, with or without their annotation
+        for activity_type in ('If', 'InvokeCode'):
+            for activity in workflow.find(activity_type):
+                if activity.annotation is not None:
+                    activity_annotations[activity_type].append(activity.annotation.strip())
+                else:
+                    missing_activity_annotations[activity_type] += 1
+
+        return partial
+
+    def _annotations_checkpoint(self, cp, items):
         comment_parts = []
         if self.workflows_with_annotations:
             comment_parts.append(f"✅ {len(self.workflows_with_annotations)} workflow(s) have annotations.")
@@ -647,15 +802,14 @@ class ReadabilityRule(Rule):
         if self.workflows_without_annotations:
             comment_parts.append(f"\n❌ Workflows without annotations: {', '.join(self.workflows_without_annotations[:5])}{'...' if len(self.workflows_without_annotations) > 5 else ''}")
 
-        area.add_checkpoint(
-            CheckpointResult(
-                1,
-                "Are workflow-level annotations meaningful and present?",
-                "PASS" if not self.workflows_without_annotations else "FAIL",
-                "\n".join(comment_parts) if comment_parts else "No annotations detected."
-            )
+        return CheckpointResult(
+            cp["id"],
+            cp["question"],
+            "PASS" if not self.workflows_without_annotations else "FAIL",
+            "\n".join(comment_parts) if comment_parts else "No annotations detected."
         )
-        # CP 2: Activity-level Annotations
+
+    def _activity_annotations_checkpoint(self, cp, items):
         activity_comment_parts = []
         total_missing_annotations = 0
         
@@ -682,118 +836,127 @@ class ReadabilityRule(Rule):
             if total_missing_wf > 0:
                 activity_comment_parts.append(f"  ⚠️ Missing annotations: {missing.get('If', 0)} If(s), {missing.get('InvokeCode', 0)} Invoke Code(s)")
 
-        area.add_checkpoint(
-            CheckpointResult(
-                2,
-                "Do If conditions and Invoke Code activities have annotations?",
-                "PASS" if total_missing_annotations == 0 else "FAIL",
-                "\n".join(activity_comment_parts) if activity_comment_parts else "No If or Invoke Code activities found."
-            )
-        )
-        area.add_checkpoint(
-            CheckpointResult(
-                3,
-                "Are obsolete activities removed?",
-                "PASS" if not self.workflows_with_comments else "FAIL",
-                "No commented-out activities detected." if not self.workflows_with_comments 
-                else f"Commented-out activities found in: {', '.join(self.workflows_with_comments[:5])}{'...' if len(self.workflows_with_comments) > 5 else ''}"
-            )
+        return CheckpointResult(
+            cp["id"],
+            cp["question"],
+            "PASS" if total_missing_annotations == 0 else "FAIL",
+            "\n".join(activity_comment_parts) if activity_comment_parts else "No If or Invoke Code activities found."
         )
-        return area
 
 
 # ==========================================================
 # 5. Security & Credentials
 # ==========================================================
 
-class SecurityRule(Rule):
+class SecurityRule(DeclarativeRule):
+    CATEGORY = "Security & Credentials"
+    KINDS = DeclarativeRule.KINDS | {"code"}
+    FACTS = frozenset({"secrets"})
+    SPEC = {
+        "category": CATEGORY,
+        "checkpoints": [
+            {
+                "id": 1, "question": "Are credentials stored securely?",
+                "kind": "static", "status": "N/A",
+                "comment": "Verify Orchestrator Assets manually."
+            },
+            # Lists every hit with its element path (and URL)
+            {
+                "id": 2, "question": "Is hardcoding of credentials avoided?",
+                "kind": "code", "method": "_hardcoding_checkpoint"
+            }
+        ]
+    }
+
     def __init__(self):
-        super().__init__("Security & Credentials")
+        super().__init__()
         self.hardcoded_pw = []
         self.hardcoded_url = []
+        self.pw_hits = []   # [(workflow, element path, attribute)]
+        self.url_hits = []  # [(workflow, element path, attribute, url)]
 
-    def process_workflow(self, workflow_data):
-        name = workflow_data["name"]
-        txt = workflow_data["text_content"]
-
-        # Improved Password detection: 
-        # Look for attributes like Password="...", SecurePassword="...", etc.
-        # Exclude {x:Null}
-        # re.search(r'(?:Password|SecurePassword|Credential)\b\s*=\s*"((?!\{x:Null\})[^"]+)"', txt, re.IGNORECASE)
-        # Note: We use findall to look for any non-null match or manually filter
-        pw_pattern = r'(?:Password|SecurePassword|Credential)\b\s*=\s*"([^"]+)"'
-        found_pws = re.findall(pw_pattern, txt, re.IGNORECASE)
-        
-        has_real_pw = False
-        for pw in found_pws:
-            if pw.strip().lower() != "{x:null}":
-                has_real_pw = True
-                break
-        
-        if has_real_pw:
-            self.hardcoded_pw.append(name)
+    def check_workflow(self, workflow):
+        # Hits come from attribute values (and quoted URLs in expression
+        # text) collected while the tree was walked; see workflow.py
+        name = workflow.name
+        partial = super().check_workflow(workflow)
 
-        # Improved URL detection
-        for line in txt.splitlines():
-            # Skip namespace definitions
-            if "xmlns" in line or "http://schemas." in line or "mc:Ignorable" in line:
-                continue
-            
-            # Find URLs in quotes
-            url_matches = re.findall(r'"(https?://[^"]+)"', line)
-            for url in url_matches:
-                # Basic check to skip common framework URLs if any were missed by the line check
-                if "schemas.uipath.com" not in url and "schemas.microsoft.com" not in url:
-                    self.hardcoded_url.append(name)
-                    return # Found a URL in this workflow, move to next
+        pw_hits = [(name, hit.path, hit.attribute) for hit in workflow.secret_hits if hit.kind == "password"]
+        url_hits = [(name, hit.path, hit.attribute, hit.value) for hit in workflow.secret_hits if hit.kind == "url"]
 
-    def get_result(self):
-        area = AreaResult(self.category)
+        if pw_hits:
+            partial["hardcoded_pw"] = [name]
+            partial["pw_hits"] = pw_hits
+        if url_hits:
+            partial["hardcoded_url"] = [name]
+            partial["url_hits"] = url_hits
 
-        area.add_checkpoint(
-            CheckpointResult(1, "Are credentials stored securely?", "N/A", "Verify Orchestrator Assets manually.")
-        )
+        return partial
 
+    def _hardcoding_checkpoint(self, cp, items):
         fail = self.hardcoded_pw or self.hardcoded_url
-        area.add_checkpoint(
-            CheckpointResult(
-                2,
-                "Is hardcoding of credentials avoided?",
-                "FAIL" if fail else "PASS",
-                "; ".join(filter(None, [
-                    f"Passwords in {', '.join(self.hardcoded_pw)}" if self.hardcoded_pw else "",
-                    f"URLs in {', '.join(self.hardcoded_url)}" if self.hardcoded_url else ""
-                ])) or "No hardcoded secrets detected."
-            )
-        )
+        comment = "; ".join(filter(None, [
+            f"Passwords in {', '.join(self.hardcoded_pw)}" if self.hardcoded_pw else "",
+            f"URLs in {', '.join(self.hardcoded_url)}" if self.hardcoded_url else ""
+        ])) or "No hardcoded secrets detected."
 
-        return area
+        details = [f"- {name}: {path} ({attribute})" for name, path, attribute in self.pw_hits]
+        details += [f"- {name}: {path} ({attribute}) {url}" for name, path, attribute, url in self.url_hits]
+        if details:
+            comment += "\n" + "\n".join(details)
+
+        return CheckpointResult(cp["id"], cp["question"], "FAIL" if fail else "PASS", comment)
 
 
 # ==========================================================
 # 6. Testing & Debugging
 # ==========================================================
 
-class TestingDebuggingRule(Rule):
+class TestingDebuggingRule(DeclarativeRule):
+    CATEGORY = "Testing & Debugging"
+    KINDS = DeclarativeRule.KINDS | {"code"}
+    FACTS = frozenset({"text"})
+    FEATURES = VARIABLE_DEFAULT | ARGUMENT_KEY
+    SPEC = {
+        "category": CATEGORY,
+        "selectors": {
+            "WriteLine": {"type": "WriteLine"}
+        },
+        "checkpoints": [
+            {
+                "id": 1, "question": "Has the workflow been tested?",
+                "kind": "static", "status": "N/A",
+                "comment": "External verification required."
+            },
+            # CP 2: Breakpoints and Debug logs (WriteLine activities listed by the selector)
+            {
+                "id": 2, "question": "Are breakpoints and debug logs removed?",
+                "kind": "code", "over": {"WriteLine": 0}, "method": "_debug_checkpoint"
+            },
+            # CP 3: Test Data Cleaning
+            {
+                "id": 3, "question": "Are test data cleaned?",
+                "kind": "code", "method": "_test_data_checkpoint"
+            }
+        ]
+    }
+
     def __init__(self):
-        super().__init__("Testing & Debugging")
-        self.debug_activities = []
+        super().__init__()
         self.breakpoints = {} # {workflow_name: [activity_names]}
         self.hardcoded_test_data = {} # {workflow_name: [descriptions]}
 
-    def process_workflow(self, workflow_data):
-        name = workflow_data["name"]
-        txt = workflow_data["text_content"]
-        types = [a["type"] for a in workflow_data["activities"]]
-        if "WriteLine" in types:
-            self.debug_activities.append(name)
+    def check_workflow(self, workflow):
+        name = workflow.name
+        txt = workflow.text
+        partial = super().check_workflow(workflow)
 
         # Rule 3: Hardcoded Test Data in Variables/Arguments
         findings = []
 
         # Check for Variable Default values
         var_default_pattern = r'<Variable[^>]*Name="([^"]+)"[^>]*>.*?<Variable\.Default>(.*?)</Variable\.Default>'
-        var_defaults = re.findall(var_default_pattern, txt, re.DOTALL)
+        var_defaults = re.findall(var_default_pattern, txt, re.DOTALL) if workflow.features & VARIABLE_DEFAULT else []
         for var_name, default_content in var_defaults:
             # Skip if it's a C# or VB expression
             if any(tag in default_content for tag in ["CSharpValue", "CSharpReference", "VisualBasicValue", "VisualBasicReference"]):
@@ -806,7 +969,7 @@ class TestingDebuggingRule(Rule):
 
         # Check for Argument hardcoded values
         arg_pattern = r'<(InArgument|OutArgument|InOutArgument)[^>]*x:Key="([^"]+)"[^>]*>(.+?)</\1>'
-        args = re.findall(arg_pattern, txt, re.DOTALL)
+        args = re.findall(arg_pattern, txt, re.DOTALL) if workflow.features & ARGUMENT_KEY else []
         for arg_type, arg_key, arg_val in args:
             # Skip if it's a C# or VB expression
             if any(tag in arg_val for tag in ["CSharpValue", "CSharpReference", "VisualBasicValue", "VisualBasicReference"]):
@@ -818,17 +981,14 @@ class TestingDebuggingRule(Rule):
                 findings.append(f"Argument `{arg_key}` has hardcoded value: `{val}`")
 
         if findings:
-            self.hardcoded_test_data[name] = findings
+            partial["hardcoded_test_data"] = {name: findings}
 
-    def get_result(self):
-        area = AreaResult(self.category)
+        return partial
 
-        area.add_checkpoint(CheckpointResult(1, "Has the workflow been tested?", "N/A", "External verification required."))
-        
-        # CP 2: Breakpoints and Debug logs
+    def _debug_checkpoint(self, cp, debug_activities):
         comment_parts = []
-        if self.debug_activities:
-            comment_parts.append(f"❌ WriteLine activities found in: {', '.join(self.debug_activities)}")
+        if debug_activities:
+            comment_parts.append(f"❌ WriteLine activities found in: {', '.join(debug_activities)}")
         
         if self.breakpoints:
             comment_parts.append("\n❌ Active breakpoints found:")
@@ -837,18 +997,11 @@ class TestingDebuggingRule(Rule):
                 for activity in activities:
                     comment_parts.append(f"  - {activity}")
         
-        status = "PASS" if not self.debug_activities and not self.breakpoints else "FAIL"
+        status = "PASS" if not debug_activities and not self.breakpoints else "FAIL"
         comment = "\n".join(comment_parts) if comment_parts else "No debug activities or breakpoints found."
+        return CheckpointResult(cp["id"], cp["question"], status, comment)
 
-        area.add_checkpoint(
-            CheckpointResult(
-                2,
-                "Are breakpoints and debug logs removed?",
-                status,
-                comment
-            )
-        )
-        # CP 3: Test Data Cleaning
+    def _test_data_checkpoint(self, cp, items):
         test_data_comment_parts = []
         if self.hardcoded_test_data:
             test_data_comment_parts.append("❌ Hardcoded test data found:")
@@ -857,39 +1010,64 @@ class TestingDebuggingRule(Rule):
                 for issue in issues:
                     test_data_comment_parts.append(f"  - {issue}")
         
-        area.add_checkpoint(
-            CheckpointResult(
-                3,
-                "Are test data cleaned?",
-                "PASS" if not self.hardcoded_test_data else "FAIL",
-                "\n".join(test_data_comment_parts) if test_data_comment_parts else "No hardcoded test data found."
-            )
+        return CheckpointResult(
+            cp["id"],
+            cp["question"],
+            "PASS" if not self.hardcoded_test_data else "FAIL",
+            "\n".join(test_data_comment_parts) if test_data_comment_parts else "No hardcoded test data found."
         )
 
-        return area
-
 
 # ==========================================================
 # 7. Dependencies & Settings
 # ==========================================================
 
-class DependencyRule(Rule):
+class DependencyRule(DeclarativeRule):
+    CATEGORY = "Dependencies & Settings"
+    KINDS = DeclarativeRule.KINDS | {"code"}
+    FACTS = frozenset({"references"})
+    SPEC = {
+        "category": CATEGORY,
+        "checkpoints": [
+            # CP 1: Unused Dependencies
+            {
+                "id": 1, "question": "Are dependencies optimized?",
+                "kind": "code", "method": "_dependencies_checkpoint"
+            },
+            {
+                "id": 2, "question": "Are project settings configured?",
+                "kind": "static", "status": "N/A",
+                "comment": "External verification required."
+            }
+        ]
+    }
+
     def __init__(self):
-        super().__init__("Dependencies & Settings")
+        super().__init__()
         self.project_dependencies = {} # {name: version}
         self.used_dependencies = set()
 
-    def process_workflow(self, workflow_data):
-        txt = workflow_data["text_content"]
+    def signature(self):
+        return f"{super().signature()}:{','.join(sorted(self.project_dependencies))}"
+
+    def check_workflow(self, workflow):
+        # A package counts as used when its name or namespace (the name
+        # without ".Activities") is, or is a parent of, one of the
+        # namespaces / assemblies the workflow references.
+        index = set()
+        for ref in workflow.references:
+            parts = ref.split(".")
+            index.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+
+        used = set()
         for dep_name in self.project_dependencies.keys():
-            if dep_name in self.used_dependencies:
-                continue
-            if dep_name in txt or dep_name.replace(".Activities", "") in txt:
-                self.used_dependencies.add(dep_name)
+            if dep_name in index or dep_name.replace(".Activities", "") in index:
+                used.add(dep_name)
+        partial = super().check_workflow(workflow)
+        partial["used_dependencies"] = used
+        return partial
 
-    def get_result(self):
-        area = AreaResult(self.category)
-        # CP 1: Unused Dependencies
+    def _dependencies_checkpoint(self, cp, items):
         core_deps = {"UiPath.System.Activities", "UiPath.UIAutomation.Activities"}
         unused = [dep for dep in self.project_dependencies.keys() if dep not in self.used_dependencies and dep not in core_deps]
         
@@ -897,13 +1075,17 @@ class DependencyRule(Rule):
         comment = "Dependencies appear valid and optimized." if not unused \
                   else f"Potentially unused dependencies detected (not referenced in XAML): {', '.join(unused)}"
         
-        area.add_checkpoint(
-            CheckpointResult(
-                1, 
-                "Are dependencies optimized?", 
-                status, 
-                comment
-            )
-        )
-        area.add_checkpoint(CheckpointResult(2, "Are project settings configured?", "N/A", "External verification required."))
-        return area
\ No newline at end of file
+        return CheckpointResult(cp["id"], cp["question"], status, comment)
+
+
+# Every rule, in report order. Rules are only instantiated for the
+# categories a review asks for.
+RULE_CLASSES = [
+    WorkflowStructureRule,
+    VariableArgumentRule,
+    ErrorHandlingRule,
+    ReadabilityRule,
+    SecurityRule,
+    TestingDebuggingRule,
+    DependencyRule
+]
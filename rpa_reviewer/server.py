@@ -1,9 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
 import os
-from .analyzer import ProjectAnalyzer
+import json
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from .analyzer import ProjectAnalyzer, summarize
+from .cache import ResultCache, DEFAULT_CACHE_DIR
+from .jobs import JobQueue, QueueFullError
+from .batch import BatchReviewer, discover_projects
+from .metrics import Registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from .utils import current_rss_bytes, peak_rss_bytes
 
 app = FastAPI(title="RPA Reviewer API")
 
@@ -16,15 +27,156 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shared on-disk cache of per-workflow results
+result_cache = ResultCache(
+    os.environ.get("RPA_REVIEWER_CACHE_DIR", DEFAULT_CACHE_DIR),
+    int(os.environ.get("RPA_REVIEWER_CACHE_MB", "256")) * 1024 * 1024
+)
+
+# Analyzers kept alive for /analyze/incremental, least recently used first
+MAX_INCREMENTAL_PROJECTS = int(os.environ.get("RPA_REVIEWER_INCREMENTAL_PROJECTS", "16"))
+incremental_sessions = OrderedDict()  # {(path, rules, include_framework): (lock, analyzer)}
+incremental_sessions_lock = threading.Lock()
+
+# -------------------------------------------------
+# Metrics, scraped from /metrics
+# -------------------------------------------------
+metrics = Registry()
+http_requests = metrics.counter(
+    "rpa_reviewer_http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+http_duration = metrics.histogram(
+    "rpa_reviewer_http_request_duration_seconds", "Time to produce an HTTP response.", ("route",),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0))
+analyses = metrics.counter(
+    "rpa_reviewer_analyses_total", "Analyses finished, by endpoint and outcome.", ("endpoint", "status"))
+analysis_duration = metrics.histogram(
+    "rpa_reviewer_analysis_duration_seconds", "Wall time of one analysis.", ("endpoint",))
+analyses_in_flight = metrics.gauge(
+    "rpa_reviewer_analyses_in_flight", "Analyses currently running in request handlers.")
+files_processed = metrics.counter(
+    "rpa_reviewer_files_processed_total", "Workflow files seen by analyses, by outcome.", ("status",))
+bytes_processed = metrics.counter(
+    "rpa_reviewer_bytes_processed_total", "Bytes of workflow files analyzed or served from the cache.")
+cache_lookups = metrics.counter(
+    "rpa_reviewer_cache_lookups_total", "Result cache lookups.", ("result",))
+analyses_in_flight.set(0)
+bytes_processed.inc(0)
+
+def cache_hit_ratio():
+    hits = cache_lookups.get(result="hit")
+    lookups = hits + cache_lookups.get(result="miss")
+    return hits / lookups if lookups else None
+
+metrics.gauge("rpa_reviewer_cache_hit_ratio", "Result cache hits over lookups since start.", func=cache_hit_ratio)
+metrics.gauge("rpa_reviewer_process_resident_memory_bytes", "Current resident set size.", func=current_rss_bytes)
+metrics.gauge("rpa_reviewer_process_peak_resident_memory_bytes", "Peak resident set size.", func=peak_rss_bytes)
+
+def record_analyzer(analyzer):
+    for status, count in analyzer.file_counts.items():
+        files_processed.inc(count, status=status)
+    bytes_processed.inc(analyzer.bytes_processed)
+    if analyzer.cache is not None:
+        cache_lookups.inc(analyzer.cache_hits, result="hit")
+        cache_lookups.inc(analyzer.cache_misses, result="miss")
+
+@contextmanager
+def track_analysis(endpoint, analyzer=None):
+    analyses_in_flight.inc()
+    started = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "ok"
+    finally:
+        analyses_in_flight.dec()
+        analysis_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+        analyses.inc(endpoint=endpoint, status=status)
+        if analyzer is not None:
+            record_analyzer(analyzer)
+
+def record_job(job):
+    if job.started_at is not None:
+        analysis_duration.observe((job.finished_at or time.time()) - job.started_at, endpoint="jobs")
+    analyses.inc(endpoint="jobs", status=job.status)
+    record_analyzer(job.analyzer)
+
+# Background analyses submitted through /jobs
+job_queue = JobQueue(
+    concurrency=int(os.environ.get("RPA_REVIEWER_JOB_CONCURRENCY", "2")),
+    max_queued=int(os.environ.get("RPA_REVIEWER_JOB_QUEUE", "32")),
+    on_finish=record_job
+)
+
+metrics.gauge(
+    "rpa_reviewer_jobs", "Jobs in the background queue, by state.", ("state",),
+    func=lambda: {(state,): job_queue.stats()[state] for state in ("running", "queued")}
+)
+
+@app.middleware("http")
+async def count_requests(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/jobs/{job_id}), not the raw path
+        route = request.scope.get("route")
+        route = route.path if route is not None else "unmatched"
+        http_requests.inc(method=request.method, route=route, status=status)
+        http_duration.observe(time.perf_counter() - started, route=route)
+
 class AnalyzeRequest(BaseModel):
     path: str
     active_rules: Optional[List[str]] = None
     include_framework: bool = True
+    workers: int = 1
+    use_cache: bool = True
+    timings: bool = False
+    trace_allocations: bool = False
+    low_memory: bool = False
+    include_graph: bool = False
+    ignore: Optional[List[str]] = None  # .gitignore style patterns, on top of the project's .gitignore
+    use_gitignore: bool = True
+
+class GraphRequest(BaseModel):
+    path: str
+    entry: Optional[str] = None  # default: the entry points of project.json
+    use_cache: bool = True
+
+class BatchRequest(BaseModel):
+    paths: List[str]
+    active_rules: Optional[List[str]] = None
+    include_framework: bool = True
+    workers: int = 1
+    use_cache: bool = True
+    include_areas: bool = False
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+def build_response(request, analyzer, area_results):
+    response = {
+        "success": True,
+        "stats": summarize(area_results),
+        "areas": area_results
+    }
+    if request.use_cache:
+        response["cache"] = analyzer.cache_stats()
+    if request.timings:
+        response["timings"] = analyzer.timing_stats()
+    if request.low_memory:
+        response["memory"] = analyzer.memory_stats()
+    if request.include_graph:
+        response["graph"] = analyzer.graph.to_dict()
+    return response
+
 @app.post("/analyze")
 def analyze_project(request: AnalyzeRequest):
     project_path = request.path
@@ -37,42 +189,258 @@ def analyze_project(request: AnalyzeRequest):
         analyzer = ProjectAnalyzer(
             project_path, 
             active_rules=request.active_rules,
-            include_framework=request.include_framework
+            include_framework=request.include_framework,
+            workers=request.workers,
+            cache=result_cache if request.use_cache else None,
+            timings=request.timings,
+            trace_allocations=request.trace_allocations,
+            low_memory=request.low_memory,
+            ignore=request.ignore,
+            use_gitignore=request.use_gitignore
+        )
+        with track_analysis("analyze", analyzer):
+            area_results = analyzer.analyze()
+        return build_response(request, analyzer, area_results)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/stream")
+def analyze_project_stream(request: AnalyzeRequest):
+    """
+    Same as /analyze, but streams newline-delimited JSON events while the
+    analysis runs: "start", "discovered", one "file" per workflow, one
+    "area" per review area, then "done" with the overall stats (or "error").
+    """
+    project_path = request.path
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+
+    print(f"Streaming analysis: {project_path} with rules: {request.active_rules}")
+
+    analyzer = ProjectAnalyzer(
+        project_path,
+        active_rules=request.active_rules,
+        include_framework=request.include_framework,
+        workers=request.workers,
+        cache=result_cache if request.use_cache else None,
+        timings=request.timings,
+        trace_allocations=request.trace_allocations,
+        low_memory=request.low_memory,
+        ignore=request.ignore,
+        use_gitignore=request.use_gitignore
+    )
+
+    def events():
+        area_results = []
+        try:
+            with track_analysis("stream", analyzer):
+                for event in analyzer.iter_analyze():
+                    if event["event"] == "area":
+                        area_results.append(event["area"])
+                    yield json.dumps(event) + "\n"
+
+            done = build_response(request, analyzer, area_results)
+            del done["areas"]  # already streamed
+            done["event"] = "done"
+            yield json.dumps(done) + "\n"
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/analyze/incremental")
+def analyze_project_incremental(request: AnalyzeRequest):
+    """
+    Same as /analyze, but remembers the project between calls and only
+    rescans .xaml files whose mtime or size changed since the previous one.
+    """
+    project_path = request.path
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+
+    key = (
+        os.path.abspath(project_path),
+        tuple(sorted(request.active_rules or [])),
+        request.include_framework,
+        tuple(request.ignore or []),
+        request.use_gitignore
+    )
+    with incremental_sessions_lock:
+        session = incremental_sessions.pop(key, None)
+        if session is None:
+            session = (
+                threading.Lock(),
+                ProjectAnalyzer(
+                    project_path,
+                    active_rules=request.active_rules,
+                    include_framework=request.include_framework,
+                    incremental=True,
+                    ignore=request.ignore,
+                    use_gitignore=request.use_gitignore
+                )
+            )
+        incremental_sessions[key] = session
+        while len(incremental_sessions) > MAX_INCREMENTAL_PROJECTS:
+            incremental_sessions.popitem(last=False)
+
+    lock, analyzer = session
+    try:
+        # One analysis per project at a time; the analyzer holds per-file state
+        with lock:
+            analyzer.workers = request.workers
+            analyzer.cache = result_cache if request.use_cache else None
+            analyzer.timings = request.timings
+            analyzer.trace_allocations = request.trace_allocations
+            analyzer.low_memory = request.low_memory
+            with track_analysis("incremental", analyzer):
+                area_results = analyzer.analyze()
+            response = build_response(request, analyzer, area_results)
+            response["incremental"] = analyzer.incremental_stats()
+        return response
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/graph")
+def project_graph(request: GraphRequest):
+    """
+    Invoke graph of a project: edges between workflows, what each entry
+    point reaches, dead workflows and fan-in. Only InvokeWorkflowFile
+    targets are read per file, and they come from the result cache (keyed
+    by file hash) whenever the file was seen before, so this rarely parses
+    anything after an /analyze.
+    """
+    project_path = request.path
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+
+    analyzer = ProjectAnalyzer(project_path, cache=result_cache if request.use_cache else None)
+    try:
+        with track_analysis("graph"):
+            graph = analyzer.build_graph()
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if request.entry is not None and graph.resolve_workflow(request.entry) is None:
+        raise HTTPException(status_code=404, detail=f"Workflow not found: {request.entry}")
+    return {"success": True, "graph": graph.to_dict(request.entry)}
+
+@app.post("/analyze/batch")
+def analyze_batch(request: BatchRequest):
+    """
+    Reviews several projects in one call. Each path is either a project or
+    a root directory searched for project.json files. Returns per-project
+    stats plus a consolidated summary with throughput in projects/minute.
+    """
+    project_paths = []
+    for path in request.paths:
+        if not os.path.isdir(path):
+            raise HTTPException(status_code=404, detail=f"Project path not found: {path}")
+        project_paths.extend(discover_projects(path) or [path])
+
+    print(f"Batch review of {len(project_paths)} projects with rules: {request.active_rules}")
+
+    try:
+        reviewer = BatchReviewer(
+            project_paths,
+            active_rules=request.active_rules,
+            include_framework=request.include_framework,
+            workers=request.workers,
+            cache=result_cache if request.use_cache else None
         )
-        area_results = analyzer.analyze()
-        
-        # Calculate Overall Stats
-        pass_count = 0
-        fail_count = 0
-        
-        for area in area_results:
-            for cp in area['checkpoints']:
-                if cp['status'] == 'PASS':
-                    pass_count += 1
-                elif cp['status'] == 'FAIL':
-                    fail_count += 1
-        
-        total_valid = pass_count + fail_count
-        percentage = "N/A"
-        if total_valid > 0:
-            percentage = round((pass_count / total_valid) * 100, 1)
-            
-        stats = {
-            "pass_count": pass_count,
-            "fail_count": fail_count,
-            "overall_percentage": percentage
-        }
-        
-        return {
-            "success": True,
-            "stats": stats,
-            "areas": area_results
-        }
+        with track_analysis("batch"):
+            report = reviewer.run()
+        summary = report["summary"]
+        files_processed.inc(summary["files"], status="batch")
+        if reviewer.cache is not None:
+            cache_lookups.inc(summary["cache_hits"], result="hit")
+            cache_lookups.inc(summary["cache_misses"], result="miss")
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not request.include_areas:
+        for result in report["projects"]:
+            result.pop("areas", None)
+    report["success"] = True
+    return report
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: AnalyzeRequest):
+    """
+    Queues an analysis and returns right away with the job id; poll
+    GET /jobs/{id} for progress, timing and, once done, the same result
+    /analyze would have returned.
+    """
+    project_path = request.path
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project path not found")
+
+    analyzer = ProjectAnalyzer(
+        project_path,
+        active_rules=request.active_rules,
+        include_framework=request.include_framework,
+        workers=request.workers,
+        cache=result_cache if request.use_cache else None,
+        timings=request.timings,
+        trace_allocations=request.trace_allocations,
+        low_memory=request.low_memory,
+        ignore=request.ignore,
+        use_gitignore=request.use_gitignore
+    )
+    try:
+        job = job_queue.submit(
+            analyzer,
+            description={
+                "path": project_path,
+                "active_rules": request.active_rules,
+                "include_framework": request.include_framework
+            },
+            build_result=lambda analyzer, area_results: build_response(request, analyzer, area_results)
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+    print(f"Queued job {job.id}: {project_path}")
+    return job.to_dict()
+
+@app.get("/jobs")
+def list_jobs():
+    return {
+        "queue": job_queue.stats(),
+        "jobs": [job.to_dict(include_result=False) for job in job_queue.list()]
+    }
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict(include_result=False)
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    return cancel_job(job_id)
+
+@app.on_event("shutdown")
+def shutdown_jobs():
+    job_queue.shutdown()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
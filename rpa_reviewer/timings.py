@@ -0,0 +1,97 @@
+import time
+import tracemalloc
+
+
+class PhaseTimer:
+    """
+    Records consecutive phases of work on one file: each lap() closes the
+    phase that started at the previous lap (or at creation). With
+    trace_allocations, the peak of memory allocated during each phase is
+    recorded too; that needs tracemalloc to be running.
+    """
+
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations and tracemalloc.is_tracing()
+        self.phases = {}  # {phase: [seconds, allocated bytes]}
+        self._restart()
+
+    def _restart(self):
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._last = time.perf_counter()
+
+    def lap(self, phase):
+        seconds = time.perf_counter() - self._last
+        allocated = 0
+        if self.trace_allocations:
+            allocated = max(0, tracemalloc.get_traced_memory()[1] - self._memory)
+        self.phases[phase] = [seconds, allocated]
+        self._restart()
+
+
+class NullTimer:
+    """PhaseTimer stand-in for untimed runs: lap() does nothing, phases is None."""
+    phases = None
+
+    def lap(self, phase):
+        pass
+
+
+NULL_TIMER = NullTimer()
+
+
+class TimingReport:
+    """
+    Aggregates PhaseTimer results over a whole analysis: totals per phase
+    and the slowest files.
+    """
+
+    def __init__(self, trace_allocations=False, top=10):
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.phases = {}  # {phase: [seconds, calls, allocated bytes]}
+        self.files = []   # [(seconds, path, phases)]
+        self.started = time.perf_counter()
+        self.total_seconds = None
+
+    def add(self, phases, path=None):
+        file_seconds = 0.0
+        for phase, (seconds, allocated) in phases.items():
+            totals = self.phases.setdefault(phase, [0.0, 0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+            totals[2] += allocated
+            file_seconds += seconds
+        if path is not None:
+            self.files.append((file_seconds, path, phases))
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self.started
+
+    def to_dict(self):
+        def phase_dict(seconds, allocated, calls=None):
+            data = {"seconds": round(seconds, 6)}
+            if calls is not None:
+                data["calls"] = calls
+            if self.trace_allocations:
+                data["allocated_bytes"] = allocated
+            return data
+
+        slowest = sorted(self.files, key=lambda item: item[0], reverse=True)[:self.top]
+        return {
+            "total_seconds": round(self.total_seconds or 0.0, 6),
+            "files": len(self.files),
+            "phases": {
+                phase: phase_dict(seconds, allocated, calls)
+                for phase, (seconds, calls, allocated) in self.phases.items()
+            },
+            "slowest_files": [
+                {
+                    "path": path,
+                    "seconds": round(seconds, 6),
+                    "phases": {phase: phase_dict(s, a) for phase, (s, a) in phases.items()}
+                }
+                for seconds, path, phases in slowest
+            ]
+        }
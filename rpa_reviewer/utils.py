@@ -1,5 +1,8 @@
 import xml.etree.ElementTree as ET
 import re
+import os
+import sys
+from functools import lru_cache
 
 def get_namespaces(file_path):
     """
@@ -16,6 +19,7 @@ def get_namespaces(file_path):
         pass
     return namespaces
 
+@lru_cache(maxsize=4096)
 def stripped_tag(tag):
     """
     Removes the namespace URL from a tag name.
@@ -25,3 +29,25 @@ def stripped_tag(tag):
 
 def camel_case_split(str):
     return re.findall(r'[A-Z](?:[a-z]+|[A-Z]*(?=[A-Z]|$))', str)
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of this process, or None where the resource
+    module is not available (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def current_rss_bytes():
+    """Current resident set size (Linux only, None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
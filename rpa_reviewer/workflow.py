@@ -0,0 +1,641 @@
+import io
+import mmap
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from functools import lru_cache
+from .expressions import bracketed_expression, expression_identifiers
+from .prescan import ALL_FEATURES, INVOKE_WORKFLOW, SECRET, TRYCATCH, URL, scan_features
+from .timings import NULL_TIMER
+from .utils import stripped_tag
+
+XAML_NAME = "{http://schemas.microsoft.com/winfx/2006/xaml}Name"
+
+# Elements whose text is a C# / VB expression
+EXPRESSION_TAGS = {"CSharpReference", "CSharpValue", "VisualBasicReference", "VisualBasicValue"}
+
+XAML_TYPE_ARGUMENTS = "{http://schemas.microsoft.com/winfx/2006/xaml}TypeArguments"
+# sap2010:Annotation.AnnotationText="..."
+ANNOTATION_TEXT = "{http://schemas.microsoft.com/netfx/2010/xaml/activities/presentation}Annotation.AnnotationText"
+
+# Designer metadata that does not count as content of a Catch block
+METADATA_TAGS = {"WorkflowViewStateService.ViewState", "WorkflowViewState.IdRef"}
+
+LOGGING_TAGS = ("LogMessage", "WriteLine", "AddLogFields")
+
+# <Throw Exception="[New BusinessRuleException(&quot;...&quot;)]"/>
+VB_THROW_PATTERN = re.compile(r'\[New\s+([A-Za-z0-9_.]+)\(')
+# <CSharpValue>new BusinessRuleException("...")</CSharpValue>
+CSHARP_THROW_PATTERN = re.compile(r'\s*new\s+([A-Za-z0-9_.]+)\(')
+
+# Attribute names that hold credentials, e.g. Password, SecurePassword, ProxyCredential
+SECRET_ATTRIBUTE_PATTERN = re.compile(r'(?:Password|Credential)$', re.IGNORECASE)
+# URLs written as string literals inside expressions: ["https://..."]
+QUOTED_URL_PATTERN = re.compile(r'"(https?://[^"]+)"')
+URL_PREFIXES = ("http://", "https://")
+SCHEMA_HOSTS = ("schemas.uipath.com", "schemas.microsoft.com", "://schemas.")
+
+# xmlns declarations on the root element; ElementTree drops them from the tree
+ROOT_START_PATTERN = re.compile(r'<[A-Za-z_]')
+XMLNS_PATTERN = re.compile(r'\sxmlns(?::[\w.-]+)?=["\']([^"\']*)["\']')
+# xmlns:ue="clr-namespace:UiPath.Excel;assembly=UiPath.Excel.Activities"
+CLR_NAMESPACE_PATTERN = re.compile(r'clr-namespace:([^;"]*)(?:;assembly=([^;"]*))?')
+
+# What extraction can fill in a WorkflowModel. Rules declare the facts they
+# read (Rule.FACTS) and only the union of the active ones is extracted:
+#   text        the decoded file            variables / arguments / used_names
+#   activities  elements with a DisplayName type_index  every element, for find() / count()
+#   catches     catches and max_trycatch_depth
+#   secrets     secret_hits                 references / invokes
+ALL_FACTS = frozenset({
+    "text", "variables", "arguments", "activities", "type_index", "used_names", "catches", "secrets", "references",
+    "invokes"
+})
+
+# Facts that are empty unless the prescan found their feature (prescan.py)
+FACT_FEATURES = {"catches": TRYCATCH, "secrets": URL | SECRET, "invokes": INVOKE_WORKFLOW}
+
+# Files from this size up are extracted with iterparse (stream_workflow)
+# instead of a full tree; below it the tree is slightly faster
+STREAMING_THRESHOLD = 1024 * 1024
+
+Variable = namedtuple("Variable", ["name", "type"])
+Argument = namedtuple("Argument", ["name", "direction"])
+# display_name / annotation are None when the element has no such attribute
+Activity = namedtuple("Activity", ["type", "display_name", "annotation"])
+CatchBlock = namedtuple("CatchBlock", ["exception_type", "has_content", "has_throw", "has_logging", "thrown_types"])
+# kind is "password" or "url"; value is the URL, never the password
+SecretHit = namedtuple("SecretHit", ["kind", "path", "attribute", "value"])
+
+
+class WorkflowModel:
+    """
+    Facts extracted from a single .xaml file. This is what every
+    Rule.process_workflow receives. Only `facts` (see ALL_FACTS) were
+    extracted, the other fields stay empty. `features` are the prescan bits
+    of the file, all set when it was not prescanned.
+    """
+
+    def __init__(self, name, path, text, facts=ALL_FACTS, features=ALL_FEATURES):
+        self.name = name
+        self.path = path
+        self.text = text
+        self.facts = facts
+        self.features = features
+        self.variables = []      # [Variable]
+        self.arguments = []      # [Argument]
+        self.activities = []     # [Activity], every element with a DisplayName
+        self.type_index = {}     # {element type: [Activity]}, every element, in document order
+        self.used_names = set()  # identifiers referenced from expressions
+        self.catches = []        # [CatchBlock], one per <Catch> of every TryCatch
+        self.max_trycatch_depth = 0  # 1 = TryCatch blocks present but none nested
+        self.secret_hits = []    # [SecretHit], hardcoded passwords and URLs in attribute values
+        self.references = set()  # namespaces and assemblies from xmlns, imports and AssemblyReference
+        self.invokes = []        # WorkflowFileName of every InvokeWorkflowFile, as written
+        self.matches = {}        # {(rule category, selector name): count}, see engine.Matcher
+
+    def count(self, activity_type):
+        """Number of elements of a type (stripped tag), with or without a DisplayName."""
+        return len(self.type_index.get(activity_type, ()))
+
+    def find(self, activity_type):
+        """[Activity] of every element of a type, in document order."""
+        return self.type_index.get(activity_type, [])
+
+
+def parse_workflow(file_path, matcher=None, facts=ALL_FACTS, wanted=0, timer=NULL_TIMER):
+    """
+    Reads a workflow once and builds its WorkflowModel in a single walk over
+    the parsed tree. `matcher` (engine.Matcher) counts the selectors of the
+    declarative rules during that walk; `facts` limits what is extracted.
+    With `wanted` prescan features (see required_features), the file is
+    memory-mapped and prescanned first, and only copied into memory when
+    something is left to extract. Large files are streamed straight from
+    the file (or mapping) unless the rules need the text, so their bytes
+    are never all held in memory. `timer` (timings.PhaseTimer) times the
+    read, prescan and parse phases.
+    """
+    with open(file_path, "rb") as f:
+        if not wanted:
+            if "text" not in facts and os.fstat(f.fileno()).st_size >= STREAMING_THRESHOLD:
+                return stream_source(file_path, f, matcher, facts, ALL_FEATURES, timer)
+            data = f.read()
+            timer.lap("read")
+            return parse_workflow_bytes(file_path, data, matcher, facts, timer=timer)
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return parse_workflow_bytes(file_path, b"", matcher, facts, scan_features(b"", wanted), timer)
+
+    with mm:
+        features = scan_features(mm, wanted)
+        timer.lap("prescan")
+        present = present_facts(facts, features)
+        if not present and matcher is None:
+            return WorkflowModel(os.path.basename(file_path), file_path, None, frozenset(), features)
+        if "text" not in present and len(mm) >= STREAMING_THRESHOLD:
+            # iterparse reads the mapping like a file
+            return stream_source(file_path, mm, matcher, present, features, timer)
+        data = mm[:]
+        timer.lap("read")
+    return parse_workflow_bytes(file_path, data, matcher, facts, features, timer)
+
+
+def stream_source(file_path, source, matcher, facts, features, timer=NULL_TIMER):
+    """stream_workflow over a file object without the text (facts must not have "text")."""
+    workflow = stream_workflow(file_path, None, source, matcher, facts)
+    workflow.features = features
+    timer.lap("stream")
+    return workflow
+
+
+def parse_workflow_bytes(file_path, data, matcher=None, facts=ALL_FACTS, features=ALL_FEATURES, timer=NULL_TIMER):
+    facts = present_facts(facts, features)
+    if not facts and matcher is None:
+        # Nothing the rules read can be in this file
+        return WorkflowModel(os.path.basename(file_path), file_path, None, facts, features)
+    if len(data) >= STREAMING_THRESHOLD:
+        # Parsing and extraction are one pass here
+        text = decode_workflow(data) if "text" in facts else None
+        workflow = stream_workflow(file_path, text, io.BytesIO(data), matcher, facts)
+        timer.lap("stream")
+    else:
+        root = ET.fromstring(data)
+        timer.lap("parse")
+        # The tree has no xmlns attributes, references read them from the text
+        text = decode_workflow(data) if "text" in facts or "references" in facts else None
+        workflow = extract_workflow(file_path, text, root, matcher, facts)
+        timer.lap("extract")
+    workflow.features = features
+    return workflow
+
+
+def present_facts(facts, features):
+    """`facts` without those that the prescan `features` show to be empty."""
+    return frozenset(fact for fact in facts if fact not in FACT_FEATURES or features & FACT_FEATURES[fact])
+
+
+def required_facts(checks):
+    """Union of the FACTS of rules / collectors; everything for those that declare none."""
+    facts = set()
+    for check in checks:
+        facts.update(getattr(check, "FACTS", ALL_FACTS))
+    return frozenset(facts)
+
+
+def required_features(checks, facts):
+    """
+    Prescan features worth searching for: the FEATURES of rules /
+    collectors, and those of `facts` when the prescan can spare more than
+    the extraction of a cheap fact, i.e. a rule's regexes or the whole
+    parse (every fact depends on a feature). 0 means no prescan.
+    """
+    wanted = 0
+    for check in checks:
+        wanted |= getattr(check, "FEATURES", 0)
+    if wanted or all(fact in FACT_FEATURES for fact in facts):
+        for fact in facts:
+            wanted |= FACT_FEATURES.get(fact, 0)
+    return wanted
+
+
+def decode_workflow(data):
+    text = data.decode("utf-8")
+    if "\r" in text:
+        # Match what open(..., "r") would have returned
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def extract_workflow(file_path, text, root, matcher=None, facts=ALL_FACTS):
+    """
+    Builds the WorkflowModel from the decoded text and the parsed root
+    element. `text` may be None unless facts has "text" or "references".
+    """
+    workflow = WorkflowModel(os.path.basename(file_path), file_path, text, facts)
+    want_variables = "variables" in facts
+    want_arguments = "arguments" in facts
+    want_catches = "catches" in facts
+    want_references = "references" in facts
+    variables = workflow.variables
+    arguments = workflow.arguments
+    catches = workflow.catches
+    references = workflow.references
+    if want_references:
+        read_xmlns_references(text, references)
+    elements = ElementFacts(workflow, matcher, facts)
+    secrets = elements.secrets
+    # {element: number of enclosing TryCatch elements}, only filled inside TryCatch blocks
+    trycatch_depths = {}
+    secret_elements = []  # [(element, kind, attribute, value)], paths are resolved after the walk
+
+    for elem in root.iter():
+        tag = stripped_tag(elem.tag)
+
+        # Skipped facts keep their branch, so the elif chain below stays the same
+        # <Sequence.Variables><Variable Name="..."/></Sequence.Variables>
+        if "Variables" in tag:
+            for var_elem in elem if want_variables else ():
+                if "Variable" in stripped_tag(var_elem.tag):
+                    name = var_elem.attrib.get("Name") or var_elem.attrib.get(XAML_NAME)
+                    if name:
+                        variables.append(Variable(name, var_elem.attrib.get("TypeArguments")))
+
+        # <x:Members><x:Property Name="..." Type="InArgument(...)"/></x:Members>
+        elif "Members" in tag:
+            for prop in elem if want_arguments else ():
+                if "Property" in stripped_tag(prop.tag) and prop.attrib.get("Name"):
+                    arguments.append(read_argument(prop.attrib))
+
+        elif tag == "Catch":
+            if want_catches:
+                catches.append(read_catch(elem))
+
+        # <TextExpression.NamespacesForImplementation><x:String>UiPath.Excel</x:String>...
+        elif tag.startswith("TextExpression.Namespaces"):
+            for item in elem.iter() if want_references else ():
+                if item is not elem and item.text and stripped_tag(item.tag) == "String":
+                    references.add(item.text.strip())
+
+        elements.start(tag, elem.attrib)
+        if elem.text:
+            elements.text(tag, elem.text)
+        if secrets:
+            secret_elements.extend((elem, kind, key, value) for kind, key, value in secrets)
+            secrets.clear()
+
+        # TryCatch nesting: iter() is pre-order, so each element's depth was
+        # handed down by its parent before we get here. Linear in file size.
+        if want_catches:
+            depth = trycatch_depths.pop(elem, 0) if trycatch_depths else 0
+            if tag == "TryCatch":
+                depth += 1
+                if depth > workflow.max_trycatch_depth:
+                    workflow.max_trycatch_depth = depth
+            if depth and len(elem):
+                trycatch_depths.update(dict.fromkeys(elem, depth))
+
+    if secret_elements:
+        parents = {child: parent for parent in root.iter() for child in parent}
+        for elem, kind, key, value in secret_elements:
+            workflow.secret_hits.append(SecretHit(kind, element_path(elem, parents), stripped_tag(key), value))
+
+    return workflow
+
+
+def stream_workflow(file_path, text, source, matcher=None, facts=ALL_FACTS):
+    """
+    Builds the same WorkflowModel as extract_workflow from iterparse events
+    over `source` (a path or binary file object) instead of a parsed tree.
+    Each element is cleared and detached from its parent once its end event
+    is handled, so of the document only the chain of open elements is held
+    in memory. The model itself still grows with the file: with
+    "type_index" it holds an entry per element, with "activities" one per
+    DisplayName.
+    """
+    workflow = WorkflowModel(os.path.basename(file_path), file_path, text, facts)
+    want_variables = "variables" in facts
+    want_arguments = "arguments" in facts
+    want_catches = "catches" in facts
+    want_references = "references" in facts
+    variables = workflow.variables
+    arguments = workflow.arguments
+    catches = workflow.catches
+    references = workflow.references
+    elements = ElementFacts(workflow, matcher, facts)
+    secrets = elements.secrets
+
+    stack = []          # [(element, tag, DisplayName, index)] of the open elements
+    catch_states = []   # [(CatchState, metadata depth at the <Catch>)] of the open Catch elements
+    metadata_depth = 0  # open METADATA_TAGS elements
+    namespaces_depth = 0
+    trycatch_depth = 0
+    index = 0           # pre-order element number, keeps secret hits in extract_workflow order
+    secret_items = []   # [(index, 0 for attributes / 1 for text, SecretHit)]
+
+    for event, item in ET.iterparse(source, ("start-ns", "start", "end")):
+        if event == "start":
+            elem = item
+            tag = stripped_tag(elem.tag)
+            attrib = elem.attrib
+            index += 1
+
+            if stack:
+                parent_tag = stack[-1][1]
+                # <Sequence.Variables><Variable Name="..."/></Sequence.Variables>
+                if "Variables" in parent_tag:
+                    if want_variables and "Variable" in tag:
+                        name = attrib.get("Name") or attrib.get(XAML_NAME)
+                        if name:
+                            variables.append(Variable(name, attrib.get("TypeArguments")))
+                # <x:Members><x:Property Name="..." Type="InArgument(...)"/></x:Members>
+                elif want_arguments and "Members" in parent_tag and "Property" in tag and attrib.get("Name"):
+                    arguments.append(read_argument(attrib))
+
+            if tag in METADATA_TAGS:
+                metadata_depth += 1
+            elif tag == "TryCatch":
+                trycatch_depth += 1
+                if want_catches and trycatch_depth > workflow.max_trycatch_depth:
+                    workflow.max_trycatch_depth = trycatch_depth
+            elif tag.startswith("TextExpression.Namespaces"):
+                namespaces_depth += 1
+
+            # Content of the enclosing Catch blocks (see read_catch)
+            if catch_states:
+                is_throw = "Throw" in tag or tag == "Rethrow"
+                thrown = None
+                if is_throw:
+                    match = VB_THROW_PATTERN.match(attrib.get("Exception", ""))
+                    thrown = match.group(1) if match else None
+                is_logging = any(log_tag in tag for log_tag in LOGGING_TAGS)
+                for state, base in catch_states:
+                    if metadata_depth == base:
+                        state.has_content = True
+                        if is_throw:
+                            state.has_throw = True
+                            if thrown:
+                                state.attr_throws.append(thrown)
+                        if is_logging:
+                            state.has_logging = True
+
+            if tag == "Catch" and want_catches:
+                # Reserve the slot so catches stay in document order with nested Catch blocks
+                catch_states.append((CatchState(len(catches), attrib.get(XAML_TYPE_ARGUMENTS)), metadata_depth))
+                catches.append(None)
+
+            display_name = elements.start(tag, attrib)
+            if secrets:
+                path = stream_path(stack, tag, display_name)
+                secret_items.extend((index, 0, SecretHit(kind, path, stripped_tag(key), value)) for kind, key, value in secrets)
+                secrets.clear()
+
+            stack.append((elem, tag, display_name, index))
+
+        elif event == "end":
+            elem, tag, display_name, elem_index = stack.pop()
+            elem_text = elem.text
+
+            if elem_text:
+                # <TextExpression.NamespacesForImplementation><x:String>UiPath.Excel</x:String>...
+                if namespaces_depth and tag == "String" and want_references:
+                    references.add(elem_text.strip())
+                elif tag == "CSharpValue" and catch_states:
+                    match = CSHARP_THROW_PATTERN.match(elem_text)
+                    if match:
+                        for state, base in catch_states:
+                            if metadata_depth == base:
+                                state.csharp_throws.append(match.group(1))
+                elements.text(tag, elem_text)
+                if secrets:
+                    path = stream_path(stack, tag, display_name)
+                    secret_items.extend((elem_index, 1, SecretHit(kind, path, key, value)) for kind, key, value in secrets)
+                    secrets.clear()
+
+            if tag in METADATA_TAGS:
+                metadata_depth -= 1
+            elif tag == "TryCatch":
+                trycatch_depth -= 1
+            elif tag.startswith("TextExpression.Namespaces"):
+                namespaces_depth -= 1
+            elif tag == "Catch" and want_catches:
+                state = catch_states.pop()[0]
+                catches[state.slot] = CatchBlock(
+                    state.exception_type,
+                    state.has_content,
+                    state.has_throw,
+                    state.has_logging,
+                    state.attr_throws + state.csharp_throws
+                )
+
+            # The element is always its parent's last child by now
+            elem.clear()
+            if stack:
+                del stack[-1][0][-1]
+
+        # xmlns declarations of the root element
+        elif index == 0 and want_references:
+            match = CLR_NAMESPACE_PATTERN.match(item[1])
+            if match:
+                references.update(filter(None, match.groups()))
+
+    secret_items.sort(key=lambda hit: hit[:2])
+    workflow.secret_hits = [hit for _, _, hit in secret_items]
+    return workflow
+
+
+class ElementFacts:
+    """
+    What extract_workflow and stream_workflow record the same way for every
+    element, from its tag, attributes and text alone: invokes, selector
+    matches, activities, used names and secrets. Where an element sits in
+    the document (variables, arguments, catches) is left to the callers,
+    and so is the location of the secrets: they are collected in `secrets`
+    as (kind, attribute, value) for the caller to take and clear.
+    """
+
+    def __init__(self, workflow, matcher, facts):
+        self.workflow = workflow
+        self.matcher = matcher
+        self.want_activities = "activities" in facts
+        self.want_type_index = "type_index" in facts
+        self.want_used_names = "used_names" in facts
+        self.want_secrets = "secrets" in facts
+        self.want_references = "references" in facts
+        self.want_invokes = "invokes" in facts
+        self.bare_activities = {}  # {type: Activity(type, None, None)}
+        self.secrets = []
+
+    def start(self, tag, attrib):
+        """Records an element from its tag and attributes. Returns its DisplayName."""
+        workflow = self.workflow
+
+        # <ui:InvokeWorkflowFile WorkflowFileName="Framework\InitAllSettings.xaml">
+        if tag == "InvokeWorkflowFile" and self.want_invokes:
+            file_name = attrib.get("WorkflowFileName")
+            if file_name:
+                workflow.invokes.append(file_name)
+
+        display_name = attrib.get("DisplayName")
+        if self.matcher is not None:
+            self.matcher.match(tag, attrib, display_name, workflow.matches)
+
+        # Elements with neither attribute share one Activity per type
+        if self.want_activities or self.want_type_index:
+            annotation = attrib.get(ANNOTATION_TEXT)
+            if display_name or annotation is not None:
+                activity = Activity(tag, display_name, annotation)
+                if display_name and self.want_activities:
+                    workflow.activities.append(activity)
+            else:
+                activity = self.bare_activities.get(tag)
+                if activity is None:
+                    activity = self.bare_activities[tag] = Activity(tag, None, None)
+            if self.want_type_index:
+                of_type = workflow.type_index.get(tag)
+                if of_type is None:
+                    workflow.type_index[tag] = [activity]
+                else:
+                    of_type.append(activity)
+
+        # Hardcoded credentials / URLs. xmlns declarations never show up as
+        # attributes, so there is nothing to skip for them.
+        if self.want_used_names or self.want_secrets:
+            for key, value in attrib.items():
+                # Message="[in_Config(&quot;Greeting&quot;)]"
+                if self.want_used_names and value.startswith("[") and key != "DisplayName":
+                    expression = bracketed_expression(value)
+                    if expression:
+                        workflow.used_names.update(expression_identifiers(expression))
+                if self.want_secrets:
+                    if "://" in value:
+                        for url in find_urls(value):
+                            self.secrets.append(("url", key, url))
+                    if value and is_secret_attribute(key) and value.strip().lower() != "{x:null}":
+                        self.secrets.append(("password", key, None))
+
+        return display_name
+
+    def text(self, tag, text):
+        """Records the expressions, references and URLs in an element's (non-empty) text."""
+        if tag in EXPRESSION_TAGS:
+            if self.want_used_names:
+                self.workflow.used_names.update(expression_identifiers(text, csharp=tag.startswith("CSharp")))
+        # <AssemblyReference>UiPath.Excel.Activities</AssemblyReference>
+        elif tag == "AssemblyReference":
+            if self.want_references:
+                self.workflow.references.add(text.strip())
+        # <InArgument x:TypeArguments="x:String">[in_Config("Url")]</InArgument>
+        elif text.startswith("["):
+            if self.want_used_names:
+                expression = bracketed_expression(text)
+                if expression:
+                    self.workflow.used_names.update(expression_identifiers(expression))
+
+        if self.want_secrets and "://" in text:
+            for url in QUOTED_URL_PATTERN.findall(text):
+                if not is_schema_url(url):
+                    self.secrets.append(("url", "(text)", url))
+
+
+class CatchState:
+    """A <Catch> that stream_workflow is still reading, see read_catch."""
+
+    def __init__(self, slot, exception_type):
+        self.slot = slot  # index in WorkflowModel.catches
+        self.exception_type = exception_type
+        self.has_content = False
+        self.has_throw = False
+        self.has_logging = False
+        self.attr_throws = []
+        self.csharp_throws = []
+
+
+def stream_path(stack, tag, display_name):
+    """element_path for stream_workflow, from the stack of open elements."""
+    parts = [f"{open_tag}[{open_name}]" for _, open_tag, open_name, _ in stack if open_name]
+    parts.append(f"{tag}[{display_name}]" if display_name else tag)
+    return "/".join(parts)
+
+
+def read_xmlns_references(text, references):
+    """Adds the CLR namespaces and assemblies declared with xmlns on the root element."""
+    start = ROOT_START_PATTERN.search(text)
+    if start is None:
+        return
+    end = text.find(">", start.end())
+    for uri in XMLNS_PATTERN.findall(text, start.start(), end if end != -1 else len(text)):
+        match = CLR_NAMESPACE_PATTERN.match(uri)
+        if match:
+            references.update(filter(None, match.groups()))
+
+
+@lru_cache(maxsize=1024)
+def is_secret_attribute(key):
+    return SECRET_ATTRIBUTE_PATTERN.search(stripped_tag(key)) is not None
+
+
+def is_schema_url(url):
+    return any(host in url for host in SCHEMA_HOSTS)
+
+
+def find_urls(value):
+    """URLs in an attribute value: the whole value, or string literals in an expression."""
+    if value.startswith(URL_PREFIXES):
+        urls = [value]
+    else:
+        urls = QUOTED_URL_PATTERN.findall(value)
+    return [url for url in urls if not is_schema_url(url)]
+
+
+def element_path(elem, parents):
+    """
+    Readable location of an element: its enclosing activities and itself,
+    e.g. Sequence[Main]/TryCatch[Try Catch 3]/HttpClient[HTTP 5].
+    """
+    parts = []
+    current = elem
+    while current is not None:
+        display_name = current.attrib.get("DisplayName")
+        if display_name:
+            parts.append(f"{stripped_tag(current.tag)}[{display_name}]")
+        elif current is elem:
+            parts.append(stripped_tag(current.tag))
+        current = parents.get(current)
+    return "/".join(reversed(parts))
+
+
+def read_argument(attrib):
+    """Argument from the attributes of an <x:Property> of <x:Members>."""
+    type_attr = str(attrib.get("Type"))
+    direction = "InArgument"
+    if "OutArgument" in type_attr:
+        direction = "OutArgument"
+    elif "InOutArgument" in type_attr:
+        direction = "InOutArgument"
+    return Argument(attrib.get("Name"), direction)
+
+
+def read_catch(catch_elem):
+    """
+    Summarises one <Catch> element: what it catches, whether it holds any
+    activity (designer metadata aside), and whether it throws or logs.
+    """
+    has_content = False
+    has_throw = False
+    has_logging = False
+    attr_throws = []
+    csharp_throws = []
+
+    # Pre-order walk that can skip whole metadata subtrees
+    stack = list(reversed(catch_elem))
+    while stack:
+        elem = stack.pop()
+        tag = stripped_tag(elem.tag)
+        if tag in METADATA_TAGS:
+            continue
+
+        has_content = True
+        if "Throw" in tag or tag == "Rethrow":
+            has_throw = True
+            match = VB_THROW_PATTERN.match(elem.attrib.get("Exception", ""))
+            if match:
+                attr_throws.append(match.group(1))
+        elif tag == "CSharpValue" and elem.text:
+            match = CSHARP_THROW_PATTERN.match(elem.text)
+            if match:
+                csharp_throws.append(match.group(1))
+        if not has_logging and any(log_tag in tag for log_tag in LOGGING_TAGS):
+            has_logging = True
+
+        stack.extend(reversed(elem))
+
+    return CatchBlock(
+        catch_elem.attrib.get(XAML_TYPE_ARGUMENTS),
+        has_content,
+        has_throw,
+        has_logging,
+        attr_throws + csharp_throws
+    )
@@ -20,6 +20,7 @@ function App() {
     const [result, setResult] = useState(null);
     const [error, setError] = useState(null);
     const [includeFramework, setIncludeFramework] = useState(true);
+    const [progress, setProgress] = useState(null);
 
     const toggleRule = (id) => {
         setActiveRules(prev =>
@@ -30,8 +31,11 @@ function App() {
     const analyzeProject = async () => {
         setLoading(true);
         setError(null);
+        setResult(null);
+        setProgress(null);
         try {
-            const response = await fetch(`${API_URL}/analyze`, {
+            // Results are streamed as newline-delimited JSON events
+            const response = await fetch(`${API_URL}/analyze/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -41,10 +45,49 @@ function App() {
                 })
             });
 
-            const data = await response.json();
-            if (!response.ok) throw new Error(data.detail || 'Analysis failed');
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.detail || 'Analysis failed');
+            }
 
-            setResult(data);
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            const areas = [];
+            let buffer = '';
+
+            const handleEvent = (event) => {
+                switch (event.event) {
+                    case 'discovered':
+                        setProgress({ done: 0, total: event.total });
+                        break;
+                    case 'file':
+                        setProgress({ done: event.index, total: event.total, path: event.path });
+                        break;
+                    case 'area':
+                        areas.push(event.area);
+                        setResult({ stats: null, areas: [...areas] });
+                        break;
+                    case 'done':
+                        setResult({ stats: event.stats, areas: [...areas] });
+                        break;
+                    case 'error':
+                        throw new Error(event.detail || 'Analysis failed');
+                    default:
+                        break;
+                }
+            };
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                for (const line of lines) {
+                    if (line.trim()) handleEvent(JSON.parse(line));
+                }
+            }
+            if (buffer.trim()) handleEvent(JSON.parse(buffer));
         } catch (err) {
             setError(err.message);
         } finally {
@@ -72,7 +115,9 @@ function App() {
                         placeholder="Enter UiPath Project Path..."
                     />
                     <button onClick={analyzeProject} disabled={loading}>
-                        {loading ? 'Scanning...' : 'Analyze Project'}
+                        {loading
+                            ? (progress ? `Scanning ${progress.done}/${progress.total}...` : 'Scanning...')
+                            : 'Analyze Project'}
                     </button>
                 </div>
 
@@ -117,13 +162,19 @@ function App() {
                     </p>
                 </div>
 
+                {loading && progress && progress.path && (
+                    <div style={{ color: 'var(--text-secondary)', fontSize: '0.85rem', marginTop: '1rem' }}>
+                        {progress.path}
+                    </div>
+                )}
+
                 {error && <div style={{ color: 'var(--danger)', marginTop: '1rem' }}>⚠️ {error}</div>}
             </div>
 
             {result && (
                 <div className="results">
                     {/* Stats Summary */}
-                    <div style={{ display: 'grid', gridTemplateColumns: 'repeat(3, 1fr)', gap: '1rem', marginBottom: '2rem' }}>
+                    {result.stats && <div style={{ display: 'grid', gridTemplateColumns: 'repeat(3, 1fr)', gap: '1rem', marginBottom: '2rem' }}>
                         <div className="card" style={{ textAlign: 'center', borderColor: 'var(--success)', background: 'rgba(16, 185, 129, 0.1)' }}>
                             <div style={{ fontSize: '0.9rem', color: 'var(--text-secondary)', textTransform: 'uppercase' }}>Passed Checks</div>
                             <div style={{ fontSize: '2.5rem', fontWeight: 'bold', color: 'var(--success)' }}>{result.stats.pass_count}</div>
@@ -138,7 +189,7 @@ function App() {
                                 {result.stats.overall_percentage}%
                             </div>
                         </div>
-                    </div>
+                    </div>}
 
                     {result.areas.map((area, idx) => (
                         <div key={idx} className="card" style={{ marginBottom: '2rem' }}>